@@ -0,0 +1,135 @@
+"""Per-batch encode latency and memory of the embedding backends.
+
+Each backend runs in its own child process, so the resident memory reported
+for one is not inflated by another having loaded torch. Needs the model files
+(hub access or --onnx-path) and onnxruntime for the onnx variants.
+
+    python benchmarks/embedding_backends.py --batch-sizes 1 8 32 --output backends.json
+"""
+import argparse
+import json
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+VARIANTS = ("torch", "onnx", "onnx-int8")
+
+WORDS = (
+    "today morning evening work family friend run walk tired happy anxious meeting "
+    "project dinner coffee rain sun weekend sleep book music call doctor gym plan "
+    "trip office deadline garden cooked laughed worried proud grateful quiet long"
+).split()
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def rss_mb():
+    """Current resident set size, falling back to the peak where /proc is unavailable."""
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+def make_texts(count, words_per_text, seed):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=words_per_text)) for _ in range(count)]
+
+def run_variant(args):
+    """Child process: load one backend and time encode calls per batch size."""
+    from src.services.embedding_backends import create_embedding_backend
+
+    baseline = rss_mb()
+    backend = create_embedding_backend(
+        "torch" if args.variant == "torch" else "onnx",
+        args.model,
+        model_path=args.onnx_path or None,
+        quantize=args.variant == "onnx-int8",
+        intra_op_threads=args.threads
+    )
+    started = time.perf_counter()
+    backend.load()
+    load_seconds = time.perf_counter() - started
+    loaded_rss = rss_mb()
+
+    texts = make_texts(max(args.batch_sizes) * args.iterations, args.words, args.seed)
+    batches = {}
+    for batch_size in args.batch_sizes:
+        backend.encode(texts[:batch_size])  # warm up this shape
+        latencies = []
+        for i in range(args.iterations):
+            batch = texts[i * batch_size:(i + 1) * batch_size]
+            started = time.perf_counter()
+            backend.encode(batch)
+            latencies.append(time.perf_counter() - started)
+        batches[str(batch_size)] = {
+            "p50_ms": percentile(latencies, 50) * 1000,
+            "p95_ms": percentile(latencies, 95) * 1000,
+            "mean_ms": statistics.mean(latencies) * 1000,
+            "texts_per_second": batch_size / statistics.mean(latencies)
+        }
+
+    print(json.dumps({
+        "variant": args.variant,
+        "load_seconds": load_seconds,
+        "rss_before_load_mb": baseline,
+        "rss_after_load_mb": loaded_rss,
+        "rss_after_encode_mb": rss_mb(),
+        "batches": batches
+    }))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="all-MiniLM-L6-v2")
+    parser.add_argument("--variants", nargs="+", choices=VARIANTS, default=list(VARIANTS))
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--iterations", type=int, default=50)
+    parser.add_argument("--words", type=int, default=60, help="words per synthetic journal text")
+    parser.add_argument("--threads", type=int, default=0, help="ONNX Runtime intra-op threads (0 = default)")
+    parser.add_argument("--onnx-path", default="", help="local directory with model.onnx and tokenizer.json")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--output", help="write the JSON report to this file")
+    parser.add_argument("--variant", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.variant:
+        run_variant(args)
+        return
+
+    results = []
+    for variant in args.variants:
+        command = [sys.executable, __file__, "--variant", variant, "--model", args.model,
+                   "--iterations", str(args.iterations), "--words", str(args.words),
+                   "--threads", str(args.threads), "--seed", str(args.seed),
+                   "--batch-sizes", *map(str, args.batch_sizes)]
+        if args.onnx_path:
+            command += ["--onnx-path", args.onnx_path]
+        child = subprocess.run(command, capture_output=True, text=True)
+        if child.returncode != 0:
+            print(f"{variant}: failed\n{child.stderr.strip()[-2000:]}", file=sys.stderr)
+            continue
+        result = json.loads(child.stdout.strip().splitlines()[-1])
+        results.append(result)
+        print(f"{variant:10s} load {result['load_seconds']:.2f}s  "
+              f"rss {result['rss_after_encode_mb']:.0f} MB")
+        for batch_size, stats in result["batches"].items():
+            print(f"  batch {batch_size:>4s}: p50 {stats['p50_ms']:.1f} ms  p95 {stats['p95_ms']:.1f} ms  "
+                  f"{stats['texts_per_second']:.0f} texts/s")
+
+    report = {"model": args.model, "batch_sizes": args.batch_sizes, "results": results}
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,217 @@
+"""Recall and latency of dense, lexical and hybrid journal search.
+
+Builds a synthetic journal corpus in which every journal mentions a few names
+and places no other journal of its user does, loads it with both dense and
+lexical vectors, then asks two kinds of questions per mode:
+
+- ``entity``: about a name or place ("When did I last see Tavik?"), the case
+  dense embeddings tend to blur
+- ``excerpt``: a few words lifted from the journal, without its names
+
+and reports recall@limit, MRR and search latency per mode. Queries are
+embedded before timing starts, so latencies cover retrieval and fusion only.
+
+    python benchmarks/hybrid_retrieval.py --users 20 --journals-per-user 200
+    python benchmarks/hybrid_retrieval.py --url http://localhost:6333 --output hybrid.json
+
+Without ``--url`` the corpus lives in local in-memory Qdrant, which searches
+by brute force; its latencies only compare the modes with each other.
+``--fake-embeddings`` swaps the model for hash embeddings, which makes dense
+recall meaningless but is enough to time lexical and hybrid search.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent
+sys.path.insert(0, str(ROOT.parent))
+sys.path.insert(0, str(ROOT / "load"))
+
+MODES = ("dense", "lexical", "hybrid")
+
+WORDS = (
+    "today morning evening work family friend run walk tired happy anxious meeting "
+    "project dinner coffee rain sun weekend sleep book music call doctor gym plan "
+    "trip office deadline garden cooked laughed worried proud grateful quiet long"
+).split()
+SYLLABLES = "ka ri to ve lan mi sor da ne vik ul bra te mo zan pe li gor".split()
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def make_corpus(users, per_user, seed):
+    """Journals per user, each with its own names, and the questions asked about them."""
+    rng = random.Random(seed)
+    used = set()
+
+    def entity():
+        while True:
+            name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+            if name not in used:
+                used.add(name)
+                return name
+
+    journals, queries = {}, []
+    for u in range(users):
+        user_id = f"bench_user_{u}"
+        for _ in range(per_user):
+            journal_id = str(uuid.uuid4())
+            person, place = entity(), entity()
+            body = [sentence(rng, 10) for _ in range(rng.randint(3, 6))]
+            body.insert(rng.randrange(len(body) + 1), f"Met {person} at {place} and talked for hours.")
+            journals[journal_id] = (user_id, sentence(rng, 4), " ".join(body))
+            queries.append(("entity", user_id, journal_id, rng.choice((
+                f"When did I last see {person}?", f"What happened at {place}?", f"How was it with {person}?"
+            ))))
+            excerpt = rng.choice([part for part in body if person not in part]).rstrip(".").split()
+            start = rng.randrange(max(1, len(excerpt) - 5))
+            queries.append(("excerpt", user_id, journal_id, " ".join(excerpt[start:start + 6])))
+    return journals, queries
+
+async def load(service, journals, batch_size=256):
+    from qdrant_client.http.models import PointStruct
+
+    items = list(journals.items())
+    for i in range(0, len(items), batch_size):
+        batch = items[i:i + batch_size]
+        vectors = await service.embed_journals([(title, content) for _, (_, title, content) in batch])
+        await service.client.upsert(service.collection_name, wait=True, points=[
+            PointStruct(id=journal_id, vector=vector,
+                        payload={"userId": user_id, "title": title, "content": content, "createdAt": 0.0})
+            for (journal_id, (user_id, title, content)), vector in zip(batch, vectors)
+        ])
+
+async def lexical_search(service, query, user_id, limit):
+    """Sparse-only ranking, to show what the lexical half contributes on its own."""
+    from qdrant_client.http.models import FieldCondition, Filter, MatchValue, NamedSparseVector
+    from src.services import lexical
+    from src.services.journal_vectors import LEXICAL
+
+    sparse = lexical.query_vector(query)
+    if not sparse.indices:
+        return []
+    results = await service.client.search(
+        service.collection_name,
+        query_vector=NamedSparseVector(name=LEXICAL, vector=sparse),
+        query_filter=Filter(must=[FieldCondition(key="userId", match=MatchValue(value=user_id))]),
+        limit=limit,
+    )
+    return [str(result.id) for result in results]
+
+async def bench_mode(service, mode, queries, limit):
+    latencies, hits, reciprocal_ranks = [], {}, {}
+    service.lexical = mode == "hybrid"
+    for kind, user_id, journal_id, query in queries:
+        started = time.perf_counter()
+        if mode == "lexical":
+            ids = await lexical_search(service, query, user_id, limit)
+        else:
+            response = await service.search_journals(query, user_id, limit=limit)
+            if not response.success:
+                raise RuntimeError(f"{mode} search failed: {response.message}")
+            ids = [str(journal["id"]) for journal in response.data["journals"]]
+        latencies.append((time.perf_counter() - started) * 1000)
+        rank = ids.index(journal_id) + 1 if journal_id in ids else None
+        hits.setdefault(kind, []).append(rank is not None)
+        reciprocal_ranks.setdefault(kind, []).append(1 / rank if rank else 0.0)
+    service.lexical = True
+
+    return {
+        **{f"recall_{kind}": round(statistics.mean(values), 4) for kind, values in sorted(hits.items())},
+        **{f"mrr_{kind}": round(statistics.mean(values), 4) for kind, values in sorted(reciprocal_ranks.items())},
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "mean_ms": round(statistics.mean(latencies), 3),
+    }
+
+async def benchmark(args):
+    from qdrant_client import AsyncQdrantClient
+    from src.services.collection_schema import SchemaManager, journals_schema
+    from src.services.qdrant_service import qdrant_service as service
+
+    if args.fake_embeddings:
+        import stand_ins
+        service.backend = stand_ins.hash_embedding_backend(service.backend.model_name)
+    service.client = AsyncQdrantClient(args.url) if args.url else AsyncQdrantClient(location=":memory:")
+    service.collection_name = "bench_hybrid_journals"
+    service.layout = "shared"
+    service.lexical = True
+
+    journals, queries = make_corpus(args.users, args.journals_per_user, args.seed)
+    queries = random.Random(args.seed).sample(queries, min(args.queries, len(queries)))
+
+    if await service.client.collection_exists(service.collection_name):
+        await service.client.delete_collection(service.collection_name)
+    dim = len(await service.generate_embedding("dimension probe"))
+    await SchemaManager(service.client).apply(journals_schema(
+        service.collection_name, vector_size=dim, vector_names=service.vector_names, lexical=True
+    ))
+    started = time.perf_counter()
+    await load(service, journals)
+    load_seconds = time.perf_counter() - started
+    # Warm the embedding cache so every mode times retrieval alone
+    await service.generate_embeddings([query for *_, query in queries])
+
+    results = {
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "url")},
+        "journals": len(journals),
+        "load_seconds": round(load_seconds, 2),
+        "modes": {},
+    }
+    try:
+        for mode in args.modes:
+            results["modes"][mode] = await bench_mode(service, mode, queries, args.limit)
+            print(f"{mode:8s} {results['modes'][mode]}")
+    finally:
+        if not args.keep:
+            await service.client.delete_collection(service.collection_name)
+        await service.client.close()
+        await service.embedder.close()
+    if "dense" in results["modes"] and "hybrid" in results["modes"]:
+        overhead = results["modes"]["hybrid"]["p50_ms"] - results["modes"]["dense"]["p50_ms"]
+        print(f"hybrid p50 overhead over dense: {overhead:+.3f} ms")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="", help="Qdrant server; local in-memory Qdrant when empty")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--users", type=int, default=10)
+    parser.add_argument("--journals-per-user", type=int, default=100)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--limit", type=int, default=3, help="journals retrieved per question, as in chat")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--fake-embeddings", action="store_true",
+                        help="hash-based embeddings instead of loading the model")
+    parser.add_argument("--keep", action="store_true", help="keep the benchmark collection afterwards")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("FIREBASE_CREDENTIALS_BASE64", "")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOG_FILE", "")
+    os.environ["JOURNALS_SEARCH_MODE"] = "hybrid"
+    if not args.url and not hasattr(np, "NINF"):
+        # qdrant-client 1.9's local mode scores sparse vectors with np.NINF, which NumPy 2 removed
+        np.NINF = -np.inf
+
+    results = asyncio.run(benchmark(args))
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,279 @@
+"""End-to-end load benchmark of the journals API.
+
+Starts the app (server.py) against local Qdrant with stand-ins for Gemini and
+Firebase, seeds journals for a set of users, then drives a weighted mix of
+requests at a fixed concurrency and reports latency percentiles and throughput
+per endpoint:
+
+    python benchmarks/load/run.py --fake-embeddings --concurrency 32 --duration 60 --output run.json
+    python benchmarks/load/run.py --fake-embeddings --baseline run.json   # fail on regressions
+
+``--mix`` takes weights for create, list, chat, chat_stream and summary.
+``--in-process`` skips uvicorn and calls the app through httpx's ASGI transport
+on the benchmark's own event loop; handy without uvicorn, but client and server
+then compete for the same loop, so compare such runs only with each other.
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(ROOT))
+import stand_ins  # noqa: E402
+
+API = "/api/v1/journals"
+OPERATIONS = ("create", "list", "chat", "chat_stream", "summary")
+
+WORDS = (
+    "today morning evening work family friend run walk tired happy anxious meeting "
+    "project dinner coffee rain sun weekend sleep book music call doctor gym plan "
+    "trip office deadline garden cooked laughed worried proud grateful quiet long"
+).split()
+
+QUESTIONS = (
+    "How have I been sleeping lately?",
+    "What made me happy this week?",
+    "When did I last go to the gym?",
+    "What was stressing me out at work?",
+    "Who did I spend time with recently?",
+    "How was my weekend?",
+)
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def parse_mix(value):
+    mix = {}
+    for part in value.split(","):
+        name, _, weight = part.partition("=")
+        if name not in OPERATIONS:
+            raise argparse.ArgumentTypeError(f"unknown operation '{name}', expected one of {', '.join(OPERATIONS)}")
+        mix[name] = float(weight or 1)
+    return mix
+
+def sentence(rng, words):
+    return " ".join(rng.choice(WORDS) for _ in range(words)).capitalize() + "."
+
+def journal(rng):
+    return {"title": sentence(rng, 4), "content": " ".join(sentence(rng, 12) for _ in range(rng.randint(2, 6)))}
+
+def auth(user_id):
+    return {"Authorization": f"Bearer {stand_ins.TOKEN_PREFIX}{user_id}"}
+
+def succeeded(response):
+    if response.status_code >= 400:
+        return False
+    if response.headers.get("content-type", "").startswith("text/event-stream"):
+        return True
+    return bool(response.json().get("success"))
+
+async def run_operation(client, operation, user_id, rng):
+    headers = auth(user_id)
+    if operation == "create":
+        response = await client.post(API, json=journal(rng), headers=headers)
+    elif operation == "list":
+        response = await client.get(f"{API}/", params={"limit": 20}, headers=headers)
+    elif operation == "chat":
+        response = await client.post(f"{API}/chat", json={"message": rng.choice(QUESTIONS)}, headers=headers)
+    elif operation == "chat_stream":
+        request = client.build_request("POST", f"{API}/chat/stream",
+                                       json={"message": rng.choice(QUESTIONS)}, headers=headers)
+        response = await client.send(request, stream=True)
+        try:
+            body = b"".join([chunk async for chunk in response.aiter_bytes()])
+        finally:
+            await response.aclose()
+        return response.status_code < 400 and b"event: error" not in body
+    else:
+        response = await client.get(f"{API}/summary", params={"days": 7}, headers=headers)
+    return succeeded(response)
+
+async def seed(client, users, per_user, rng):
+    now = time.time()
+    for user_id in users:
+        entries = [{**journal(rng), "createdAt": now - rng.uniform(0, 6 * 86400)} for _ in range(per_user)]
+        response = await client.post(f"{API}/bulk", json=entries, headers=auth(user_id))
+        response.raise_for_status()
+
+class Recorder:
+    def __init__(self):
+        self.latencies = {}
+        self.errors = {}
+        self.recording = False
+
+    def record(self, operation, milliseconds, ok):
+        if not self.recording:
+            return
+        self.latencies.setdefault(operation, []).append(milliseconds)
+        if not ok:
+            self.errors[operation] = self.errors.get(operation, 0) + 1
+
+    def summary(self, seconds):
+        def stats(latencies, errors):
+            return {
+                "requests": len(latencies),
+                "errors": errors,
+                "rps": round(len(latencies) / seconds, 2),
+                "p50_ms": round(percentile(latencies, 50), 2),
+                "p95_ms": round(percentile(latencies, 95), 2),
+                "p99_ms": round(percentile(latencies, 99), 2),
+                "mean_ms": round(statistics.mean(latencies), 2),
+            }
+        endpoints = {
+            operation: stats(latencies, self.errors.get(operation, 0))
+            for operation, latencies in sorted(self.latencies.items())
+        }
+        everything = [value for latencies in self.latencies.values() for value in latencies]
+        total = stats(everything, sum(self.errors.values())) if everything else {}
+        return {"total": total, "endpoints": endpoints}
+
+async def drive(client, args, users):
+    operations = [operation for operation in args.mix if args.mix[operation] > 0]
+    weights = [args.mix[operation] for operation in operations]
+    recorder = Recorder()
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + args.warmup + args.duration
+
+    async def worker(index):
+        rng = random.Random(args.seed * 1000 + index)
+        while loop.time() < deadline:
+            operation = rng.choices(operations, weights)[0]
+            started = time.perf_counter()
+            try:
+                ok = await run_operation(client, operation, rng.choice(users), rng)
+            except httpx.HTTPError:
+                ok = False
+            recorder.record(operation, (time.perf_counter() - started) * 1000, ok)
+
+    workers = [asyncio.create_task(worker(i)) for i in range(args.concurrency)]
+    await asyncio.sleep(args.warmup)
+    recorder.recording = True
+    started = time.perf_counter()
+    await asyncio.gather(*workers)
+    return recorder.summary(time.perf_counter() - started)
+
+async def wait_until_ready(client, process, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"benchmark server exited with code {process.returncode}")
+        try:
+            if (await client.get("/ready")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.5)
+    raise RuntimeError(f"benchmark server not ready after {timeout}s")
+
+async def benchmark(args):
+    rng = random.Random(args.seed)
+    users = [f"bench_user_{i}" for i in range(args.users)]
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    timeout = httpx.Timeout(args.request_timeout)
+
+    if args.in_process:
+        app = stand_ins.install(args)
+        transport = httpx.ASGITransport(app=app)
+        async with app.router.lifespan_context(app):
+            async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=timeout) as client:
+                await seed(client, users, args.journals_per_user, rng)
+                return await drive(client, args, users)
+
+    command = [sys.executable, str(Path(__file__).with_name("server.py")), "--port", str(args.port)]
+    process = subprocess.Popen(command + stand_ins.stand_in_arguments(args), cwd=ROOT)
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{args.port}", limits=limits,
+                                     timeout=timeout) as client:
+            await wait_until_ready(client, process, args.startup_timeout)
+            await seed(client, users, args.journals_per_user, rng)
+            return await drive(client, args, users)
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def compare(results, baseline, max_regression):
+    """Print p95 and throughput changes against ``baseline``; returns the regressions found."""
+    regressions = []
+    for name in sorted(set(results["endpoints"]) | {"total"}):
+        current = results["total"] if name == "total" else results["endpoints"].get(name)
+        previous = baseline["total"] if name == "total" else baseline["endpoints"].get(name)
+        if not current or not previous:
+            continue
+        p95 = current["p95_ms"] / previous["p95_ms"] - 1 if previous["p95_ms"] else 0.0
+        rps = current["rps"] / previous["rps"] - 1 if previous["rps"] else 0.0
+        print(f"{name:12s} p95 {previous['p95_ms']:9.1f} -> {current['p95_ms']:9.1f} ms ({p95:+.0%})   "
+              f"rps {previous['rps']:8.1f} -> {current['rps']:8.1f} ({rps:+.0%})")
+        if p95 > max_regression:
+            regressions.append(f"{name} p95 {p95:+.0%}")
+        if rps < -max_regression:
+            regressions.append(f"{name} rps {rps:+.0%}")
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=30.0, help="measured seconds")
+    parser.add_argument("--warmup", type=float, default=5.0, help="unmeasured seconds before measuring")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("create=3,list=4,chat=2,summary=1"))
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--journals-per-user", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--startup-timeout", type=float, default=300.0)
+    parser.add_argument("--in-process", action="store_true", help="call the app through ASGI, without uvicorn")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    parser.add_argument("--baseline", help="results JSON of an earlier run to compare against")
+    parser.add_argument("--max-regression", type=float, default=0.2,
+                        help="allowed relative p95 increase or throughput drop before failing")
+    stand_ins.add_arguments(parser)
+    args = parser.parse_args()
+
+    summary = asyncio.run(benchmark(args))
+    params = {k: v for k, v in vars(args).items() if k not in ("output", "baseline", "port")}
+    results = {
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": git_commit(),
+        "params": params,
+        **summary,
+    }
+
+    for name, stats in results["endpoints"].items():
+        print(f"{name:12s} {stats}")
+    print(f"{'total':12s} {results['total']}")
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        def comparable(run_params):
+            return {k: v for k, v in run_params.items() if k != "max_regression"}
+        if comparable(baseline.get("params", {})) != comparable(json.loads(json.dumps(params))):
+            print("warning: baseline was run with different parameters")
+        regressions = compare(results, baseline, args.max_regression)
+        if regressions:
+            print(f"regressions beyond {args.max_regression:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
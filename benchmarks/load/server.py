@@ -0,0 +1,30 @@
+"""Serve the app with local stand-ins (see stand_ins.py) for load benchmarks.
+
+Started by run.py, or by hand to point another load generator at it:
+
+    python benchmarks/load/server.py --port 8765 --fake-embeddings --gemini-latency-ms 500
+
+Tokens of the form ``bench-<uid>`` authenticate as ``<uid>``. Runs a single
+worker: in-memory and on-disk local Qdrant can't be shared between processes.
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
+import stand_ins  # noqa: E402
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    stand_ins.add_arguments(parser)
+    args = parser.parse_args()
+
+    app = stand_ins.install(args)
+
+    import uvicorn
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning", access_log=False)
+
+if __name__ == "__main__":
+    main()
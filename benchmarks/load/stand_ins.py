@@ -0,0 +1,165 @@
+"""Local stand-ins for the app's external services, for load benchmarks.
+
+``install()`` must run before ``src.main`` is imported. It configures the app
+for local Qdrant (in-memory, or on disk with ``--qdrant-path``), then swaps in:
+
+- a fake Gemini model that answers after a configurable latency,
+- a Firebase verifier that accepts ``bench-<uid>`` tokens,
+- optionally, deterministic hash embeddings instead of the real model.
+
+Everything else (routing, auth caching, embedding batching, Qdrant queries,
+context building, response caches) runs as in production.
+"""
+import asyncio
+import hashlib
+import os
+import random
+import time
+from typing import List
+
+import numpy as np
+
+TOKEN_PREFIX = "bench-"
+
+def add_arguments(parser):
+    group = parser.add_argument_group("stand-ins")
+    group.add_argument("--qdrant-path", default="",
+                       help="on-disk local Qdrant directory; in-memory when empty")
+    group.add_argument("--gemini-latency-ms", type=float, default=800.0)
+    group.add_argument("--gemini-jitter-ms", type=float, default=200.0)
+    group.add_argument("--gemini-error-rate", type=float, default=0.0,
+                       help="share of Gemini calls failing with a retryable error")
+    group.add_argument("--auth-latency-ms", type=float, default=2.0,
+                       help="time a token verification takes on a cache miss")
+    group.add_argument("--fake-embeddings", action="store_true",
+                       help="hash-based embeddings instead of loading the model")
+    group.add_argument("--embedding-latency-ms", type=float, default=0.0,
+                       help="per-text encode time of the fake embeddings")
+    group.add_argument("--no-caches", action="store_true",
+                       help="disable the chat and summary answer caches")
+
+def stand_in_arguments(args) -> List[str]:
+    """The stand-in options of ``args`` as command line flags, to pass on to a server process."""
+    argv = [
+        "--gemini-latency-ms", str(args.gemini_latency_ms),
+        "--gemini-jitter-ms", str(args.gemini_jitter_ms),
+        "--gemini-error-rate", str(args.gemini_error_rate),
+        "--auth-latency-ms", str(args.auth_latency_ms),
+        "--embedding-latency-ms", str(args.embedding_latency_ms),
+    ]
+    if args.qdrant_path:
+        argv += ["--qdrant-path", args.qdrant_path]
+    if args.fake_embeddings:
+        argv.append("--fake-embeddings")
+    if args.no_caches:
+        argv.append("--no-caches")
+    return argv
+
+class _FakeChunk:
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """Answers like ``GenerativeModel.generate_content_async`` after ``latency_ms`` (+- jitter)."""
+
+    def __init__(self, latency_ms: float, jitter_ms: float = 0.0, error_rate: float = 0.0,
+                 chunks: int = 8, seed: int = 0):
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.chunks = max(1, chunks)
+        self._random = random.Random(seed)
+
+    def _delay(self) -> float:
+        return max(0.0, self.latency_ms + self._random.uniform(-self.jitter_ms, self.jitter_ms)) / 1000
+
+    def _answer(self, prompt: str) -> str:
+        return f"Stand-in answer to a {len(prompt)}-character prompt. " * self.chunks
+
+    async def generate_content_async(self, prompt: str, stream: bool = False):
+        if self._random.random() < self.error_rate:
+            await asyncio.sleep(self._delay() / 4)
+            raise ConnectionError("stand-in Gemini failure")
+        if not stream:
+            await asyncio.sleep(self._delay())
+            return _FakeChunk(self._answer(prompt))
+
+        delay = self._delay() / self.chunks
+        text = self._answer(prompt)
+        size = len(text) // self.chunks + 1
+
+        async def chunks():
+            for i in range(0, len(text), size):
+                await asyncio.sleep(delay)
+                yield _FakeChunk(text[i:i + size])
+        return chunks()
+
+def fake_verify_id_token(latency_ms: float):
+    from firebase_admin import auth
+
+    def verify_id_token(token, *args, **kwargs):
+        # Runs in the threadpool like the real verifier, so blocking here is fine
+        time.sleep(latency_ms / 1000)
+        if not token.startswith(TOKEN_PREFIX):
+            raise auth.InvalidIdTokenError("not a benchmark token")
+        return {"uid": token[len(TOKEN_PREFIX):], "exp": time.time() + 3600}
+    return verify_id_token
+
+def hash_embedding_backend(model_name: str, dim: int = 384, latency_ms: float = 0.0):
+    from src.services.embedding_backends import EmbeddingBackend
+
+    class HashEmbeddingBackend(EmbeddingBackend):
+        """Deterministic unit vectors seeded by the text's hash."""
+
+        name = "hash"
+
+        def _load(self):
+            pass
+
+        def _encode(self, texts):
+            time.sleep(latency_ms * len(texts) / 1000)
+            vectors = np.stack([
+                np.random.default_rng(int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "big"))
+                .standard_normal(dim)
+                for text in texts
+            ]).astype(np.float32)
+            return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    return HashEmbeddingBackend(model_name)
+
+def install(args):
+    """Configure the environment and patch in the stand-ins; returns the FastAPI app."""
+    os.environ["QDRANT_URL"] = ":memory:"
+    os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+    os.environ.setdefault("FIREBASE_CREDENTIALS_BASE64", "")
+    os.environ.setdefault("LOG_LEVEL", "WARNING")
+    os.environ.setdefault("LOG_FILE", "")
+    os.environ.setdefault("RETENTION_MODE", "external")
+    if args.no_caches:
+        os.environ["CHAT_CACHE_ENTRIES_PER_USER"] = "0"
+        os.environ["SUMMARY_CACHE_SIZE"] = "0"
+
+    from qdrant_client import AsyncQdrantClient
+    from src.core import firebase, lifespan
+    from src.services.gemini_service import gemini_service
+    from src.services.qdrant_service import qdrant_service
+    from src.main import app
+
+    if args.qdrant_path:
+        qdrant_service.client = AsyncQdrantClient(path=args.qdrant_path)
+        qdrant_service.schema_manager.client = qdrant_service.client
+
+    gemini_service._model = FakeGenerativeModel(
+        args.gemini_latency_ms, args.gemini_jitter_ms, args.gemini_error_rate
+    )
+
+    firebase.initialize_firebase = lambda: None
+    lifespan.initialize_firebase = lambda: None
+    firebase._warm_public_certs = lambda: None
+    firebase.auth.verify_id_token = fake_verify_id_token(args.auth_latency_ms)
+
+    if args.fake_embeddings:
+        qdrant_service.backend = hash_embedding_backend(
+            qdrant_service.backend.model_name, latency_ms=args.embedding_latency_ms
+        )
+    return app
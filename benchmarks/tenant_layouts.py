@@ -0,0 +1,138 @@
+"""Filtered-search latency of the journals storage layouts.
+
+Loads the same synthetic multi-tenant dataset into a collection (or set of
+collections) per layout, waits for indexing, then times per-user filtered
+searches. Needs a Qdrant server: local/in-memory mode has no HNSW index, so
+its numbers would not mean anything here.
+
+    python benchmarks/tenant_layouts.py --url http://localhost:6333 --users 2000
+"""
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import uuid
+from pathlib import Path
+
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from src.services.collection_schema import (  # noqa: E402
+    JOURNAL_LAYOUTS, SchemaManager, journals_layout_schemas, shard_collection_name
+)
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+def make_dataset(users, per_user, dim, seed):
+    rng = np.random.default_rng(seed)
+    data = []
+    for u in range(users):
+        user_id = f"bench_user_{u}"
+        # Each user writes about a handful of themes, so their vectors cluster
+        centre = rng.standard_normal(dim)
+        vectors = centre + 0.5 * rng.standard_normal((per_user, dim))
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        for vector in vectors:
+            data.append((user_id, vector.astype("float32").tolist()))
+    return data
+
+async def wait_until_indexed(client, names, timeout):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        infos = [await client.get_collection(name) for name in names]
+        if all(info.status.value == "green" and info.optimizer_status.value == "ok" for info in infos):
+            return
+        await asyncio.sleep(1)
+    print(f"warning: indexing not finished after {timeout}s, results may include brute-force search")
+
+async def bench_layout(client, layout, data, args):
+    base = f"bench_journals_{layout}"
+    schemas = journals_layout_schemas(layout, base, args.shards, vector_size=args.dim)
+    names = [schema.name for schema in schemas]
+    for name in names:
+        if await client.collection_exists(name):
+            await client.delete_collection(name)
+    manager = SchemaManager(client)
+    for schema in schemas:
+        await manager.apply(schema)
+
+    def collection_for(user_id):
+        return shard_collection_name(base, user_id, args.shards) if layout == "sharded" else base
+
+    load_started = time.perf_counter()
+    batches = {}
+    for user_id, vector in data:
+        batches.setdefault(collection_for(user_id), []).append(
+            PointStruct(id=str(uuid.uuid4()), vector=vector, payload={"userId": user_id, "createdAt": 0.0})
+        )
+    for name, points in batches.items():
+        for i in range(0, len(points), 512):
+            await client.upsert(name, points=points[i:i + 512], wait=False)
+    await wait_until_indexed(client, names, args.index_timeout)
+    load_seconds = time.perf_counter() - load_started
+
+    rng = random.Random(args.seed)
+    users = sorted({user_id for user_id, _ in data})
+    latencies = []
+    for _ in range(args.queries):
+        user_id = rng.choice(users)
+        query = np.random.default_rng(rng.randrange(1 << 30)).standard_normal(args.dim).tolist()
+        started = time.perf_counter()
+        await client.search(
+            collection_for(user_id),
+            query_vector=query,
+            query_filter=Filter(must=[FieldCondition(key="userId", match=MatchValue(value=user_id))]),
+            limit=3,
+        )
+        latencies.append((time.perf_counter() - started) * 1000)
+
+    if not args.keep:
+        for name in names:
+            await client.delete_collection(name)
+
+    return {
+        "collections": len(names),
+        "load_and_index_seconds": round(load_seconds, 2),
+        "p50_ms": round(percentile(latencies, 50), 3),
+        "p95_ms": round(percentile(latencies, 95), 3),
+        "p99_ms": round(percentile(latencies, 99), 3),
+        "mean_ms": round(statistics.mean(latencies), 3),
+    }
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:6333")
+    parser.add_argument("--layouts", nargs="+", choices=JOURNAL_LAYOUTS, default=list(JOURNAL_LAYOUTS))
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--journals-per-user", type=int, default=20)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--shards", type=int, default=8)
+    parser.add_argument("--queries", type=int, default=1000)
+    parser.add_argument("--index-timeout", type=int, default=600)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--keep", action="store_true", help="keep benchmark collections afterwards")
+    parser.add_argument("--output", help="write results as JSON to this path")
+    args = parser.parse_args()
+
+    data = make_dataset(args.users, args.journals_per_user, args.dim, args.seed)
+    client = AsyncQdrantClient(url=args.url)
+    results = {"params": {k: v for k, v in vars(args).items() if k not in ("output", "url")}, "layouts": {}}
+    try:
+        for layout in args.layouts:
+            results["layouts"][layout] = await bench_layout(client, layout, data, args)
+            print(f"{layout:8s} {results['layouts'][layout]}")
+    finally:
+        await client.close()
+
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,63 @@
+import hmac
+from typing import Optional
+from fastapi import APIRouter, Depends, Header
+from fastapi.responses import HTMLResponse, PlainTextResponse, Response
+from pydantic import BaseModel
+from ....core.config import settings
+from ....core.firebase import AuthError
+from ....core.profiling import PROFILE_FORMATS, request_profiler
+from ....models.response import APIResponse
+
+router = APIRouter()
+
+class ProfilingUpdate(BaseModel):
+    enabled: Optional[bool] = None
+    sample_rate: Optional[float] = None
+
+async def verify_admin(x_admin_token: Optional[str] = Header(None)):
+    if not settings.admin_token:
+        raise AuthError(error="ADMIN_DISABLED", message="Admin API is disabled")
+    if not x_admin_token or not hmac.compare_digest(x_admin_token.encode("utf-8"),
+                                                    settings.admin_token.encode("utf-8")):
+        raise AuthError(error="ADMIN_UNAUTHORIZED", message="Invalid admin token")
+
+@router.get("/profiling", response_model=APIResponse, dependencies=[Depends(verify_admin)])
+async def get_profiling():
+    return APIResponse.success_response(data=request_profiler.state(), message="Profiling settings")
+
+@router.put("/profiling", response_model=APIResponse, dependencies=[Depends(verify_admin)])
+async def update_profiling(update: ProfilingUpdate):
+    """Turn sampling on or off for this worker; resets to the configured settings on restart."""
+    if update.sample_rate is not None and not 0 <= update.sample_rate <= 1:
+        return APIResponse.error_response(
+            error="INVALID_SAMPLE_RATE",
+            message="Sample rate must be between 0 and 1"
+        )
+    request_profiler.configure(enabled=update.enabled, sample_rate=update.sample_rate)
+    return APIResponse.success_response(data=request_profiler.state(), message="Profiling settings updated")
+
+@router.get("/profiles", response_model=APIResponse, dependencies=[Depends(verify_admin)])
+async def list_profiles():
+    profiles = [profile.summary() for profile in request_profiler.profiles()]
+    return APIResponse.success_response(data={"profiles": profiles}, message="Profiles retrieved")
+
+@router.get("/profiles/{profile_id}", dependencies=[Depends(verify_admin)])
+async def get_profile(profile_id: str, format: str = "text"):
+    profile = request_profiler.get(profile_id)
+    if profile is None:
+        return APIResponse.error_response(error="PROFILE_NOT_FOUND", message="Profile not found")
+    if format not in PROFILE_FORMATS:
+        return APIResponse.error_response(
+            error="INVALID_FORMAT",
+            message=f"Format must be one of {', '.join(PROFILE_FORMATS)}"
+        )
+    if profile.session is None:
+        # Without pyinstrument only the timings were captured
+        return APIResponse.success_response(data=profile.summary(), message="Profile has no call tree")
+
+    rendered = request_profiler.render(profile, format)
+    if format == "html":
+        return HTMLResponse(rendered)
+    if format == "speedscope":
+        return Response(rendered, media_type="application/json")
+    return PlainTextResponse(rendered)
@@ -1,20 +1,48 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from ....services.qdrant_service import qdrant_service
-from ....services.gemini_service import gemini_service
+from ....services.gemini_service import gemini_service, GeminiServiceError
+from ....services.summary_cache import SummaryCache
+from ....services.chat_cache import SemanticChatCache
 from ....core.firebase import get_current_user, firebase_admin
 from ....models.response import APIResponse
-from ....models.journal import JournalCreate, JournalUpdate, JournalResponse
+from ....models.journal import JournalCreate, JournalUpdate, JournalResponse, JournalImport
+from ....core.config import settings
 from ....core.logger import logger
 from uuid import uuid4
-from pydantic import BaseModel
+import json
+from datetime import datetime, timedelta
+from typing import Optional, Union
+from pydantic import BaseModel, ValidationError
 from ....utils.journal_extractor import JournalTextExtractor
 from ....utils.journal_validator import JournalValidator
+from ....utils.journal_importer import JournalImportParser, ImportEntryError
 from ....core.prompt_templates import prompt_templates
 
 router = APIRouter()
 
+summary_cache = SummaryCache(
+    max_entries=settings.summary_cache_size,
+    ttl_seconds=settings.summary_cache_ttl_seconds
+)
+qdrant_service.add_change_listener(summary_cache.invalidate_user)
+
+chat_cache = SemanticChatCache(
+    similarity_threshold=settings.chat_cache_similarity_threshold,
+    ttl_seconds=settings.chat_cache_ttl_seconds,
+    entries_per_user=settings.chat_cache_entries_per_user,
+    max_users=settings.chat_cache_max_users
+)
+qdrant_service.add_change_listener(chat_cache.invalidate_user)
+
 class ChatRequest(BaseModel):
     message: str
+    # Only search journals from the last ``days`` days, or created between
+    # ``start`` and ``end`` (Unix timestamps or ISO datetimes, either optional)
+    days: Optional[int] = None
+    start: Optional[Union[float, datetime]] = None
+    end: Optional[Union[float, datetime]] = None
 
 @router.post("", response_model=APIResponse) 
 async def create_journal(journal: JournalCreate, user_id: str = Depends(get_current_user)):
@@ -26,7 +54,7 @@ async def create_journal(journal: JournalCreate, user_id: str = Depends(get_curr
         return validation_error
     
     journal_id = str(uuid4())
-    response = qdrant_service.upsert_journal(journal_id, user_id, journal.title, journal.content)
+    response = await qdrant_service.upsert_journal(journal_id, user_id, journal.title, journal.content)
     
     if not response.success:
         return response
@@ -37,6 +65,88 @@ async def create_journal(journal: JournalCreate, user_id: str = Depends(get_curr
         message="Journal created successfully"
     )
 
+def _prepare_import_entry(entry, user_id: str) -> tuple[Optional[dict], Optional[APIResponse]]:
+    """Validate one bulk import entry and turn it into a journal ready for upsert."""
+    if isinstance(entry, ImportEntryError):
+        return None, APIResponse.error_response(error=entry.error, message=entry.message)
+    if not isinstance(entry, dict):
+        return None, APIResponse.error_response(
+            error="INVALID_ENTRY",
+            message="Each entry must be a JSON object"
+        )
+    try:
+        journal = JournalImport(**entry)
+    except ValidationError as e:
+        return None, APIResponse.error_response(
+            error="INVALID_ENTRY",
+            message=e.errors()[0].get("msg", "Invalid journal entry")
+        )
+
+    validation_error = JournalValidator.validate_create(journal, user_id)
+    if validation_error:
+        return None, validation_error
+
+    created_at = journal.createdAt
+    if isinstance(created_at, datetime):
+        created_at = created_at.timestamp()
+    return {
+        "id": str(uuid4()),
+        "title": journal.title,
+        "content": journal.content,
+        "createdAt": created_at
+    }, None
+
+@router.post("/bulk", response_model=APIResponse)
+async def import_journals(request: Request, user_id: str = Depends(get_current_user)):
+    """Import journals from a streamed JSON array or JSONL request body."""
+    logger.info(f"Bulk importing journals for user: {user_id}")
+    results = []
+    batch = []
+
+    async def flush():
+        response = await qdrant_service.upsert_journals_bulk(user_id, [journal for _, journal in batch])
+        if response.success:
+            item_results = response.data["results"]
+        else:
+            item_results = [{"success": False, "error": response.error, "message": response.message}] * len(batch)
+        for (index, _), item in zip(batch, item_results):
+            results.append({"index": index, **item})
+        batch.clear()
+
+    parse_error = None
+    try:
+        async for index, entry in JournalImportParser.iter_entries(request.stream()):
+            journal, error_response = _prepare_import_entry(entry, user_id)
+            if error_response:
+                results.append({
+                    "index": index,
+                    "success": False,
+                    "error": error_response.error,
+                    "message": error_response.message
+                })
+                continue
+            batch.append((index, journal))
+            if len(batch) >= settings.bulk_import_batch_size:
+                await flush()
+    except ImportEntryError as e:
+        logger.warning(f"Bulk import for user {user_id} stopped early: {e.message}")
+        parse_error = e
+
+    if batch:
+        await flush()
+
+    results.sort(key=lambda item: item["index"])
+    imported = sum(1 for item in results if item["success"])
+    logger.info(f"Bulk import for user {user_id}: {imported} imported, {len(results) - imported} failed")
+
+    data = {"imported": imported, "failed": len(results) - imported, "results": results}
+    if parse_error:
+        return APIResponse(success=False, message=parse_error.message, error=parse_error.error, data=data)
+    return APIResponse.success_response(
+        data=data,
+        message="Journals imported successfully"
+    )
+
 @router.put("/{journal_id}", response_model=APIResponse)
 async def update_journal(journal_id: str, update: JournalUpdate, user_id: str = Depends(get_current_user)):
     logger.info(f"Updating journal {journal_id} for user: {user_id}")
@@ -46,21 +156,8 @@ async def update_journal(journal_id: str, update: JournalUpdate, user_id: str =
     if validation_error:
         return validation_error
     
-    current = qdrant_service.get_journal(journal_id)
-    if not current.success:
-        return current
-        
-    if current.data["userId"] != user_id:
-        return APIResponse.error_response(
-            error="UNAUTHORIZED",
-            message="Not authorized to update this journal"
-        )
-        
-    response = qdrant_service.upsert_journal(
-        journal_id,
-        user_id,
-        update.title if update.title is not None else current.data["title"],
-        update.content if update.content is not None else current.data["content"]
+    response = await qdrant_service.update_journal(
+        journal_id, user_id, title=update.title, content=update.content
     )
     
     if not response.success:
@@ -72,85 +169,227 @@ async def update_journal(journal_id: str, update: JournalUpdate, user_id: str =
         message="Journal updated successfully"
     )
 
+# Journals returned by an unpaginated GET /journals, as before pagination existed
+LEGACY_LIST_LIMIT = 100
+
 @router.get("/", response_model=APIResponse)
-async def get_journals(user_id: str = Depends(get_current_user), days: int = None):
+async def get_journals(user_id: str = Depends(get_current_user), days: int = None,
+                       limit: Optional[int] = None, cursor: Optional[str] = None):
+    """List a user's journals.
+
+    Without ``limit`` or ``cursor`` the response keeps its original shape, a
+    plain list of up to LEGACY_LIST_LIMIT journals. Passing either opts into
+    pages of ``{"journals", "next_cursor"}``.
+    """
     logger.info(f"Fetching journals for user: {user_id}")
-    response = qdrant_service.get_journals_by_user(user_id, days=days)
+    paginated = limit is not None or cursor is not None
+    response = await qdrant_service.get_journals_by_user(
+        user_id, days=days, cursor=cursor,
+        limit=(limit or settings.journals_page_size) if paginated else LEGACY_LIST_LIMIT
+    )
     
     if not response.success:
         return APIResponse.error_response(
             error=response.error,
             message=response.message
         )
-     
-    journals = response.data.get("journals", [])
+
+    if not paginated:
+        return APIResponse.success_response(
+            data=response.data.get("journals", []),
+            message="Journals retrieved successfully"
+        )
     return APIResponse.success_response(
-        data=journals,
+        data={
+            "journals": response.data.get("journals", []),
+            "next_cursor": response.data.get("next_cursor")
+        },
         message="Journals retrieved successfully"
     )
 
 @router.get("/summary", response_model=APIResponse)
 async def get_summary(user_id: str = Depends(get_current_user), days: int = 7):
     logger.info(f"Generating summary for user: {user_id} over last {days} days")
-    response = qdrant_service.get_journals_by_user(user_id, days=days)
+    response = await qdrant_service.get_journals_by_user(user_id, days=days)
+
+    fingerprint = None
+    if response.success:
+        fingerprint = summary_cache.fingerprint(response.data.get("journals", []))
+        cached_summary = summary_cache.get(user_id, days, fingerprint)
+        if cached_summary is not None:
+            logger.info(f"Serving cached summary for user: {user_id}")
+            return APIResponse.success_response(
+                data={"response": cached_summary},
+                message="Summary generated successfully"
+            )
     
-    context, error_response = JournalTextExtractor.process_journals_response(response, "journal entries")
+    context, error_response = JournalTextExtractor.process_journals_response(
+        response, "journal entries", token_budget=settings.summary_context_token_budget
+    )
     if error_response:
         return error_response
     
     summary_prompt = prompt_templates.get_summary_prompt(days, context)
-    response = gemini_service.generate_response(summary_prompt, context)
+    period = "the last day" if days == 1 else f"the last {days} days"
+    response = await gemini_service.generate_response(summary_prompt, context, period=period)
     if not response.success:
         return response
-        
+
+    summary = response.data.get("response", "")
+    summary_cache.put(user_id, days, fingerprint, summary)
     logger.info(f"Summary generated successfully for user: {user_id}")
     return APIResponse.success_response(
-        data={"response": response.data.get("response", "")},
+        data={"response": summary},
         message="Summary generated successfully"
     )
 
+def _chat_cache_key(search_response: APIResponse,
+                    period: Optional[str] = None) -> tuple[Optional[list], Optional[str]]:
+    """Query vector and retrieved-journals fingerprint for the chat cache, when usable."""
+    if not search_response.success or not search_response.data:
+        return None, None
+    query_vector = search_response.data.get("query_vector")
+    journals = search_response.data.get("journals", [])
+    if not query_vector or not journals:
+        return None, None
+    fingerprint = chat_cache.fingerprint(journals)
+    # The period is part of the prompt, so answers for different periods aren't interchangeable
+    return query_vector, f"{fingerprint}:{period}" if period else fingerprint
+
+def _format_date(timestamp: float) -> str:
+    date = datetime.fromtimestamp(timestamp)
+    return f"{date:%B} {date.day}, {date.year}"
+
+def _chat_time_range(
+    chat: ChatRequest
+) -> tuple[Optional[float], Optional[float], Optional[str], Optional[APIResponse]]:
+    """Search bounds for a chat's date filter, the period they describe for the prompt, or an error."""
+    if chat.days is not None:
+        if chat.days <= 0 or chat.start is not None or chat.end is not None:
+            return None, None, None, APIResponse.error_response(
+                error="INVALID_DATE_RANGE",
+                message="Days must be positive and can't be combined with start or end"
+            )
+        start = (datetime.now() - timedelta(days=chat.days)).timestamp()
+        return start, None, "the last day" if chat.days == 1 else f"the last {chat.days} days", None
+
+    start, end = (value.timestamp() if isinstance(value, datetime) else value for value in (chat.start, chat.end))
+    if start is not None and end is not None:
+        if start > end:
+            return None, None, None, APIResponse.error_response(
+                error="INVALID_DATE_RANGE",
+                message="Start must not be after end"
+            )
+        return start, end, f"between {_format_date(start)} and {_format_date(end)}", None
+    if start is not None:
+        return start, None, f"since {_format_date(start)}", None
+    if end is not None:
+        return None, end, f"up to {_format_date(end)}", None
+    return None, None, None, None
+
 @router.post("/chat", response_model=APIResponse)
 async def chat_with_journals(chat: ChatRequest, user_id: str = Depends(get_current_user)):
     logger.info(f"Processing chat request for user: {user_id}")
-    search_response = qdrant_service.search_journals(chat.message, user_id)
+    start, end, period, error_response = _chat_time_range(chat)
+    if error_response:
+        return error_response
+    search_response = await qdrant_service.search_journals(chat.message, user_id, start=start, end=end)
+
+    query_vector, fingerprint = _chat_cache_key(search_response, period)
+    if query_vector is not None:
+        cached_answer = chat_cache.get(user_id, query_vector, fingerprint)
+        if cached_answer is not None:
+            logger.info(f"Serving cached chat response for user: {user_id}")
+            return APIResponse.success_response(
+                data={"response": cached_answer},
+                message="Chat response generated successfully"
+            )
     
-    context, error_response = JournalTextExtractor.process_journals_response(search_response, "relevant journals")
+    context, error_response = JournalTextExtractor.process_journals_response(
+        search_response, "relevant journals", token_budget=settings.chat_context_token_budget, rank_by="score"
+    )
     if error_response:
         return error_response
     
-    response = gemini_service.generate_response(chat.message, context)
+    response = await gemini_service.generate_response(chat.message, context, period=period)
     if not response.success:
         return response
-        
+
+    answer = response.data.get("response", "")
+    if query_vector is not None and answer:
+        chat_cache.put(user_id, query_vector, fingerprint, answer)
     logger.info(f"Chat response generated successfully for user: {user_id}")
     return APIResponse.success_response(
-        data={"response": response.data.get("response", "")},
+        data={"response": answer},
         message="Chat response generated successfully"
     )
 
+def _sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+@router.post("/chat/stream")
+async def chat_with_journals_stream(chat: ChatRequest, request: Request, user_id: str = Depends(get_current_user)):
+    """Stream a chat response as Server-Sent Events.
+
+    Emits ``token`` events with text chunks as Gemini generates them, then a
+    single ``done`` event, or an ``error`` event carrying the usual error code.
+    """
+    logger.info(f"Processing streaming chat request for user: {user_id}")
+    start, end, period, error_response = _chat_time_range(chat)
+    query_vector = fingerprint = cached_answer = context = None
+    if error_response is None:
+        search_response = await qdrant_service.search_journals(chat.message, user_id, start=start, end=end)
+        query_vector, fingerprint = _chat_cache_key(search_response, period)
+        if query_vector is not None:
+            cached_answer = chat_cache.get(user_id, query_vector, fingerprint)
+        if cached_answer is None:
+            context, error_response = JournalTextExtractor.process_journals_response(
+                search_response, "relevant journals", token_budget=settings.chat_context_token_budget, rank_by="score"
+            )
+
+    async def events():
+        if cached_answer is not None:
+            logger.info(f"Serving cached chat response for user: {user_id}")
+            yield _sse_event("token", {"text": cached_answer})
+            yield _sse_event("done", {})
+            return
+
+        if error_response:
+            if error_response.success:
+                yield _sse_event("token", {"text": error_response.data.get("response", "")})
+                yield _sse_event("done", {})
+            else:
+                yield _sse_event("error", {"error": error_response.error, "message": error_response.message})
+            return
+
+        parts = []
+        try:
+            async for text in gemini_service.stream_response(chat.message, context, period=period):
+                if await request.is_disconnected():
+                    logger.info(f"Client disconnected from chat stream for user: {user_id}")
+                    return
+                parts.append(text)
+                yield _sse_event("token", {"text": text})
+        except GeminiServiceError as e:
+            logger.error(f"Chat stream failed for user {user_id}: {e.message}")
+            yield _sse_event("error", {"error": e.error, "message": e.message})
+            return
+
+        if query_vector is not None and parts:
+            chat_cache.put(user_id, query_vector, fingerprint, "".join(parts))
+        logger.info(f"Streaming chat response completed for user: {user_id}")
+        yield _sse_event("done", {})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @router.delete("/{journal_id}", response_model=APIResponse)
 async def delete_journal(journal_id: str, user_id: str = Depends(get_current_user)):
     logger.info(f"Deleting journal {journal_id} for user: {user_id}")
-    current = qdrant_service.get_journal(journal_id)
-    
-    if isinstance(current, APIResponse):
-        if not current.success:
-            return current
-        current = current.data
-    
-    if not current:
-        return APIResponse.error_response(
-            error="Journal not found",
-            message=f"No journal found with ID: {journal_id}"
-        )
-    
-    if current.get("userId") != user_id:
-        return APIResponse.error_response(
-            error="Unauthorized",
-            message="You don't have permission to delete this journal"
-        )
-    
-    result = qdrant_service.delete_journal(journal_id)
+    result = await qdrant_service.delete_journal(journal_id, user_id)
     if result.success:
         return APIResponse.success_response(
             data={"id": journal_id},
@@ -165,13 +404,13 @@ async def delete_user_data(user_id: str = Depends(get_current_user)):
     
     try:
         # Delete all journals from Qdrant
-        journals_deletion = qdrant_service.delete_journals_by_user(user_id)
+        journals_deletion = await qdrant_service.delete_journals_by_user(user_id)
         if not journals_deletion.success:
             return journals_deletion
 
         # Delete user from Firebase Authentication
         try:
-            firebase_admin.auth.delete_user(user_id)
+            await run_in_threadpool(firebase_admin.auth.delete_user, user_id)
         except Exception as e:
             logger.error(f"Failed to delete Firebase user: {str(e)}")
             return APIResponse.error_response(
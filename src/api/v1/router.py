@@ -1,5 +1,6 @@
 from fastapi import APIRouter
-from .endpoints import journals
+from .endpoints import admin, journals
 
 router = APIRouter(prefix="/api/v1")
-router.include_router(journals.router, prefix="/journals", tags=["journals"])
\ No newline at end of file
+router.include_router(journals.router, prefix="/journals", tags=["journals"])
+router.include_router(admin.router, prefix="/admin", tags=["admin"])
@@ -0,0 +1,24 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from .config import settings
+
+# Dedicated, bounded pool for CPU-bound work (sentence embedding). Keeping it
+# separate from the default executor stops a burst of encodes from starving
+# other threadpool users and caps how many cores the model can take.
+embedding_executor = ThreadPoolExecutor(
+    max_workers=settings.embedding_max_workers,
+    thread_name_prefix="embedding"
+)
+
+# Caps on in-flight upstream calls per worker process
+qdrant_semaphore = asyncio.Semaphore(settings.qdrant_max_concurrency)
+gemini_semaphore = asyncio.Semaphore(settings.gemini_max_concurrency)
+
+async def run_cpu_bound(func, *args, **kwargs):
+    """Run a CPU-bound callable on the embedding executor without blocking the event loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(embedding_executor, partial(func, *args, **kwargs))
+
+def shutdown_executors():
+    embedding_executor.shutdown(wait=False, cancel_futures=True)
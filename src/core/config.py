@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import Dict
 from dotenv import load_dotenv
 import os
 
@@ -9,6 +10,139 @@ class Settings(BaseSettings):
     firebase_credentials_base64: str 
     gemini_api_key: str
 
+    # Logging: json or text console output; the file is always JSON (empty path disables it).
+    # log_sample_rates keeps that fraction of info logs per path prefix, e.g.
+    # LOG_SAMPLE_RATES='{"/api/v1/journals/chat": 0.1}'. Warnings and errors are always kept.
+    # The API logs through a queue of log_queue_size records; records are dropped when it is full.
+    log_level: str = "INFO"
+    log_format: str = "json"
+    log_file: str = "logs/journal_app.log"
+    log_file_max_bytes: int = 10 * 1024 * 1024
+    log_file_backup_count: int = 5
+    log_sample_rates: Dict[str, float] = {}
+    log_queue_size: int = 10000
+
+    # Verified Firebase ID tokens are cached until exp, capped at this TTL
+    auth_token_cache_size: int = 10000
+    auth_token_cache_max_ttl_seconds: int = 600
+    # How often Google's token signing certs are checked, and refetched once expired, in the background
+    firebase_cert_refresh_seconds: int = 300
+
+    # Concurrency limits for the async request path
+    embedding_max_workers: int = 2
+    qdrant_max_concurrency: int = 32
+    gemini_max_concurrency: int = 8
+
+    # Gemini call resilience: per-attempt timeout within an overall deadline,
+    # jittered exponential backoff, and a circuit breaker. Hedging sends a
+    # duplicate request when the first is slower than gemini_hedge_after_seconds
+    # (0 disables it; it costs extra quota).
+    gemini_timeout_seconds: float = 30.0
+    gemini_deadline_seconds: float = 60.0
+    gemini_max_attempts: int = 3
+    gemini_retry_base_delay_seconds: float = 0.5
+    gemini_retry_max_delay_seconds: float = 8.0
+    gemini_breaker_failure_threshold: int = 5
+    gemini_breaker_reset_seconds: float = 30.0
+    gemini_hedge_after_seconds: float = 0.0
+
+    # Journals storage layout: shared, tenant (per-user HNSW graphs) or sharded
+    journals_layout: str = "shared"
+    journals_shard_count: int = 8
+    # Base name of the journals collection(s); point it at a backfilled copy to switch over
+    journals_collection: str = "journals"
+    # Vector representation: single (one vector over title + content) or named
+    # (separate title and content vectors, plus a combined one if enabled).
+    # Named search fuses one search per vector, weighted by journals_search_weights.
+    journals_vectors: str = "single"
+    journals_combined_vector: bool = False
+    journals_search_weights: Dict[str, float] = {"title": 0.3, "content": 0.7}
+    # Search mode: dense, or hybrid (dense plus a BM25-style sparse vector over
+    # title and content, fused by reciprocal rank with constant journals_rrf_k).
+    # Hybrid needs a collection with the sparse vector, see backfill_vectors.
+    journals_search_mode: str = "dense"
+    journals_rrf_k: int = 60
+
+    embedding_model: str = "all-MiniLM-L6-v2"
+    # Inference backend: torch (sentence-transformers) or onnx (ONNX Runtime).
+    # The onnx backend reads model.onnx and tokenizer.json from embedding_onnx_path,
+    # or downloads them from the hub, and can quantize the model to int8.
+    embedding_backend: str = "torch"
+    embedding_onnx_path: str = ""
+    embedding_quantize: bool = False
+    embedding_intra_op_threads: int = 0
+    # Shared embedding server (EMBEDDING_BACKEND=remote). Several sockets,
+    # comma-separated, spread API workers over a pool of servers.
+    embedding_server_socket: str = "/tmp/journal-embeddings.sock"
+    embedding_server_backend: str = "torch"
+    embedding_server_max_batch_size: int = 64
+    embedding_server_timeout_seconds: float = 30.0
+
+    # Embedding cache; leave the path empty to keep it memory-only
+    embedding_cache_size: int = 10000
+    embedding_cache_path: str = ""
+
+    # Micro-batching of concurrent embedding requests
+    embedding_max_batch_size: int = 32
+    embedding_max_wait_ms: float = 5.0
+    # Load the embedding model in the background at startup instead of on first request
+    embedding_warmup: bool = True
+
+    # Retention: journals older than retention_days are deleted in paced chunks.
+    # embedded runs it in one API worker per host (file lock), external leaves it
+    # to `python -m src.jobs.retention`, off disables it. Deleting is opt-in:
+    # until retention_dry_run is set to false the job only reports what it would delete.
+    retention_mode: str = "embedded"
+    retention_days: int = 8
+    retention_overrides_path: str = ""
+    retention_interval_seconds: int = 24 * 60 * 60
+    retention_chunk_size: int = 256
+    retention_max_deletes_per_second: float = 500.0
+    retention_lock_path: str = "/tmp/journal-retention.lock"
+    retention_dry_run: bool = True
+
+    # Semantic chat cache: reuse an answer when a new message is this similar to
+    # a cached one and retrieves the same journals (entries_per_user=0 disables)
+    chat_cache_similarity_threshold: float = 0.95
+    chat_cache_ttl_seconds: int = 60 * 60
+    chat_cache_entries_per_user: int = 50
+    chat_cache_max_users: int = 10000
+
+    # Recency in chat search: scores are scaled by (1 - weight) + weight * 0.5 ** (age / half-life),
+    # re-ranking search_oversample times the requested number of candidates (half-life 0 disables)
+    search_recency_half_life_days: float = 30.0
+    search_recency_weight: float = 0.3
+    search_oversample: int = 4
+
+    # Pagination of GET /journals
+    journals_page_size: int = 50
+    journals_max_page_size: int = 200
+
+    # Estimated token budgets for journal context sent to Gemini
+    chat_context_token_budget: int = 2000
+    summary_context_token_budget: int = 8000
+
+    # Cache of generated /journals/summary responses
+    summary_cache_size: int = 1000
+    summary_cache_ttl_seconds: int = 24 * 60 * 60
+
+    # Bulk import: entries embedded per batch and points per Qdrant upsert call
+    bulk_import_batch_size: int = 256
+    bulk_upsert_chunk_size: int = 64
+
+    # Shared secret for /api/v1/admin and the X-Profile-Token header; empty disables both
+    admin_token: str = ""
+
+    # Request profiling (call trees need pyinstrument). Requests under the path
+    # prefix are sampled at profiling_sample_rate while enabled, or profiled on
+    # request with X-Profile-Token, up to profiling_max_per_minute per worker.
+    profiling_enabled: bool = False
+    profiling_sample_rate: float = 0.01
+    profiling_max_per_minute: int = 10
+    profiling_buffer_size: int = 50
+    profiling_interval_ms: float = 1.0
+    profiling_path_prefix: str = "/api/v1/journals"
+
     class Config:
         env_file = ".env"
 
@@ -1,27 +1,51 @@
 import firebase_admin
 from firebase_admin import auth, credentials
 from fastapi import Depends, status
+from fastapi.concurrency import run_in_threadpool
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from .config import settings
+from .metrics import registry
+from .instrumentation import timed
+from .token_cache import VerifiedTokenCache
 from ..models.response import APIResponse
 from .logger import logger
+import asyncio
 import base64
 import json
+import threading
+import time
 
 security = HTTPBearer()
 
-try:
-    # Decode base64 credentials
-    creds_json = base64.b64decode(settings.firebase_credentials_base64).decode("utf-8")
-    creds_dict = json.loads(creds_json)
-    cred = credentials.Certificate(creds_dict)
+token_cache = VerifiedTokenCache(
+    max_entries=settings.auth_token_cache_size,
+    max_ttl_seconds=settings.auth_token_cache_max_ttl_seconds
+)
+token_cache_lookups = registry.counter("auth_token_cache_lookups_total", "Verified-token cache lookups by result")
+token_verify_histogram = registry.histogram("auth_token_verify_seconds", "Time spent verifying an ID token signature")
 
-    # Initialize Firebase
-    firebase_admin.initialize_app(cred)
-    logger.info("Firebase initialized successfully")
-except Exception as e:
-    logger.error(f"Failed to initialize Firebase: {str(e)}")
-    raise RuntimeError(f"Firebase initialization failed: {str(e)}")
+_firebase_lock = threading.Lock()
+
+def initialize_firebase():
+    """Initialize the Firebase app on first use; later calls are no-ops."""
+    with _firebase_lock:
+        try:
+            firebase_admin.get_app()
+            return
+        except ValueError:
+            pass  # no default app yet
+        try:
+            # Decode base64 credentials
+            creds_json = base64.b64decode(settings.firebase_credentials_base64).decode("utf-8")
+            creds_dict = json.loads(creds_json)
+            cred = credentials.Certificate(creds_dict)
+
+            # Initialize Firebase
+            firebase_admin.initialize_app(cred)
+            logger.info("Firebase initialized successfully")
+        except Exception as e:
+            logger.error(f"Failed to initialize Firebase: {str(e)}")
+            raise RuntimeError(f"Firebase initialization failed: {str(e)}")
 
 class AuthError(Exception):
     def __init__(self, error: str, message: str):
@@ -29,10 +53,23 @@ class AuthError(Exception):
         self.message = message
         super().__init__(message)
 
+@timed("auth")
 async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(security)):
     token = credentials.credentials
+    cached = token_cache.get(token)
+    if cached is not None:
+        token_cache_lookups.inc(result="hit")
+        return cached["uid"]
+    token_cache_lookups.inc(result="miss")
+
     try:
-        decoded_token = auth.verify_id_token(token)
+        initialize_firebase()
+        started = time.perf_counter()
+        try:
+            decoded_token = await run_in_threadpool(auth.verify_id_token, token)
+        finally:
+            token_verify_histogram.observe(time.perf_counter() - started)
+        token_cache.put(token, decoded_token)
         return decoded_token["uid"]
     except auth.ExpiredIdTokenError:
         logger.warning("Expired authentication token")
@@ -57,4 +94,40 @@ async def get_current_user(credentials: HTTPAuthorizationCredentials = Depends(s
         raise AuthError(
             error="AUTH_ERROR",
             message="Authentication failed"
-        )
\ No newline at end of file
+        )
+
+def _certificate_probe_token(project_id: str) -> str:
+    """An unsigned ID token whose claims pass verify_id_token's checks, so that
+    verifying it goes as far as fetching Google's signing certs."""
+    def segment(data: dict) -> str:
+        return base64.urlsafe_b64encode(json.dumps(data).encode("utf-8")).rstrip(b"=").decode("ascii")
+    now = int(time.time())
+    header = {"alg": "RS256", "kid": "cert-warmup", "typ": "JWT"}
+    claims = {"aud": project_id, "iss": f"https://securetoken.google.com/{project_id}",
+              "sub": "cert-warmup", "iat": now, "exp": now + 300}
+    return f"{segment(header)}.{segment(claims)}.{segment({})}"
+
+def _warm_public_certs(app=None):
+    """Refresh Google's signing certs off the request path.
+
+    verify_id_token keeps the certs in an HTTP cache that honours their
+    Cache-Control max-age. Verifying a probe token through that public call
+    refetches them once they expire, so requests find them cached. The probe
+    is then rejected for its unknown key id, which is expected; a failed fetch
+    raises CertificateFetchError.
+    """
+    if app is None:
+        initialize_firebase()
+        app = firebase_admin.get_app()
+    try:
+        auth.verify_id_token(_certificate_probe_token(app.project_id), app=app)
+    except auth.InvalidIdTokenError:
+        pass
+
+async def refresh_public_certs_periodically():
+    while True:
+        try:
+            await run_in_threadpool(_warm_public_certs)
+        except Exception as e:
+            logger.warning(f"Failed to refresh Firebase public certificates: {str(e)}")
+        await asyncio.sleep(settings.firebase_cert_refresh_seconds)
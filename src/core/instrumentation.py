@@ -0,0 +1,80 @@
+"""Per-stage timing of the request pipeline.
+
+``timed`` wraps a function so every call is recorded under a stage (auth,
+embedding, qdrant, context, gemini) and an operation, by default the function's
+name: a latency histogram, an in-flight gauge and an error counter. A call is
+an error if it raises or returns a failed APIResponse, which is how most
+services here report failures. Stages nest, e.g. a Qdrant search includes the
+embedding of its query, which is also recorded under ``embedding``.
+"""
+import asyncio
+import functools
+import inspect
+import time
+from typing import Optional
+from .metrics import registry
+from ..models.response import APIResponse
+
+stage_seconds = registry.histogram(
+    "stage_seconds",
+    "Wall time per pipeline stage and operation",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+)
+stage_in_flight = registry.gauge("stage_in_flight", "Calls currently inside a pipeline stage")
+stage_errors = registry.counter("stage_errors_total", "Failed calls per pipeline stage and operation")
+
+class StageTimer:
+    """Context manager recording one call of ``stage``/``operation``."""
+
+    def __init__(self, stage: str, operation: str):
+        self.labels = {"stage": stage, "operation": operation}
+        self.started = 0.0
+
+    def __enter__(self):
+        stage_in_flight.inc(**self.labels)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        stage_in_flight.dec(**self.labels)
+        stage_seconds.observe(time.perf_counter() - self.started, **self.labels)
+        # A consumer closing a stream early, or a cancelled request, is not a failure of the stage
+        if exc_type is not None and not issubclass(exc_type, (GeneratorExit, asyncio.CancelledError)):
+            stage_errors.inc(**self.labels)
+        return False
+
+    def check(self, result):
+        if isinstance(result, APIResponse) and not result.success:
+            stage_errors.inc(**self.labels)
+        return result
+
+def timed(stage: str, operation: Optional[str] = None):
+    """Decorator recording calls of a function, coroutine function or async generator."""
+    def decorate(func):
+        name = operation or func.__name__
+
+        if inspect.isasyncgenfunction(func):
+            @functools.wraps(func)
+            async def stream_wrapper(*args, **kwargs):
+                with StageTimer(stage, name):
+                    items = func(*args, **kwargs)
+                    try:
+                        async for item in items:
+                            yield item
+                    finally:
+                        await items.aclose()
+            return stream_wrapper
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                with StageTimer(stage, name) as timer:
+                    return timer.check(await func(*args, **kwargs))
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with StageTimer(stage, name) as timer:
+                return timer.check(func(*args, **kwargs))
+        return wrapper
+    return decorate
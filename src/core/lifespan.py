@@ -0,0 +1,72 @@
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI
+from .config import settings
+from .firebase import initialize_firebase, refresh_public_certs_periodically
+from .concurrency import shutdown_executors
+from .logger import logger, start_logging, stop_logging
+from ..services.qdrant_service import qdrant_service
+from ..jobs.retention import LeaderLock, run_retention_periodically
+
+class ServiceContainer:
+    """Starts and stops the app's services and owns its background tasks."""
+
+    def __init__(self):
+        self.tasks: list[asyncio.Task] = []
+        self.firebase_ready = False
+        self.collections_ready = False
+
+    async def start(self):
+        initialize_firebase()
+        self.firebase_ready = True
+
+        error = await qdrant_service.ensure_collection_exists()
+        self.collections_ready = error is None
+
+        if settings.retention_mode == "embedded":
+            self.tasks.append(asyncio.create_task(run_retention_periodically(
+                qdrant_service.client, qdrant_service.collection_names, LeaderLock(settings.retention_lock_path)
+            )))
+        self.tasks.append(asyncio.create_task(refresh_public_certs_periodically()))
+        if settings.embedding_warmup:
+            self.tasks.append(asyncio.create_task(qdrant_service.warm_up()))
+
+    async def stop(self):
+        for task in self.tasks:
+            task.cancel()
+        await asyncio.gather(*self.tasks, return_exceptions=True)
+        self.tasks.clear()
+
+        await qdrant_service.embedder.close()
+        await qdrant_service.client.close()
+        qdrant_service.embedding_cache.close()
+        shutdown_executors()
+
+    def readiness(self) -> dict:
+        checks = {
+            "firebase": self.firebase_ready,
+            "collections": self.collections_ready,
+            "embedding_model": qdrant_service.model_loaded
+        }
+        # Without warm-up the model loads on the first request, so don't hold readiness for it
+        required = [name for name in checks if settings.embedding_warmup or name != "embedding_model"]
+        return {
+            "ready": all(checks[name] for name in required),
+            "checks": checks,
+            "schema_drift": qdrant_service.schema_drift
+        }
+
+services = ServiceContainer()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    start_logging()
+    try:
+        await services.start()
+        logger.info("Application startup complete")
+        try:
+            yield
+        finally:
+            await services.stop()
+    finally:
+        stop_logging()
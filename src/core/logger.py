@@ -1,13 +1,32 @@
+import atexit
+import copy
+import json
 import logging
+import os
+import queue
+import random
 import sys
-from logging.handlers import RotatingFileHandler
-from datetime import datetime
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+from typing import Dict, Optional
 import colorama
 from colorama import Fore, Style
+from .config import settings
+from .metrics import registry
 
 # Initialize colorama for cross-platform color support
 colorama.init()
 
+# Set per request by RequestContextMiddleware
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+log_sampled_var: ContextVar[bool] = ContextVar("log_sampled", default=True)
+
+# Attributes every LogRecord has; anything else was passed through ``extra=``
+_RECORD_ATTRS = set(logging.makeLogRecord({}).__dict__) | {"message", "asctime", "request_id"}
+
+dropped_records = registry.counter("log_records_dropped_total", "Log records dropped because the log queue was full")
+
 class ColoredFormatter(logging.Formatter):
     COLORS = {
         'DEBUG': Fore.BLUE,
@@ -21,59 +40,169 @@ class ColoredFormatter(logging.Formatter):
         # Color the entire format string for console output
         color = self.COLORS.get(record.levelname, '')
         formatted_message = super().format(record)
-        
+
         # Add color to the entire message for console output
         if color:
             formatted_message = f"{color}{formatted_message}{Style.RESET_ALL}"
-            
+
         return formatted_message
 
-def setup_logger():
-    # Configure root logger to handle external library logs
-    root_logger = logging.getLogger()
-    root_logger.setLevel(logging.INFO)
-    
-    # Create console handler for root logger
-    root_console_handler = logging.StreamHandler(sys.stdout)
-    root_console_handler.setFormatter(ColoredFormatter(
-        '%(asctime)s │ %(levelname)-8s │ %(name)s │ %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    ))
-    root_logger.addHandler(root_console_handler)
-
-    # Setup application logger
-    logger = logging.getLogger('journal_app')
-    logger.setLevel(logging.INFO)
-    
-    # Prevent propagation to avoid duplicate logs
-    logger.propagate = False
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line, with the request id and any ``extra`` fields."""
 
-    # Console handler with colors
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+        }
+        request_id = getattr(record, "request_id", None)
+        if request_id and request_id != "-":
+            entry["request_id"] = request_id
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            # Rendered before the record was queued, see DroppingQueueHandler.prepare
+            entry["exc_info"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+class RequestContextFilter(logging.Filter):
+    """Tags records with the current request id and drops info logs of unsampled requests.
+
+    Runs on the calling thread before the record is queued, so it sees the
+    request's context variables and dropped records cost nothing further. The
+    listener thread runs it again on the output handlers, where a record that
+    is already tagged keeps its id.
+    """
+
+    def filter(self, record):
+        if getattr(record, "request_id", None) is not None:
+            return True
+        if record.levelno < logging.WARNING and not log_sampled_var.get():
+            return False
+        record.request_id = request_id_var.get() or "-"
+        return True
+
+def sample_rate_for(path: str, rates: Dict[str, float]) -> float:
+    """Sample rate of the longest configured path prefix matching ``path``."""
+    best, rate = -1, 1.0
+    for prefix, prefix_rate in rates.items():
+        if path.startswith(prefix) and len(prefix) > best:
+            best, rate = len(prefix), prefix_rate
+    return rate
+
+def should_log_request(path: str) -> bool:
+    rate = sample_rate_for(path, settings.log_sample_rates)
+    return rate >= 1.0 or random.random() < rate
+
+def _build_handlers():
+    text_format = '%(asctime)s │ %(levelname)-8s │ %(name)s │ %(request_id)s │ %(message)s'
     console_handler = logging.StreamHandler(sys.stdout)
-    console_handler.setLevel(logging.INFO)
-    console_format = ColoredFormatter(
-        '%(asctime)s │ %(levelname)-8s │ %(name)s │ %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    console_handler.setFormatter(console_format)
-
-    # File handler (without colors)
-    file_handler = RotatingFileHandler(
-        'logs/journal_app.log',
-        maxBytes=1024 * 1024,  # 1MB
-        backupCount=5
-    )
-    file_handler.setLevel(logging.INFO)
-    file_format = logging.Formatter(
-        '[%(asctime)s] %(levelname)-8s [%(name)s:%(lineno)d] - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    file_handler.setFormatter(file_format)
-
-    # Add handlers
-    logger.addHandler(console_handler)
-    logger.addHandler(file_handler)
+    if settings.log_format == "json":
+        console_handler.setFormatter(JsonFormatter())
+    else:
+        console_handler.setFormatter(ColoredFormatter(text_format, datefmt='%Y-%m-%d %H:%M:%S'))
+    handlers = [console_handler]
+
+    if settings.log_file:
+        log_dir = os.path.dirname(settings.log_file)
+        if log_dir:
+            os.makedirs(log_dir, exist_ok=True)
+        file_handler = RotatingFileHandler(
+            settings.log_file,
+            maxBytes=settings.log_file_max_bytes,
+            backupCount=settings.log_file_backup_count
+        )
+        file_handler.setFormatter(JsonFormatter())
+        handlers.append(file_handler)
+    return handlers
 
+class DroppingQueueHandler(QueueHandler):
+    """Queue handler that drops records rather than block when the queue is full.
+
+    The stock handler renders the whole record, traceback included, into
+    ``msg`` and clears ``exc_info``; this one only renders the message and
+    keeps the traceback in ``exc_text``, so formatters still see it apart.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            if not record.exc_text:
+                record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            dropped_records.inc(level=record.levelname)
+
+_handlers: list = []
+_queue_handler: Optional[QueueHandler] = None
+_listener: Optional[QueueListener] = None
+
+def _route_root(handlers):
+    root_logger = logging.getLogger()
+    for handler in list(root_logger.handlers):
+        root_logger.removeHandler(handler)
+    for handler in handlers:
+        root_logger.addHandler(handler)
+
+def setup_logger():
+    """Configure logging to write directly to console and file.
+
+    This starts no threads, so importing the module has no side effects and
+    scripts log synchronously. The app calls start_logging() from its
+    lifespan to move that I/O onto a listener thread.
+    """
+    global _handlers, _queue_handler
+    level = logging.getLevelName(settings.log_level.upper())
+    logging.getLogger().setLevel(level)
+
+    _handlers = _build_handlers()
+    for handler in _handlers:
+        handler.addFilter(RequestContextFilter())
+    _queue_handler = DroppingQueueHandler(queue.Queue(maxsize=settings.log_queue_size))
+    _queue_handler.addFilter(RequestContextFilter())
+    _route_root(_handlers)
+
+    # Application logger; propagates to the root handlers
+    logger = logging.getLogger('journal_app')
+    logger.setLevel(level)
     return logger
 
-logger = setup_logger()
\ No newline at end of file
+def start_logging():
+    """Route all logging through a bounded queue drained by a background thread.
+
+    Callers only pay for formatting the message and enqueueing it; console and
+    file I/O happen on the listener thread. Everything goes through a single
+    handler on the root logger, so application and library logs appear once.
+    When the queue is full, new records are dropped and counted.
+    """
+    global _listener
+    if _listener is not None:
+        return
+    _listener = QueueListener(_queue_handler.queue, *_handlers, respect_handler_level=True)
+    _listener.start()
+    _route_root([_queue_handler])
+    atexit.register(stop_logging)
+
+def stop_logging():
+    """Flush queued records, stop the listener thread and log directly again."""
+    global _listener
+    if _listener is not None:
+        _route_root(_handlers)
+        _listener.stop()
+        _listener = None
+
+logger = setup_logger()
@@ -0,0 +1,160 @@
+import re
+import time
+from uuid import uuid4
+from .logger import request_id_var, log_sampled_var, should_log_request
+from .metrics import registry
+from .profiling import RequestProfiler, request_profiler
+
+REQUEST_ID_HEADER = b"x-request-id"
+PROFILE_TOKEN_HEADER = b"x-profile-token"
+PROFILE_ID_HEADER = b"x-profile-id"
+# Accept caller-supplied ids only if they are short and log-safe
+_VALID_REQUEST_ID = re.compile(rb"^[A-Za-z0-9._:-]{1,128}$")
+
+http_requests = registry.counter("http_requests_total", "HTTP requests by method, route and status")
+http_request_seconds = registry.histogram(
+    "http_request_seconds",
+    "Time to handle an HTTP request, until its response is fully sent",
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+)
+http_in_flight = registry.gauge("http_requests_in_flight", "HTTP requests being handled")
+http_errors = registry.counter(
+    "http_request_errors_total",
+    "Failed HTTP requests: 5xx responses, unhandled exceptions and APIResponse errors"
+)
+
+class RequestContextMiddleware:
+    """Gives every request an id and decides whether its info logs are sampled.
+
+    The id comes from an incoming ``X-Request-ID`` header when one is present,
+    and is echoed back on the response. Pure ASGI rather than BaseHTTPMiddleware
+    so streaming responses pass straight through.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = None
+        for name, value in scope.get("headers", []):
+            if name == REQUEST_ID_HEADER and _VALID_REQUEST_ID.match(value):
+                request_id = value.decode("latin-1")
+                break
+        request_id = request_id or uuid4().hex
+
+        async def send_with_request_id(message):
+            if message["type"] == "http.response.start":
+                headers = list(message.get("headers", []))
+                headers.append((REQUEST_ID_HEADER, request_id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        id_token = request_id_var.set(request_id)
+        sampled_token = log_sampled_var.set(should_log_request(scope.get("path", "")))
+        try:
+            await self.app(scope, receive, send_with_request_id)
+        finally:
+            request_id_var.reset(id_token)
+            log_sampled_var.reset(sampled_token)
+
+class MetricsMiddleware:
+    """Records latency, status and failures of every request, per endpoint.
+
+    Requests are labelled by route template (``/api/v1/journals/{journal_id}``)
+    so ids in paths don't each create a series. Most endpoints report failures
+    as an APIResponse with ``"success": false`` and a 200 status, so the start
+    of JSON response bodies is checked for that too.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        is_json = False
+        api_error = False
+        body_seen = False
+
+        async def send_recording(message):
+            nonlocal status, is_json, api_error, body_seen
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                for name, value in message.get("headers", []):
+                    if name == b"content-type":
+                        is_json = value.startswith(b"application/json")
+            elif message["type"] == "http.response.body" and not body_seen:
+                body_seen = True
+                # JSONResponse renders compactly and APIResponse declares success first
+                api_error = is_json and message.get("body", b"").startswith(b'{"success":false')
+            await send(message)
+
+        http_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_recording)
+        except Exception:
+            status = 500
+            raise
+        finally:
+            http_in_flight.dec()
+            # Routing records the matched route in the scope
+            route = scope.get("route")
+            labels = {"method": scope["method"], "route": getattr(route, "path", "unmatched")}
+            http_request_seconds.observe(time.perf_counter() - started, **labels)
+            http_requests.inc(status=status, **labels)
+            if status >= 500 or api_error:
+                http_errors.inc(**labels)
+
+class ProfilingMiddleware:
+    """Profiles requests chosen by the request profiler and reports the profile id.
+
+    The response of a profiled request carries ``X-Profile-Id``, the id to fetch
+    the profile by from the admin API.
+    """
+
+    def __init__(self, app, profiler: RequestProfiler = request_profiler):
+        self.app = app
+        self.profiler = profiler
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.profiler.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        header_token = None
+        if self.profiler.token:
+            for name, value in scope.get("headers", []):
+                if name == PROFILE_TOKEN_HEADER:
+                    header_token = value
+                    break
+        trigger = None
+        if header_token is not None or self.profiler.sampling:
+            trigger = self.profiler.trigger_for(header_token)
+        if trigger is None:
+            await self.app(scope, receive, send)
+            return
+
+        capture = self.profiler.begin(scope["method"], scope["path"], trigger)
+        status = None
+
+        async def send_with_profile_id(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((PROFILE_ID_HEADER, capture.profile.id.encode("latin-1")))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_profile_id)
+        finally:
+            self.profiler.finish(capture, status)
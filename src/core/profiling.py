@@ -0,0 +1,201 @@
+"""Opt-in per-request profiling.
+
+A request under PROFILING_PATH_PREFIX is profiled when it carries an
+``X-Profile-Token`` header equal to ADMIN_TOKEN or, while profiling is enabled
+(PROFILING_ENABLED, or at runtime through the admin API), with probability
+PROFILING_SAMPLE_RATE. Either way at most PROFILING_MAX_PER_MINUTE requests per
+worker are profiled.
+
+With pyinstrument installed a profile holds a sampled call tree of the request,
+with time spent awaiting attributed to the awaiting frame, rendered as text,
+HTML or speedscope JSON when fetched. Without it, a profile records wall and
+CPU time only. The last PROFILING_BUFFER_SIZE profiles are kept in memory.
+
+When profiling is off and the header isn't configured, the middleware does no
+more than a path prefix check per request.
+"""
+import hmac
+import importlib.util
+import random
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, List, Optional
+from uuid import uuid4
+from .config import settings
+from .logger import logger, request_id_var
+from .metrics import registry
+
+PROFILE_FORMATS = ("text", "html", "speedscope")
+
+profiles_captured = registry.counter("profiles_captured_total", "Request profiles captured, by trigger")
+profiles_rate_limited = registry.counter("profiles_rate_limited_total", "Profiles skipped by the per-minute limit")
+
+@dataclass
+class Profile:
+    id: str
+    method: str
+    path: str
+    trigger: str
+    started_at: float
+    request_id: Optional[str] = None
+    status: Optional[int] = None
+    wall_seconds: float = 0.0
+    # Process CPU time while the request ran; includes other requests served concurrently
+    cpu_seconds: float = 0.0
+    session: Any = None
+
+    def summary(self) -> dict:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "trigger": self.trigger,
+            "started_at": self.started_at,
+            "request_id": self.request_id,
+            "status": self.status,
+            "wall_seconds": round(self.wall_seconds, 6),
+            "cpu_seconds": round(self.cpu_seconds, 6),
+            "call_tree": self.session is not None,
+        }
+
+class RateLimiter:
+    """Token bucket refilling ``per_minute`` tokens a minute."""
+
+    def __init__(self, per_minute: int):
+        self.per_minute = max(0, per_minute)
+        self._tokens = float(self.per_minute)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.per_minute, self._tokens + (now - self._updated) * self.per_minute / 60)
+            self._updated = now
+            if self._tokens < 1:
+                return False
+            self._tokens -= 1
+            return True
+
+class _Capture:
+    __slots__ = ("profile", "profiler", "started", "cpu_started")
+
+    def __init__(self, profile: Profile, profiler):
+        self.profile = profile
+        self.profiler = profiler
+        self.started = time.perf_counter()
+        self.cpu_started = time.process_time()
+
+class RequestProfiler:
+    def __init__(self, token: str = "", enabled: bool = False, sample_rate: float = 0.0,
+                 max_per_minute: int = 10, buffer_size: int = 50, interval_seconds: float = 0.001,
+                 path_prefix: str = "/api/v1/journals"):
+        self.token = token.encode("utf-8")
+        self.enabled = enabled
+        self.sample_rate = min(1.0, max(0.0, sample_rate))
+        self.limiter = RateLimiter(max_per_minute)
+        self.buffer_size = max(1, buffer_size)
+        self.interval_seconds = interval_seconds
+        self.path_prefix = path_prefix
+        self.call_trees = importlib.util.find_spec("pyinstrument") is not None
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def sampling(self) -> bool:
+        return self.enabled and self.sample_rate > 0
+
+    def configure(self, enabled: Optional[bool] = None, sample_rate: Optional[float] = None):
+        if enabled is not None:
+            self.enabled = enabled
+        if sample_rate is not None:
+            self.sample_rate = min(1.0, max(0.0, sample_rate))
+        logger.info(f"Request profiling {'enabled' if self.enabled else 'disabled'}, "
+                    f"sample rate {self.sample_rate}")
+
+    def state(self) -> dict:
+        return {
+            "enabled": self.enabled,
+            "sample_rate": self.sample_rate,
+            "max_per_minute": self.limiter.per_minute,
+            "header_enabled": bool(self.token),
+            "call_trees": self.call_trees,
+            "buffered": len(self._profiles),
+        }
+
+    def trigger_for(self, header_token: Optional[bytes]) -> Optional[str]:
+        """Why this request should be profiled, or None if it shouldn't."""
+        if header_token is not None and self.token and hmac.compare_digest(header_token, self.token):
+            trigger = "header"
+        elif self.sampling and random.random() < self.sample_rate:
+            trigger = "sampled"
+        else:
+            return None
+        if not self.limiter.allow():
+            profiles_rate_limited.inc()
+            return None
+        return trigger
+
+    def begin(self, method: str, path: str, trigger: str) -> _Capture:
+        profile = Profile(
+            id=uuid4().hex[:16], method=method, path=path, trigger=trigger,
+            started_at=time.time(), request_id=request_id_var.get()
+        )
+        profiler = None
+        if self.call_trees:
+            from pyinstrument import Profiler
+            # async_mode follows the request's own task across awaits
+            profiler = Profiler(interval=self.interval_seconds, async_mode="enabled")
+            profiler.start()
+        return _Capture(profile, profiler)
+
+    def finish(self, capture: _Capture, status: Optional[int]):
+        profile = capture.profile
+        profile.wall_seconds = time.perf_counter() - capture.started
+        profile.cpu_seconds = time.process_time() - capture.cpu_started
+        profile.status = status
+        if capture.profiler is not None:
+            try:
+                profile.session = capture.profiler.stop()
+            except Exception as e:
+                logger.warning(f"Failed to stop profiler for {profile.path}: {str(e)}")
+        profiles_captured.inc(trigger=profile.trigger)
+        with self._lock:
+            self._profiles[profile.id] = profile
+            while len(self._profiles) > self.buffer_size:
+                self._profiles.popitem(last=False)
+
+    def profiles(self) -> List[Profile]:
+        """Buffered profiles, newest first."""
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+
+    @staticmethod
+    def render(profile: Profile, fmt: str) -> str:
+        """Render a profile's call tree; the profile must have one."""
+        from pyinstrument.renderers import ConsoleRenderer, HTMLRenderer, SpeedscopeRenderer
+        if fmt == "html":
+            return HTMLRenderer().render(profile.session)
+        if fmt == "speedscope":
+            return SpeedscopeRenderer().render(profile.session)
+        return ConsoleRenderer(unicode=True, color=False, show_all=False).render(profile.session)
+
+request_profiler = RequestProfiler(
+    token=settings.admin_token,
+    enabled=settings.profiling_enabled,
+    sample_rate=settings.profiling_sample_rate,
+    max_per_minute=settings.profiling_max_per_minute,
+    buffer_size=settings.profiling_buffer_size,
+    interval_seconds=settings.profiling_interval_ms / 1000,
+    path_prefix=settings.profiling_path_prefix
+)
@@ -1,8 +1,11 @@
+from typing import Optional
+
 class PromptTemplates:
     @staticmethod
-    def get_chat_prompt(context: str, query: str) -> str:
+    def get_chat_prompt(context: str, query: str, period: Optional[str] = None) -> str:
+        entries = f"my journal entries from {period}" if period else "the journal entries most related to my message"
         return (
-            f"You're chatting with me based on my journal entries from the last few days: '{context}'. "
+            f"You're chatting with me based on {entries}: '{context}'. "
             f"Respond to my message '{query}' as if you're my journals talking back to me in a casual, friendly way. "
             "Keep it natural and stick to what's in the context."
         )
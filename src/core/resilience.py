@@ -0,0 +1,235 @@
+"""Guard rails for calls to upstream services.
+
+``ResilientCaller`` wraps an async call with a concurrency limit, a per-attempt
+timeout inside an overall deadline, jittered exponential backoff on retryable
+errors, a circuit breaker and optional hedging. Each instance reports metrics
+under its ``name``. Time spent queued for the concurrency limit only counts
+against the deadline, and never as an upstream failure.
+"""
+import asyncio
+import random
+import time
+from typing import Awaitable, Callable, Optional, TypeVar
+from .metrics import registry
+from .logger import logger
+
+T = TypeVar("T")
+
+calls_total = registry.counter("upstream_calls_total", "Upstream calls by outcome")
+retries_total = registry.counter("upstream_retries_total", "Upstream call attempts that were retried")
+hedges_total = registry.counter("upstream_hedges_total", "Hedged duplicate requests by which request won")
+call_seconds = registry.histogram("upstream_call_seconds", "Wall time of an upstream call, including retries")
+in_flight = registry.gauge("upstream_in_flight", "Upstream requests currently running")
+breaker_state = registry.gauge("upstream_circuit_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open")
+breaker_opened = registry.counter("upstream_circuit_opened_total", "Times the circuit breaker opened")
+
+class CircuitOpenError(Exception):
+    def __init__(self, name: str, retry_after: float):
+        self.retry_after = retry_after
+        super().__init__(f"{name} is unavailable, retry in {retry_after:.0f}s")
+
+class UpstreamTimeoutError(asyncio.TimeoutError):
+    pass
+
+class LimiterTimeoutError(UpstreamTimeoutError):
+    """The deadline ran out while waiting for the local concurrency limit, before any request was sent."""
+
+class CircuitBreaker:
+    """Opens after ``failure_threshold`` consecutive failures.
+
+    While open every call is rejected. After ``reset_timeout_seconds`` one trial
+    call is let through (half-open); its success closes the circuit again, its
+    failure re-opens it. A trial that ends without saying anything about the
+    upstream (a caller error, or cancellation) is released, letting the next
+    call try instead.
+    """
+
+    CLOSED, HALF_OPEN, OPEN = 0, 1, 2
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout_seconds: float = 30.0):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout_seconds = reset_timeout_seconds
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def _set_state(self, state: int):
+        self.state = state
+        breaker_state.set(state, upstream=self.name)
+
+    def check(self):
+        """Raise CircuitOpenError unless a call may go ahead."""
+        if self.state == self.CLOSED:
+            return
+        elapsed = time.monotonic() - self.opened_at
+        if self.state == self.OPEN and elapsed >= self.reset_timeout_seconds:
+            self._set_state(self.HALF_OPEN)
+        if self.state == self.HALF_OPEN and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return
+        raise CircuitOpenError(self.name, max(0.0, self.reset_timeout_seconds - elapsed))
+
+    def release_trial(self):
+        self._trial_in_flight = False
+
+    def record_success(self):
+        self.failures = 0
+        self._trial_in_flight = False
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+            self._set_state(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self._trial_in_flight = False
+        if self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                logger.warning(f"Circuit for {self.name} opened after {self.failures} failures")
+                breaker_opened.inc(upstream=self.name)
+            self.opened_at = time.monotonic()
+            self._set_state(self.OPEN)
+
+class ResilientCaller:
+    def __init__(self, name: str, semaphore: Optional[asyncio.Semaphore] = None,
+                 is_retryable: Callable[[BaseException], bool] = lambda e: False,
+                 timeout_seconds: float = 30.0, deadline_seconds: float = 60.0, max_attempts: int = 3,
+                 base_delay_seconds: float = 0.5, max_delay_seconds: float = 8.0,
+                 breaker: Optional[CircuitBreaker] = None, hedge_after_seconds: float = 0.0):
+        self.name = name
+        self.semaphore = semaphore
+        self.is_retryable = is_retryable
+        self.timeout_seconds = timeout_seconds
+        self.deadline_seconds = deadline_seconds
+        self.max_attempts = max(1, max_attempts)
+        self.base_delay_seconds = base_delay_seconds
+        self.max_delay_seconds = max_delay_seconds
+        self.breaker = breaker
+        self.hedge_after_seconds = hedge_after_seconds
+
+    def backoff(self, attempt: int) -> float:
+        """Full-jitter exponential backoff before retry number ``attempt`` (0-based)."""
+        return random.uniform(0, min(self.max_delay_seconds, self.base_delay_seconds * 2 ** attempt))
+
+    def _retryable(self, e: BaseException) -> bool:
+        return isinstance(e, asyncio.TimeoutError) or self.is_retryable(e)
+
+    async def _limited(self, func: Callable[[], Awaitable[T]], deadline: float) -> T:
+        """Run one attempt once the semaphore allows; the wait for it is bounded by the deadline alone."""
+        if self.semaphore is None:
+            return await self._run(func, deadline)
+        try:
+            await asyncio.wait_for(self.semaphore.acquire(), deadline - asyncio.get_running_loop().time())
+        except asyncio.TimeoutError:
+            raise LimiterTimeoutError(f"{self.name} deadline exceeded waiting for a concurrency slot") from None
+        try:
+            return await self._run(func, deadline)
+        finally:
+            self.semaphore.release()
+
+    async def _run(self, func: Callable[[], Awaitable[T]], deadline: float) -> T:
+        """One attempt, timed from when it is actually sent."""
+        timeout = min(self.timeout_seconds, deadline - asyncio.get_running_loop().time())
+        in_flight.inc(upstream=self.name)
+        try:
+            return await asyncio.wait_for(func(), timeout)
+        finally:
+            in_flight.dec(upstream=self.name)
+
+    async def _hedged(self, func: Callable[[], Awaitable[T]], deadline: float) -> T:
+        """Start a duplicate request if the first is slow and return whichever succeeds first."""
+        tasks = [asyncio.ensure_future(self._limited(func, deadline))]
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_after_seconds)
+            # Don't hedge into a saturated limiter; that only queues behind real traffic
+            if done or (self.semaphore is not None and self.semaphore.locked()):
+                return await tasks[0]
+
+            tasks.append(asyncio.ensure_future(self._limited(func, deadline)))
+            pending = set(tasks)
+            error = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        hedges_total.inc(upstream=self.name, winner="hedge" if task is tasks[1] else "primary")
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def call(self, func: Callable[[], Awaitable[T]], hedge: bool = True, limit: bool = True) -> T:
+        """Await ``func()`` under the configured limits, retrying retryable failures.
+
+        ``func`` is called afresh for every attempt. Pass ``limit=False`` when the
+        caller already holds the semaphore, e.g. for the whole of a streamed response.
+        """
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        deadline = started + self.deadline_seconds
+        attempt = 0
+        try:
+            while True:
+                if self.breaker is not None:
+                    self.breaker.check()
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise UpstreamTimeoutError(f"{self.name} deadline of {self.deadline_seconds}s exceeded")
+
+                if hedge and self.hedge_after_seconds > 0 and limit:
+                    request = self._hedged(func, deadline)
+                elif limit:
+                    request = self._limited(func, deadline)
+                else:
+                    request = self._run(func, deadline)
+                try:
+                    result = await request
+                except LimiterTimeoutError:
+                    # Local saturation says nothing about upstream health, and retrying can't help
+                    if self.breaker is not None:
+                        self.breaker.release_trial()
+                    raise
+                except Exception as e:
+                    if not self._retryable(e):
+                        # Caller errors say nothing about upstream health
+                        if self.breaker is not None:
+                            self.breaker.release_trial()
+                        raise
+                    if self.breaker is not None:
+                        self.breaker.record_failure()
+                    attempt += 1
+                    delay = self.backoff(attempt - 1)
+                    if attempt >= self.max_attempts or loop.time() + delay >= deadline:
+                        if isinstance(e, asyncio.TimeoutError) and not isinstance(e, UpstreamTimeoutError):
+                            raise UpstreamTimeoutError(f"{self.name} timed out") from e
+                        raise
+                    retries_total.inc(upstream=self.name)
+                    logger.warning(f"{self.name} call failed ({type(e).__name__}: {str(e)}), "
+                                   f"retrying in {delay:.2f}s")
+                    await asyncio.sleep(delay)
+                    continue
+                except BaseException:
+                    # Cancelled mid-call: don't leave a half-open circuit waiting on a trial forever
+                    if self.breaker is not None:
+                        self.breaker.release_trial()
+                    raise
+
+                if self.breaker is not None:
+                    self.breaker.record_success()
+                calls_total.inc(upstream=self.name, outcome="success")
+                return result
+        except CircuitOpenError:
+            calls_total.inc(upstream=self.name, outcome="circuit_open")
+            raise
+        except asyncio.TimeoutError:
+            calls_total.inc(upstream=self.name, outcome="timeout")
+            raise
+        except Exception:
+            calls_total.inc(upstream=self.name, outcome="error")
+            raise
+        finally:
+            call_seconds.observe(loop.time() - started, upstream=self.name)
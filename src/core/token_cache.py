@@ -0,0 +1,59 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+class VerifiedTokenCache:
+    """Bounded cache of verified ID token claims.
+
+    Keys are SHA-256 hashes so raw tokens are never held in memory. An entry
+    lives until the token's own ``exp`` (less a safety margin) or
+    ``max_ttl_seconds``, whichever comes first.
+    """
+
+    def __init__(self, max_entries: int = 10000, max_ttl_seconds: float = 600, expiry_margin_seconds: float = 30):
+        self.max_entries = max_entries
+        self.max_ttl_seconds = max_ttl_seconds
+        self.expiry_margin_seconds = expiry_margin_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(token: str) -> str:
+        return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        key = self.key(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, token: str, claims: Dict):
+        now = time.time()
+        expires_at = now + self.max_ttl_seconds
+        if "exp" in claims:
+            expires_at = min(expires_at, float(claims["exp"]) - self.expiry_margin_seconds)
+        if expires_at <= now:
+            return
+
+        key = self.key(token)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
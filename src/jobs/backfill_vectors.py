@@ -0,0 +1,108 @@
+"""Re-embed journals into the configured vector representation.
+
+Usage:
+    python -m src.jobs.backfill_vectors --source journals --target journals_v2
+    python -m src.jobs.backfill_vectors --source journals --target journals   # re-embed in place
+
+Every point of the ``source`` collection(s) is read without its vectors, its
+title and content are embedded as JOURNALS_VECTORS and JOURNALS_COMBINED_VECTOR
+describe (plus the lexical sparse vector if JOURNALS_SEARCH_MODE is hybrid),
+and it is written with the same id and payload to the ``target``
+collection(s), which are created under the current JOURNALS_LAYOUT. Points are
+overwritten rather than duplicated, so the job can simply be re-run to pick up
+journals written while it ran. Set JOURNALS_COLLECTION to the target and restart
+the API once it's done.
+
+Switching between single and named vectors, or to hybrid search, changes the
+collection's vector layout, which Qdrant can't do in place, so it needs a new
+target collection.
+"""
+import argparse
+import asyncio
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import PointStruct
+from ..core.config import settings
+from ..core.logger import logger
+from ..services.collection_schema import SchemaManager, journals_layout_schemas, shard_collection_name
+
+EmbedJournals = Callable[[List[Tuple[str, str]]], Awaitable[list]]
+
+async def backfill_vectors(client: AsyncQdrantClient, embed_journals: EmbedJournals, source: str, target: str,
+                           layout: str, shard_count: int, vector_names: Optional[List[str]],
+                           batch_size: int = 64, vector_size: int = 384, lexical: bool = False) -> int:
+    """Re-embed every journal from ``source`` into ``target`` and return the number of points written."""
+    manager = SchemaManager(client)
+    target_schemas = journals_layout_schemas(
+        layout, target, shard_count, vector_size=vector_size, vector_names=vector_names, lexical=lexical
+    )
+    for schema in target_schemas:
+        drift = await manager.apply(schema)
+        vector_drift = [item for item in drift if item.startswith(("vector", "sparse vector"))]
+        if vector_drift:
+            raise RuntimeError(f"'{schema.name}' has a different vector layout ({'; '.join(vector_drift)}); "
+                               f"backfill into a new collection instead")
+
+    def target_for(user_id: str) -> str:
+        if layout == "sharded":
+            return shard_collection_name(target, user_id, shard_count)
+        return target
+
+    written = 0
+    started = time.perf_counter()
+    for source_name in [schema.name for schema in journals_layout_schemas(layout, source, shard_count)]:
+        if not await client.collection_exists(source_name):
+            continue
+        offset = None
+        while True:
+            points, offset = await client.scroll(
+                source_name, limit=batch_size, offset=offset, with_payload=True, with_vectors=False
+            )
+            if points:
+                vectors = await embed_journals([
+                    (point.payload.get("title", ""), point.payload.get("content", "")) for point in points
+                ])
+                by_target = {}
+                for point, vector in zip(points, vectors):
+                    by_target.setdefault(target_for(point.payload.get("userId", "")), []).append(
+                        PointStruct(id=point.id, vector=vector, payload=point.payload)
+                    )
+                await asyncio.gather(*(
+                    client.upsert(name, points=batch, wait=True) for name, batch in by_target.items()
+                ))
+                written += len(points)
+                logger.info(f"Re-embedded {written} journals ({time.perf_counter() - started:.1f}s)")
+            if offset is None:
+                break
+
+    return written
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-embed journals into the configured vector representation")
+    parser.add_argument("--source", default=settings.journals_collection)
+    parser.add_argument("--target", required=True)
+    parser.add_argument("--batch-size", type=int, default=64)
+    args = parser.parse_args()
+
+    # Imported here so --help doesn't construct the service
+    from ..services.qdrant_service import qdrant_service
+
+    async def run():
+        client = AsyncQdrantClient(settings.qdrant_url)
+        try:
+            written = await backfill_vectors(
+                client, qdrant_service.embed_journals, args.source, args.target,
+                settings.journals_layout, settings.journals_shard_count, qdrant_service.vector_names,
+                args.batch_size, lexical=qdrant_service.lexical
+            )
+            logger.info(f"Backfill {args.source} -> {args.target} finished, {written} journals re-embedded")
+        finally:
+            await client.close()
+            await qdrant_service.embedder.close()
+            qdrant_service.embedding_cache.close()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""Move journals between storage layouts.
+
+Usage:
+    python -m src.jobs.migrate_layout --from shared --to tenant
+    python -m src.jobs.migrate_layout --from shared --to sharded --delete-source
+
+``shared`` <-> ``tenant`` is an in-place HNSW reconfiguration of the same
+collection; Qdrant rebuilds the graphs in the background. Moving to or from
+``sharded`` copies every point (payload and vectors) into the target
+collections. Switch JOURNALS_LAYOUT and restart the API once the job is done.
+"""
+import argparse
+import asyncio
+import time
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import PointStruct
+from ..core.config import settings
+from ..core.logger import logger
+from ..services.collection_schema import (
+    JOURNAL_LAYOUTS, SchemaManager, journals_layout_schemas, shard_collection_name
+)
+from ..services.journal_vectors import journal_vector_names, uses_lexical
+
+BASE_COLLECTION = settings.journals_collection
+
+async def migrate_layout(client: AsyncQdrantClient, source: str, target: str, shard_count: int,
+                         batch_size: int = 256, delete_source: bool = False) -> int:
+    """Migrate journals from the ``source`` to the ``target`` layout and return the points copied."""
+    manager = SchemaManager(client)
+    vector_names = journal_vector_names(settings.journals_vectors, settings.journals_combined_vector)
+    target_schemas = journals_layout_schemas(target, BASE_COLLECTION, shard_count, vector_names=vector_names,
+                                             lexical=uses_lexical(settings.journals_search_mode))
+    for schema in target_schemas:
+        await manager.apply(schema)
+
+    source_names = [s.name for s in journals_layout_schemas(source, BASE_COLLECTION, shard_count)]
+    target_names = [s.name for s in target_schemas]
+    if source_names == target_names:
+        logger.info(f"'{source}' and '{target}' share collections; HNSW settings updated in place")
+        return 0
+
+    def target_for(user_id: str) -> str:
+        if target == "sharded":
+            return shard_collection_name(BASE_COLLECTION, user_id, shard_count)
+        return BASE_COLLECTION
+
+    copied = 0
+    started = time.perf_counter()
+    for source_name in source_names:
+        if not await client.collection_exists(source_name):
+            continue
+        offset = None
+        while True:
+            points, offset = await client.scroll(
+                source_name, limit=batch_size, offset=offset, with_payload=True, with_vectors=True
+            )
+            by_target = {}
+            for point in points:
+                by_target.setdefault(target_for(point.payload.get("userId", "")), []).append(
+                    PointStruct(id=point.id, vector=point.vector, payload=point.payload)
+                )
+            await asyncio.gather(*(
+                client.upsert(name, points=batch, wait=True) for name, batch in by_target.items()
+            ))
+            copied += len(points)
+            logger.info(f"Copied {copied} journals ({time.perf_counter() - started:.1f}s)")
+            if offset is None:
+                break
+
+        if delete_source and source_name not in target_names:
+            await client.delete_collection(source_name)
+            logger.info(f"Deleted source collection '{source_name}'")
+
+    return copied
+
+def main():
+    parser = argparse.ArgumentParser(description="Migrate journals between storage layouts")
+    parser.add_argument("--from", dest="source", choices=JOURNAL_LAYOUTS, default=settings.journals_layout)
+    parser.add_argument("--to", dest="target", choices=JOURNAL_LAYOUTS, required=True)
+    parser.add_argument("--shard-count", type=int, default=settings.journals_shard_count)
+    parser.add_argument("--batch-size", type=int, default=256)
+    parser.add_argument("--delete-source", action="store_true")
+    args = parser.parse_args()
+
+    async def run():
+        client = AsyncQdrantClient(settings.qdrant_url)
+        try:
+            copied = await migrate_layout(
+                client, args.source, args.target, args.shard_count, args.batch_size, args.delete_source
+            )
+            logger.info(f"Layout migration {args.source} -> {args.target} finished, {copied} journals copied")
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
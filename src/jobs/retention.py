@@ -0,0 +1,235 @@
+"""Delete journals older than their owner's retention period.
+
+Usage:
+    python -m src.jobs.retention --once --dry-run
+    python -m src.jobs.retention                    # loop every RETENTION_INTERVAL_SECONDS
+
+Expired points are found with a payload-only scroll and deleted by id in
+chunks of ``RETENTION_CHUNK_SIZE``, paced to ``RETENTION_MAX_DELETES_PER_SECOND``
+so a large backlog doesn't turn into one huge delete that stalls Qdrant.
+
+Retention defaults to ``RETENTION_DAYS``. ``RETENTION_OVERRIDES_PATH`` may point
+at a JSON file with per-user settings, where ``null`` keeps a user's journals forever:
+
+    {"users": {"uid_1": 30, "uid_2": null}}
+
+With ``RETENTION_MODE=embedded`` the API workers run the job themselves, and
+a file lock makes sure only one worker per host does. Use ``external`` to run
+this module from cron or as its own service instead.
+"""
+import argparse
+import asyncio
+import fcntl
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import FieldCondition, Filter, MatchAny, PointIdsList, Range
+from ..core.config import settings
+from ..core.logger import logger
+from ..core.metrics import registry
+from ..services.collection_schema import journals_layout_schemas
+
+points_deleted = registry.counter("retention_points_deleted_total", "Journals removed by the retention job")
+points_expired = registry.counter("retention_points_expired_total", "Expired journals found, including dry runs")
+run_duration = registry.histogram(
+    "retention_run_seconds",
+    "Wall time of one retention pass",
+    buckets=(1, 5, 15, 60, 300, 900, 3600)
+)
+last_success = registry.gauge("retention_last_success_timestamp", "Unix time the last retention pass finished")
+
+@dataclass
+class RetentionPolicy:
+    default_days: int
+    # user id -> days, or None to keep that user's journals forever
+    overrides: Dict[str, Optional[int]] = field(default_factory=dict)
+
+    def days_for(self, user_id: str) -> Optional[int]:
+        return self.overrides.get(user_id, self.default_days)
+
+def load_retention_policy(default_days: int, overrides_path: Optional[str] = None) -> RetentionPolicy:
+    if not overrides_path:
+        return RetentionPolicy(default_days)
+    with open(overrides_path) as f:
+        data = json.load(f)
+    overrides = {}
+    for user_id, days in data.get("users", {}).items():
+        if days is not None and (not isinstance(days, int) or days < 1):
+            raise ValueError(f"Retention for user '{user_id}' must be a positive number of days or null")
+        overrides[user_id] = days
+    return RetentionPolicy(data.get("default_days", default_days), overrides)
+
+@dataclass
+class RetentionReport:
+    dry_run: bool
+    expired: int = 0
+    deleted: int = 0
+    seconds: float = 0.0
+    by_collection: Dict[str, int] = field(default_factory=dict)
+
+class RetentionJob:
+    def __init__(self, client: AsyncQdrantClient, collection_names: List[str], policy: RetentionPolicy,
+                 chunk_size: int = 256, max_deletes_per_second: float = 500.0, dry_run: bool = False):
+        self.client = client
+        self.collection_names = collection_names
+        self.policy = policy
+        self.chunk_size = max(1, chunk_size)
+        self.max_deletes_per_second = max_deletes_per_second
+        self.dry_run = dry_run
+
+    def _expiry_filters(self, now: float) -> List[Filter]:
+        """One filter per distinct retention period: the default, then each override group."""
+        def older_than(days):
+            return FieldCondition(key="createdAt", range=Range(lt=now - days * 86400))
+
+        overridden = list(self.policy.overrides)
+        filters = [Filter(
+            must=[older_than(self.policy.default_days)],
+            must_not=[FieldCondition(key="userId", match=MatchAny(any=overridden))] if overridden else None
+        )]
+        by_days: Dict[int, List[str]] = {}
+        for user_id, days in self.policy.overrides.items():
+            if days is not None:
+                by_days.setdefault(days, []).append(user_id)
+        for days, user_ids in sorted(by_days.items()):
+            filters.append(Filter(must=[
+                older_than(days),
+                FieldCondition(key="userId", match=MatchAny(any=user_ids))
+            ]))
+        return filters
+
+    async def _expire(self, collection_name: str, expiry_filter: Filter) -> int:
+        expired = 0
+        offset = None
+        while True:
+            points, next_offset = await self.client.scroll(
+                collection_name, scroll_filter=expiry_filter, limit=self.chunk_size,
+                offset=offset, with_payload=False, with_vectors=False
+            )
+            if not points:
+                break
+            ids = [point.id for point in points]
+            expired += len(ids)
+            points_expired.inc(len(ids), collection=collection_name)
+            if not self.dry_run:
+                started = time.monotonic()
+                # wait=True so the next chunk only goes out once Qdrant has applied this one
+                await self.client.delete(collection_name, points_selector=PointIdsList(points=ids), wait=True)
+                points_deleted.inc(len(ids), collection=collection_name)
+                if self.max_deletes_per_second > 0:
+                    await asyncio.sleep(max(0.0, len(ids) / self.max_deletes_per_second
+                                            - (time.monotonic() - started)))
+            if next_offset is None:
+                break
+            # Scroll pages by id, so deleting the ids already seen doesn't disturb the cursor
+            offset = next_offset
+        return expired
+
+    async def run_once(self, now: Optional[float] = None) -> RetentionReport:
+        now = time.time() if now is None else now
+        report = RetentionReport(dry_run=self.dry_run)
+        started = time.perf_counter()
+        for collection_name in self.collection_names:
+            if not await self.client.collection_exists(collection_name):
+                continue
+            expired = 0
+            for expiry_filter in self._expiry_filters(now):
+                expired += await self._expire(collection_name, expiry_filter)
+            report.by_collection[collection_name] = expired
+            report.expired += expired
+        if not self.dry_run:
+            report.deleted = report.expired
+        report.seconds = time.perf_counter() - started
+        run_duration.observe(report.seconds)
+        last_success.set(time.time())
+
+        verb = "would delete" if self.dry_run else "deleted"
+        logger.info(f"Retention pass {verb} {report.expired} journals in {report.seconds:.1f}s "
+                    f"{report.by_collection}")
+        return report
+
+class LeaderLock:
+    """Non-blocking exclusive file lock; whoever holds it runs the job on this host."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd = None
+
+    def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+        fd = os.open(self.path, os.O_CREAT | os.O_RDWR, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            os.close(fd)
+            return False
+        self._fd = fd
+        return True
+
+    def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+def build_retention_job(client: AsyncQdrantClient, collection_names: List[str],
+                        dry_run: Optional[bool] = None) -> RetentionJob:
+    policy = load_retention_policy(settings.retention_days, settings.retention_overrides_path or None)
+    return RetentionJob(
+        client,
+        collection_names,
+        policy,
+        chunk_size=settings.retention_chunk_size,
+        max_deletes_per_second=settings.retention_max_deletes_per_second,
+        dry_run=settings.retention_dry_run if dry_run is None else dry_run
+    )
+
+async def run_retention_periodically(client: AsyncQdrantClient, collection_names: List[str],
+                                     lock: Optional[LeaderLock] = None, dry_run: Optional[bool] = None):
+    """Run retention every RETENTION_INTERVAL_SECONDS while holding the leader lock."""
+    try:
+        while True:
+            if lock is None or lock.acquire():
+                try:
+                    # Rebuilt every pass so edits to the overrides file are picked up
+                    await build_retention_job(client, collection_names, dry_run).run_once()
+                except Exception as e:
+                    logger.error(f"Error during journal retention: {str(e)}")
+            await asyncio.sleep(settings.retention_interval_seconds)
+    finally:
+        if lock is not None:
+            lock.release()
+
+def main():
+    parser = argparse.ArgumentParser(description="Delete journals past their retention period")
+    parser.add_argument("--once", action="store_true", help="run a single pass and exit")
+    parser.add_argument("--dry-run", action=argparse.BooleanOptionalAction, default=settings.retention_dry_run,
+                        help="count expired journals without deleting them (default: RETENTION_DRY_RUN); "
+                             "--no-dry-run deletes them")
+    args = parser.parse_args()
+
+    collection_names = [
+        schema.name for schema in journals_layout_schemas(
+            settings.journals_layout, settings.journals_collection, settings.journals_shard_count
+        )
+    ]
+
+    async def run():
+        client = AsyncQdrantClient(settings.qdrant_url)
+        try:
+            if args.once:
+                await build_retention_job(client, collection_names, dry_run=args.dry_run).run_once()
+            else:
+                lock = LeaderLock(settings.retention_lock_path)
+                await run_retention_periodically(client, collection_names, lock, dry_run=args.dry_run)
+        finally:
+            await client.close()
+
+    asyncio.run(run())
+
+if __name__ == "__main__":
+    main()
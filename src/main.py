@@ -1,17 +1,17 @@
 from fastapi import FastAPI, Request
 from .api.v1.router import router as v1_router
 from .core.firebase import AuthError
+from .core.lifespan import lifespan, services
+from .core.metrics import registry
+from .core.middleware import MetricsMiddleware, ProfilingMiddleware, RequestContextMiddleware
 from .models.response import APIResponse
-from fastapi.responses import JSONResponse
-from .core.cleanup import cleanup_old_journals
-import asyncio
+from fastapi.responses import JSONResponse, PlainTextResponse
 
-app = FastAPI(title="Journal AI App", version="1.0.0")
-
-@app.on_event("startup")
-async def startup_event():
-    # Start the cleanup task in the background
-    asyncio.create_task(cleanup_old_journals())
+app = FastAPI(title="Journal AI App", version="1.0.0", lifespan=lifespan)
+# Added first so it runs innermost, inside the request id context
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(RequestContextMiddleware)
+app.add_middleware(MetricsMiddleware)
 
 @app.exception_handler(AuthError)
 async def auth_error_handler(request: Request, exc: AuthError):
@@ -29,3 +29,17 @@ app.include_router(v1_router)
 @app.get("/")
 async def root():
     return {"message": "Welcome to Journal AI"}
+
+@app.get("/ready")
+async def ready():
+    readiness = services.readiness()
+    if readiness["ready"]:
+        response = APIResponse.success_response(data=readiness, message="Service is ready")
+        return JSONResponse(status_code=200, content=response.dict())
+    response = APIResponse(success=False, message="Service is starting", error="NOT_READY", data=readiness)
+    return JSONResponse(status_code=503, content=response.dict())
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    return PlainTextResponse(registry.render_prometheus(), media_type="text/plain; version=0.0.4")
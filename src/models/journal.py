@@ -1,11 +1,15 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, Union
 from datetime import datetime
 
 class JournalCreate(BaseModel):
     title: str
     content: str = ""
 
+class JournalImport(JournalCreate):
+    # Original creation time when migrating history, as a Unix timestamp or ISO datetime
+    createdAt: Optional[Union[float, datetime]] = None
+
 class JournalUpdate(BaseModel):
     title: Optional[str] = None
     content: Optional[str] = None
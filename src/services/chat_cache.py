@@ -0,0 +1,94 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence
+import numpy as np
+from ..core.metrics import registry
+from .summary_cache import SummaryCache
+
+chat_cache_hits = registry.counter("chat_cache_hits_total", "Chat answers served from the semantic cache")
+chat_cache_misses = registry.counter("chat_cache_misses_total", "Chat answers that had to be generated")
+
+class _Entry:
+    __slots__ = ("expires_at", "vector", "fingerprint", "answer")
+
+    def __init__(self, expires_at: float, vector: np.ndarray, fingerprint: str, answer: str):
+        self.expires_at = expires_at
+        self.vector = vector
+        self.fingerprint = fingerprint
+        self.answer = answer
+
+class SemanticChatCache:
+    """Per-user cache of chat answers, matched by query similarity.
+
+    A cached answer is reused when a new message embeds within
+    ``similarity_threshold`` (cosine) of a previous one *and* retrieval
+    returned the same journals at the same versions, so paraphrases asked
+    against unchanged data skip the Gemini call. Each user keeps at most
+    ``entries_per_user`` answers and the least recently used users are evicted
+    beyond ``max_users``.
+    """
+
+    fingerprint = staticmethod(SummaryCache.fingerprint)
+
+    def __init__(self, similarity_threshold: float = 0.95, ttl_seconds: float = 60 * 60,
+                 entries_per_user: int = 50, max_users: int = 10000):
+        self.similarity_threshold = similarity_threshold
+        self.ttl_seconds = ttl_seconds
+        self.entries_per_user = entries_per_user
+        self.max_users = max_users
+        self._users: "OrderedDict[str, List[_Entry]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _normalize(vector: Sequence[float]) -> np.ndarray:
+        array = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(array)
+        return array / norm if norm else array
+
+    def get(self, user_id: str, query_vector: Sequence[float], fingerprint: str) -> Optional[str]:
+        if self.entries_per_user <= 0:
+            return None
+        vector = self._normalize(query_vector)
+        now = time.monotonic()
+        answer = None
+        with self._lock:
+            entries = self._users.get(user_id)
+            if entries:
+                entries[:] = [entry for entry in entries if entry.expires_at > now]
+                best = self.similarity_threshold
+                for entry in entries:
+                    if entry.fingerprint != fingerprint:
+                        continue
+                    similarity = float(np.dot(entry.vector, vector))
+                    if similarity >= best:
+                        best, answer = similarity, entry.answer
+                self._users.move_to_end(user_id)
+        if answer is None:
+            chat_cache_misses.inc()
+        else:
+            chat_cache_hits.inc()
+        return answer
+
+    def put(self, user_id: str, query_vector: Sequence[float], fingerprint: str, answer: str):
+        if self.entries_per_user <= 0:
+            return
+        entry = _Entry(time.monotonic() + self.ttl_seconds, self._normalize(query_vector), fingerprint, answer)
+        with self._lock:
+            entries = self._users.setdefault(user_id, [])
+            entries.append(entry)
+            del entries[:-self.entries_per_user]
+            self._users.move_to_end(user_id)
+            while len(self._users) > self.max_users:
+                self._users.popitem(last=False)
+
+    def invalidate_user(self, user_id: str):
+        with self._lock:
+            self._users.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._users.clear()
+
+    def __len__(self) -> int:
+        return sum(len(entries) for entries in self._users.values())
@@ -0,0 +1,181 @@
+import zlib
+from typing import Dict, List, Optional, Union
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    Distance, VectorParams, SparseVectorParams, HnswConfigDiff, OptimizersConfigDiff, PayloadSchemaType
+)
+from ..core.logger import logger
+from .journal_vectors import LEXICAL
+
+class CollectionSchema:
+    """Declared shape of a Qdrant collection: vectors, payload indexes and index tuning."""
+
+    def __init__(self, name: str, vectors_config: Union[VectorParams, Dict[str, VectorParams]],
+                 payload_indexes: Optional[Dict[str, PayloadSchemaType]] = None,
+                 hnsw_config: Optional[HnswConfigDiff] = None,
+                 optimizers_config: Optional[OptimizersConfigDiff] = None,
+                 sparse_vectors_config: Optional[Dict[str, SparseVectorParams]] = None):
+        self.name = name
+        self.vectors_config = vectors_config
+        self.sparse_vectors_config = sparse_vectors_config or {}
+        self.payload_indexes = payload_indexes or {}
+        self.hnsw_config = hnsw_config
+        self.optimizers_config = optimizers_config
+
+JOURNAL_LAYOUTS = ("shared", "tenant", "sharded")
+
+def journals_schema(name: str = "journals", vector_size: int = 384, tenant: bool = False,
+                    vector_names: Optional[List[str]] = None, lexical: bool = False) -> CollectionSchema:
+    """Journals collection; ``vector_names`` declares named vectors instead of a single unnamed one
+    and ``lexical`` adds the sparse vector of hybrid search."""
+    if tenant:
+        # Skip the global graph (m=0) and build one HNSW graph per userId group
+        # (payload_m), so filtered search only walks the tenant's own graph.
+        hnsw_config = HnswConfigDiff(m=0, payload_m=16, ef_construct=100, full_scan_threshold=10000)
+    else:
+        hnsw_config = HnswConfigDiff(m=16, payload_m=0, ef_construct=100, full_scan_threshold=10000)
+    return CollectionSchema(
+        name=name,
+        vectors_config=VectorParams(size=vector_size, distance=Distance.COSINE) if vector_names is None else {
+            vector_name: VectorParams(size=vector_size, distance=Distance.COSINE) for vector_name in vector_names
+        },
+        payload_indexes={
+            # Every query filters on the owner, and summaries/retention range over creation time
+            "userId": PayloadSchemaType.KEYWORD,
+            "createdAt": PayloadSchemaType.FLOAT,
+        },
+        hnsw_config=hnsw_config,
+        optimizers_config=OptimizersConfigDiff(indexing_threshold=20000, memmap_threshold=50000),
+        sparse_vectors_config={LEXICAL: SparseVectorParams()} if lexical else None,
+    )
+
+def shard_collection_name(base_name: str, user_id: str, shard_count: int) -> str:
+    """Stable user -> shard collection mapping. Changing shard_count requires a migration."""
+    return f"{base_name}_shard_{zlib.crc32(user_id.encode('utf-8')) % shard_count}"
+
+def journals_layout_schemas(layout: str, base_name: str = "journals", shard_count: int = 8,
+                            vector_size: int = 384, vector_names: Optional[List[str]] = None,
+                            lexical: bool = False) -> List[CollectionSchema]:
+    """Schemas backing a journals storage layout.
+
+    - ``shared``: one collection and one HNSW graph, searches filter on userId
+    - ``tenant``: one collection, HNSW graphs partitioned by userId
+    - ``sharded``: users hashed across ``shard_count`` collections
+    """
+    if layout == "shared":
+        return [journals_schema(base_name, vector_size, vector_names=vector_names, lexical=lexical)]
+    if layout == "tenant":
+        return [journals_schema(base_name, vector_size, tenant=True, vector_names=vector_names, lexical=lexical)]
+    if layout == "sharded":
+        return [journals_schema(f"{base_name}_shard_{i}", vector_size, vector_names=vector_names, lexical=lexical)
+                for i in range(shard_count)]
+    raise ValueError(f"Unknown journals layout '{layout}', expected one of {', '.join(JOURNAL_LAYOUTS)}")
+
+def _changed_fields(declared, live) -> Dict[str, tuple]:
+    """Fields set on a declared *ConfigDiff whose live value differs."""
+    if declared is None:
+        return {}
+    changes = {}
+    for field, value in declared.model_dump(exclude_none=True).items():
+        live_value = getattr(live, field, None)
+        # Qdrant leaves optional integer settings such as payload_m unset rather than 0
+        if live_value is None and value == 0:
+            continue
+        if live_value != value:
+            changes[field] = (live_value, value)
+    return changes
+
+def _vectors_by_name(vectors) -> Dict[str, VectorParams]:
+    if isinstance(vectors, dict):
+        return vectors
+    return {"": vectors}
+
+class SchemaManager:
+    """Applies collection schemas idempotently and reports drift from the live collection."""
+
+    def __init__(self, client: AsyncQdrantClient):
+        self.client = client
+
+    async def diff(self, schema: CollectionSchema) -> List[str]:
+        """Describe every difference between ``schema`` and the live collection."""
+        if not await self.client.collection_exists(schema.name):
+            return [f"collection '{schema.name}' does not exist"]
+
+        info = await self.client.get_collection(schema.name)
+        drift = []
+
+        live_vectors = _vectors_by_name(info.config.params.vectors)
+        for name, params in _vectors_by_name(schema.vectors_config).items():
+            label = name or "default"
+            live = live_vectors.get(name)
+            if live is None:
+                drift.append(f"vector '{label}' is missing")
+            elif live.size != params.size or live.distance != params.distance:
+                drift.append(
+                    f"vector '{label}' is {live.size}/{live.distance.value}, "
+                    f"declared {params.size}/{params.distance.value}"
+                )
+
+        if schema.sparse_vectors_config:
+            live_sparse = info.config.params.sparse_vectors or {}
+            for name in schema.sparse_vectors_config:
+                if name not in live_sparse:
+                    drift.append(f"sparse vector '{name}' is missing")
+
+        live_indexes = info.payload_schema or {}
+        for field, field_type in schema.payload_indexes.items():
+            live = live_indexes.get(field)
+            if live is None:
+                drift.append(f"payload index on '{field}' is missing")
+            elif live.data_type != field_type:
+                drift.append(f"payload index on '{field}' is {live.data_type.value}, declared {field_type.value}")
+
+        for field, (live, declared) in _changed_fields(schema.hnsw_config, info.config.hnsw_config).items():
+            drift.append(f"hnsw_config.{field} is {live}, declared {declared}")
+        for field, (live, declared) in _changed_fields(schema.optimizers_config, info.config.optimizer_config).items():
+            drift.append(f"optimizers_config.{field} is {live}, declared {declared}")
+
+        return drift
+
+    async def apply(self, schema: CollectionSchema) -> List[str]:
+        """Create or migrate the collection towards ``schema`` and return any drift left over.
+
+        Payload indexes and HNSW/optimizer settings are migrated in place.
+        Vector layout changes, sparse vectors included, cannot be, so they are only reported.
+        """
+        if not await self.client.collection_exists(schema.name):
+            await self.client.create_collection(
+                collection_name=schema.name,
+                vectors_config=schema.vectors_config,
+                sparse_vectors_config=schema.sparse_vectors_config or None,
+                hnsw_config=schema.hnsw_config,
+                optimizers_config=schema.optimizers_config,
+            )
+            logger.info(f"Created '{schema.name}' collection")
+
+        info = await self.client.get_collection(schema.name)
+        live_indexes = info.payload_schema or {}
+        for field, field_type in schema.payload_indexes.items():
+            live = live_indexes.get(field)
+            if live is not None and live.data_type == field_type:
+                continue
+            if live is not None:
+                logger.info(f"Recreating payload index on '{field}' as {field_type.value}")
+                await self.client.delete_payload_index(schema.name, field, wait=True)
+            await self.client.create_payload_index(schema.name, field, field_schema=field_type, wait=True)
+            logger.info(f"Created payload index on '{schema.name}.{field}'")
+
+        hnsw_changes = _changed_fields(schema.hnsw_config, info.config.hnsw_config)
+        optimizer_changes = _changed_fields(schema.optimizers_config, info.config.optimizer_config)
+        if hnsw_changes or optimizer_changes:
+            await self.client.update_collection(
+                collection_name=schema.name,
+                hnsw_config=schema.hnsw_config if hnsw_changes else None,
+                optimizers_config=schema.optimizers_config if optimizer_changes else None,
+            )
+            logger.info(f"Updated '{schema.name}' settings: {sorted({**hnsw_changes, **optimizer_changes})}")
+
+        drift = await self.diff(schema)
+        for item in drift:
+            logger.warning(f"Schema drift in '{schema.name}': {item}")
+        return drift
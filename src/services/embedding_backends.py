@@ -0,0 +1,236 @@
+"""Pluggable inference backends for journal embeddings.
+
+``torch`` runs the model through sentence-transformers. ``onnx`` runs an ONNX
+export of the same model through ONNX Runtime with a ``tokenizers`` fast
+tokenizer, optionally int8-quantized, which needs far less memory per worker
+and no torch import at all. Both return L2-normalized mean-pooled vectors, so
+they are interchangeable for an existing collection. ``remote`` loads nothing
+locally and sends texts to a shared embedding server process instead.
+"""
+import itertools
+import os
+import socket
+import threading
+import time
+from typing import List, Optional
+
+import numpy as np
+
+from ..core.logger import logger
+from . import embedding_protocol as protocol
+
+EMBEDDING_BACKENDS = ("torch", "onnx", "remote")
+
+# all-MiniLM-L6-v2 was trained on 256-token inputs; sentence-transformers truncates there too
+DEFAULT_MAX_SEQ_LENGTH = 256
+
+def hub_repo_id(model_name: str) -> str:
+    """sentence-transformers accepts bare names for its own models; the hub does not."""
+    return model_name if "/" in model_name else f"sentence-transformers/{model_name}"
+
+def mean_pool(token_embeddings: np.ndarray, attention_mask: np.ndarray) -> np.ndarray:
+    """Average token embeddings over the non-padding positions."""
+    mask = attention_mask[..., None].astype(token_embeddings.dtype)
+    summed = (token_embeddings * mask).sum(axis=1)
+    counts = np.clip(mask.sum(axis=1), 1e-9, None)
+    return summed / counts
+
+def l2_normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.clip(norms, 1e-12, None)
+
+class EmbeddingBackend:
+    """Loads a model on first use and encodes batches of texts into vectors."""
+
+    name = "base"
+
+    def __init__(self, model_name: str):
+        self.model_name = model_name
+        self._loaded = False
+        self._load_lock = threading.Lock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def load(self):
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            started = time.perf_counter()
+            self._load()
+            self._loaded = True
+            logger.info(f"Loaded {self.name} embedding backend for {self.model_name} "
+                        f"in {time.perf_counter() - started:.2f}s")
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        self.load()
+        return self._encode(texts)
+
+    def _load(self):
+        raise NotImplementedError
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        raise NotImplementedError
+
+class TorchEmbeddingBackend(EmbeddingBackend):
+    name = "torch"
+
+    def _load(self):
+        # Imported here so that only the torch backend pays for loading torch
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(self.model_name)
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return self.model.encode(texts, batch_size=len(texts), show_progress_bar=False)
+
+class OnnxEmbeddingBackend(EmbeddingBackend):
+    """ONNX Runtime inference on the model's ``onnx/model.onnx`` export.
+
+    ``model_path`` may point at a local directory holding ``model.onnx`` (or
+    ``onnx/model.onnx``) and ``tokenizer.json``; otherwise both are fetched from
+    the Hugging Face hub. With ``quantize`` the export is dynamically quantized
+    to int8 once and the quantized file is reused on later starts.
+    """
+
+    name = "onnx"
+
+    def __init__(self, model_name: str, model_path: Optional[str] = None, quantize: bool = False,
+                 max_seq_length: int = DEFAULT_MAX_SEQ_LENGTH, intra_op_threads: int = 0):
+        super().__init__(model_name)
+        self.model_path = model_path
+        self.quantize = quantize
+        self.max_seq_length = max_seq_length
+        self.intra_op_threads = intra_op_threads
+
+    def _resolve_files(self) -> tuple[str, str]:
+        root = self.model_path
+        if not root:
+            from huggingface_hub import snapshot_download
+            root = snapshot_download(
+                hub_repo_id(self.model_name),
+                allow_patterns=["onnx/model.onnx", "tokenizer.json"]
+            )
+        onnx_file = os.path.join(root, "model.onnx")
+        if not os.path.exists(onnx_file):
+            onnx_file = os.path.join(root, "onnx", "model.onnx")
+        return onnx_file, os.path.join(root, "tokenizer.json")
+
+    def _quantized(self, onnx_file: str) -> str:
+        quantized_file = onnx_file[:-len(".onnx")] + "_qint8.onnx"
+        if not os.path.exists(quantized_file):
+            from onnxruntime.quantization import QuantType, quantize_dynamic
+            logger.info(f"Quantizing {onnx_file} to int8")
+            tmp_file = f"{quantized_file}.{os.getpid()}.tmp"
+            quantize_dynamic(onnx_file, tmp_file, weight_type=QuantType.QInt8)
+            # Several workers may race to quantize; the rename keeps the file whole
+            os.replace(tmp_file, quantized_file)
+        return quantized_file
+
+    def _load(self):
+        try:
+            import onnxruntime as ort
+            from tokenizers import Tokenizer
+        except ImportError as e:
+            raise RuntimeError(f"The onnx embedding backend needs onnxruntime installed: {str(e)}")
+
+        onnx_file, tokenizer_file = self._resolve_files()
+        if self.quantize:
+            onnx_file = self._quantized(onnx_file)
+
+        self.tokenizer = Tokenizer.from_file(tokenizer_file)
+        self.tokenizer.enable_truncation(max_length=self.max_seq_length)
+        self.tokenizer.enable_padding(pad_id=self.tokenizer.token_to_id("[PAD]") or 0, pad_token="[PAD]")
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if self.intra_op_threads:
+            options.intra_op_num_threads = self.intra_op_threads
+        self.session = ort.InferenceSession(onnx_file, options, providers=["CPUExecutionProvider"])
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([encoding.ids for encoding in encodings], dtype=np.int64)
+        attention_mask = np.array([encoding.attention_mask for encoding in encodings], dtype=np.int64)
+        feeds = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            feeds["token_type_ids"] = np.array([encoding.type_ids for encoding in encodings], dtype=np.int64)
+
+        token_embeddings = self.session.run(None, feeds)[0]
+        return l2_normalize(mean_pool(token_embeddings, attention_mask)).astype(np.float32)
+
+class RemoteEmbeddingBackend(EmbeddingBackend):
+    """Encodes through embedding server processes on the same host.
+
+    Each thread keeps its own blocking connection; threads are spread
+    round-robin over ``socket_paths`` so that a pool of servers shares the load.
+    """
+
+    name = "remote"
+
+    def __init__(self, model_name: str, socket_paths: List[str], timeout_seconds: float = 30.0):
+        super().__init__(model_name)
+        if not socket_paths:
+            raise ValueError("The remote embedding backend needs at least one server socket")
+        self.socket_paths = socket_paths
+        self.timeout_seconds = timeout_seconds
+        self._next_path = itertools.cycle(socket_paths)
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            path = getattr(self._local, "path", None) or next(self._next_path)
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout_seconds)
+            try:
+                sock.connect(path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.path = path
+            self._local.sock = sock
+        return sock
+
+    def _disconnect(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+        self._local.sock = None
+        # Try the next server on reconnect, in case this one went away
+        self._local.path = None
+
+    def _call(self, request: bytes) -> bytes:
+        # One retry covers a server restart dropping idle connections
+        for attempt in range(2):
+            try:
+                return protocol.call(self._connection(), request)
+            except (OSError, ConnectionError):
+                self._disconnect()
+                if attempt:
+                    raise
+
+    def _load(self):
+        info = protocol.decode_info(self._call(protocol.encode_request("info")))
+        if info.get("model") != self.model_name:
+            raise RuntimeError(f"Embedding server serves '{info.get('model')}', expected '{self.model_name}'")
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        return protocol.decode_vectors(self._call(protocol.embed_request(texts)))
+
+def create_embedding_backend(backend: str, model_name: str, model_path: Optional[str] = None,
+                             quantize: bool = False, intra_op_threads: int = 0,
+                             socket_paths: Optional[List[str]] = None,
+                             timeout_seconds: float = 30.0) -> EmbeddingBackend:
+    if backend == "torch":
+        return TorchEmbeddingBackend(model_name)
+    if backend == "onnx":
+        return OnnxEmbeddingBackend(
+            model_name, model_path=model_path, quantize=quantize, intra_op_threads=intra_op_threads
+        )
+    if backend == "remote":
+        return RemoteEmbeddingBackend(model_name, socket_paths or [], timeout_seconds=timeout_seconds)
+    raise ValueError(f"Unknown embedding backend '{backend}', expected one of {', '.join(EMBEDDING_BACKENDS)}")
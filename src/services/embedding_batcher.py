@@ -0,0 +1,140 @@
+import asyncio
+import time
+from typing import Callable, List, Optional, Sequence, Set
+from ..core.concurrency import run_cpu_bound
+from ..core.metrics import registry
+from ..core.logger import logger
+
+batch_size_histogram = registry.histogram(
+    "embedding_batch_size",
+    "Number of texts encoded per model call",
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128)
+)
+queue_wait_histogram = registry.histogram(
+    "embedding_queue_wait_seconds",
+    "Time an encode request waited before its batch started",
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0)
+)
+encode_duration_histogram = registry.histogram(
+    "embedding_encode_seconds",
+    "Wall time of one batched model call"
+)
+
+class EmbeddingBatcher:
+    """Coalesces concurrent encode requests into batched model calls.
+
+    Requests are queued and a background task groups them into batches of at
+    most ``max_batch_size`` texts, waiting no longer than ``max_wait_ms`` for a
+    batch to fill. Each batch runs as a single ``encode_batch`` call on the
+    embedding executor and every caller receives its own vector.
+    """
+
+    def __init__(self, encode_batch: Callable[[List[str]], Sequence], max_batch_size: int = 32,
+                 max_wait_ms: float = 5.0, max_concurrent_batches: int = 1):
+        self._encode_batch = encode_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max(0.0, max_wait_ms) / 1000
+        self.max_concurrent_batches = max(1, max_concurrent_batches)
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # Strong references to in-flight batch tasks, so they aren't garbage collected mid-encode
+        self._batches: Set[asyncio.Task] = set()
+
+    def _ensure_worker(self):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or self._worker is None or self._worker.done():
+            self._loop = loop
+            self._queue = asyncio.Queue()
+            self._slots = asyncio.Semaphore(self.max_concurrent_batches)
+            self._worker = loop.create_task(self._run())
+
+    async def embed(self, text: str) -> List[float]:
+        return (await self.embed_many([text]))[0]
+
+    async def embed_many(self, texts: Sequence[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        self._ensure_worker()
+        loop = asyncio.get_running_loop()
+        futures = []
+        for text in texts:
+            future = loop.create_future()
+            self._queue.put_nowait((text, future, time.perf_counter()))
+            futures.append(future)
+        return list(await asyncio.gather(*futures))
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        batch = []
+        try:
+            while True:
+                batch = [await self._queue.get()]
+                deadline = loop.time() + self.max_wait
+                while len(batch) < self.max_batch_size:
+                    # Take whatever is already queued before waiting for more
+                    if not self._queue.empty():
+                        batch.append(self._queue.get_nowait())
+                        continue
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                    except asyncio.TimeoutError:
+                        break
+
+                # Drop requests whose callers have gone away
+                batch = [item for item in batch if not item[1].done()]
+                if not batch:
+                    continue
+
+                # Keep collecting while earlier batches are still encoding, so
+                # batches grow under load instead of queueing behind each other
+                await self._slots.acquire()
+                task = loop.create_task(self._process(batch))
+                self._batches.add(task)
+                task.add_done_callback(self._batches.discard)
+                batch = []
+        except asyncio.CancelledError:
+            # Requests taken off the queue but not yet handed to a batch task
+            for _, future, _ in batch:
+                future.cancel()
+            raise
+
+    async def _process(self, batch):
+        try:
+            started = time.perf_counter()
+            for _, _, enqueued_at in batch:
+                queue_wait_histogram.observe(started - enqueued_at)
+            batch_size_histogram.observe(len(batch))
+
+            texts = [text for text, _, _ in batch]
+            vectors = await run_cpu_bound(self._encode_batch, texts)
+            encode_duration_histogram.observe(time.perf_counter() - started)
+
+            for (_, future, _), vector in zip(batch, vectors):
+                if not future.done():
+                    future.set_result(vector.tolist() if hasattr(vector, "tolist") else list(vector))
+        except Exception as e:
+            logger.error(f"Embedding batch of {len(batch)} failed: {str(e)}")
+            for _, future, _ in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._slots.release()
+
+    async def close(self):
+        """Stop batching, let in-flight batches finish and cancel requests still queued."""
+        if self._worker is not None and not self._worker.done():
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        if self._batches:
+            await asyncio.gather(*self._batches, return_exceptions=True)
+        while self._queue is not None and not self._queue.empty():
+            _, future, _ = self._queue.get_nowait()
+            future.cancel()
@@ -0,0 +1,161 @@
+import asyncio
+import hashlib
+import os
+import sqlite3
+import threading
+import unicodedata
+from array import array
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Sequence
+from ..core.metrics import registry
+from ..core.logger import logger
+
+cache_hits = registry.counter("embedding_cache_hits_total", "Embedding cache hits by tier")
+cache_misses = registry.counter("embedding_cache_misses_total", "Embedding cache misses")
+
+class EmbeddingCache:
+    """Two-tier cache of text embeddings keyed by model name and normalized text.
+
+    The memory tier is a bounded LRU. The optional disk tier is a SQLite file
+    that survives restarts and is shared by every worker on the host. Its
+    connection lives on a dedicated thread: the async methods look up all of a
+    request's memory misses in one query there and queue writes to it, so
+    SQLite never runs on the event loop.
+    """
+
+    def __init__(self, model_name: str, max_entries: int = 10000, disk_path: Optional[str] = None):
+        self.model_name = model_name
+        self.max_entries = max_entries
+        self._memory: "OrderedDict[str, List[float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        self._disk = None
+        if disk_path:
+            self._disk = ThreadPoolExecutor(max_workers=1, thread_name_prefix="embedding-cache")
+            if not self._disk.submit(self._open_disk_tier, disk_path).result():
+                self._disk.shutdown()
+                self._disk = None
+
+    def _open_disk_tier(self, path: str) -> bool:
+        try:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._db = sqlite3.connect(path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute("CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)")
+            return True
+        except sqlite3.Error as e:
+            logger.error(f"Embedding cache disk tier disabled, failed to open {path}: {str(e)}")
+            self._db = None
+            return False
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return " ".join(unicodedata.normalize("NFC", text or "").split())
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\0{self.normalize(text)}".encode("utf-8")).hexdigest()
+
+    def get(self, text: str) -> Optional[List[float]]:
+        """Blocking lookup, for scripts; async code uses get_many."""
+        key = self.key(text)
+        vector = self._memory_get(key)
+        if vector is None and self._disk is not None:
+            vector = self._disk.submit(self._disk_get_many, [key]).result().get(key)
+            if vector is not None:
+                cache_hits.inc(tier="disk")
+                self._memory_put(key, vector)
+        if vector is None:
+            cache_misses.inc()
+        return vector
+
+    def put(self, text: str, vector: List[float]):
+        self.put_many([text], [vector])
+
+    async def get_many(self, texts: Sequence[str]) -> List[Optional[List[float]]]:
+        """Cached vectors for texts (None for misses), reading the disk tier off the event loop."""
+        keys = [self.key(text) for text in texts]
+        vectors = [self._memory_get(key) for key in keys]
+        missing = [key for key, vector in zip(keys, vectors) if vector is None]
+        if missing and self._disk is not None:
+            found = await asyncio.get_running_loop().run_in_executor(self._disk, self._disk_get_many, missing)
+            for key, vector in found.items():
+                cache_hits.inc(tier="disk")
+                self._memory_put(key, vector)
+            vectors = [found.get(key) if vector is None else vector for key, vector in zip(keys, vectors)]
+        for vector in vectors:
+            if vector is None:
+                cache_misses.inc()
+        return vectors
+
+    def put_many(self, texts: Sequence[str], vectors: Sequence[List[float]]):
+        """Cache vectors; the disk write is queued on the cache thread rather than awaited."""
+        items = [(self.key(text), vector) for text, vector in zip(texts, vectors)]
+        for key, vector in items:
+            self._memory_put(key, vector)
+        if items and self._disk is not None:
+            self._disk.submit(self._disk_put_many, items)
+
+    def _memory_get(self, key: str) -> Optional[List[float]]:
+        with self._lock:
+            vector = self._memory.get(key)
+            if vector is not None:
+                self._memory.move_to_end(key)
+        if vector is not None:
+            cache_hits.inc(tier="memory")
+        return vector
+
+    def _memory_put(self, key: str, vector: List[float]):
+        with self._lock:
+            self._memory[key] = vector
+            self._memory.move_to_end(key)
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    # The _disk_* methods only run on the cache thread, which owns the connection
+
+    def _disk_get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        if self._db is None:
+            return {}
+        rows = []
+        try:
+            # Chunked to stay under SQLite's bound-parameter limit
+            for i in range(0, len(keys), 500):
+                chunk = keys[i:i + 500]
+                rows += self._db.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk read failed: {str(e)}")
+            return {}
+        return {key: array("f", blob).tolist() for key, blob in rows}
+
+    def _disk_put_many(self, items: List[tuple]):
+        if self._db is None:
+            return
+        try:
+            with self._db:  # one transaction per batch
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    [(key, array("f", vector).tobytes()) for key, vector in items]
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Embedding cache disk write failed: {str(e)}")
+
+    def _disk_close(self):
+        if self._db is not None:
+            self._db.close()
+            self._db = None
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def close(self):
+        """Flush queued disk writes and close the disk tier."""
+        if self._disk is not None:
+            self._disk.submit(self._disk_close)
+            self._disk.shutdown(wait=True)
+            self._disk = None
@@ -0,0 +1,84 @@
+"""Wire format between API workers and the embedding server.
+
+Every message is a 4-byte big-endian length followed by that many bytes.
+Requests are JSON objects: ``{"op": "info"}`` or ``{"op": "embed", "texts": [...]}``.
+Replies start with a status byte. ``STATUS_OK`` embed replies carry the
+vector count and dimension as two big-endian uint32s, then the vectors as
+little-endian float32. Info replies carry JSON, and ``STATUS_ERROR`` replies
+carry a UTF-8 message.
+"""
+import json
+import socket
+import struct
+from typing import List
+
+import numpy as np
+
+STATUS_OK = 0
+STATUS_ERROR = 1
+
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+_LENGTH = struct.Struct(">I")
+_SHAPE = struct.Struct(">II")
+
+class EmbeddingProtocolError(Exception):
+    pass
+
+def frame(payload: bytes) -> bytes:
+    return _LENGTH.pack(len(payload)) + payload
+
+def frame_length(header: bytes) -> int:
+    (length,) = _LENGTH.unpack(header)
+    if length > MAX_FRAME_BYTES:
+        raise EmbeddingProtocolError(f"Frame of {length} bytes exceeds the {MAX_FRAME_BYTES} byte limit")
+    return length
+
+def encode_request(op: str, **fields) -> bytes:
+    return json.dumps({"op": op, **fields}).encode("utf-8")
+
+def encode_vectors(vectors) -> bytes:
+    array = np.asarray(vectors, dtype="<f4")
+    if array.ndim != 2:
+        array = array.reshape(len(array), -1)
+    return bytes([STATUS_OK]) + _SHAPE.pack(*array.shape) + array.tobytes()
+
+def encode_info(info: dict) -> bytes:
+    return bytes([STATUS_OK]) + json.dumps(info).encode("utf-8")
+
+def encode_error(message: str) -> bytes:
+    return bytes([STATUS_ERROR]) + message.encode("utf-8")
+
+def _check_status(payload: bytes) -> bytes:
+    if not payload:
+        raise EmbeddingProtocolError("Empty reply from embedding server")
+    if payload[0] != STATUS_OK:
+        raise EmbeddingProtocolError(payload[1:].decode("utf-8", errors="replace"))
+    return payload[1:]
+
+def decode_vectors(payload: bytes) -> np.ndarray:
+    body = _check_status(payload)
+    count, dim = _SHAPE.unpack_from(body)
+    return np.frombuffer(body, dtype="<f4", offset=_SHAPE.size, count=count * dim).reshape(count, dim)
+
+def decode_info(payload: bytes) -> dict:
+    return json.loads(_check_status(payload))
+
+def _recv_exactly(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError("Embedding server closed the connection")
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+def call(sock: socket.socket, request: bytes) -> bytes:
+    """Send one request on a blocking socket and return the raw reply."""
+    sock.sendall(frame(request))
+    length = frame_length(_recv_exactly(sock, _LENGTH.size))
+    return _recv_exactly(sock, length)
+
+def embed_request(texts: List[str]) -> bytes:
+    return encode_request("embed", texts=texts)
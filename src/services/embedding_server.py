@@ -0,0 +1,134 @@
+"""Shared embedding process for API workers on the same host.
+
+Usage:
+    python -m src.services.embedding_server --socket /run/journal/embeddings.sock --backend onnx
+
+Loads the model once and serves encode requests over a Unix socket. Requests
+from every connected API worker go through one EmbeddingBatcher, so
+concurrent traffic from all workers is coalesced into shared batches. Point
+the API at it with EMBEDDING_BACKEND=remote and EMBEDDING_SERVER_SOCKET; to
+run a small pool, start several servers and list every socket, comma-separated.
+"""
+import argparse
+import asyncio
+import json
+import os
+from ..core.config import settings
+from ..core.concurrency import run_cpu_bound, shutdown_executors
+from ..core.logger import logger
+from .embedding_backends import EmbeddingBackend, create_embedding_backend
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_protocol import (
+    EmbeddingProtocolError, encode_error, encode_info, encode_vectors, frame, frame_length
+)
+
+class EmbeddingServer:
+    def __init__(self, backend: EmbeddingBackend, socket_path: str, max_batch_size: int = 64,
+                 max_wait_ms: float = 5.0, max_concurrent_batches: int = 1):
+        self.backend = backend
+        self.socket_path = socket_path
+        self.batcher = EmbeddingBatcher(
+            backend.encode,
+            max_batch_size=max_batch_size,
+            max_wait_ms=max_wait_ms,
+            max_concurrent_batches=max_concurrent_batches
+        )
+        self._server = None
+        self._writers = set()
+
+    def info(self) -> dict:
+        return {"model": self.backend.model_name, "backend": self.backend.name}
+
+    async def _dispatch(self, request: dict) -> bytes:
+        op = request.get("op")
+        if op == "info":
+            return encode_info(self.info())
+        if op == "embed":
+            texts = request.get("texts")
+            if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+                return encode_error("'texts' must be a list of strings")
+            return encode_vectors(await self.batcher.embed_many(texts))
+        return encode_error(f"Unknown op '{op}'")
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self._writers.add(writer)
+        try:
+            while True:
+                try:
+                    header = await reader.readexactly(4)
+                except asyncio.IncompleteReadError:
+                    break
+                payload = await reader.readexactly(frame_length(header))
+                try:
+                    reply = await self._dispatch(json.loads(payload))
+                except Exception as e:
+                    logger.error(f"Embedding request failed: {str(e)}")
+                    reply = encode_error(str(e))
+                writer.write(frame(reply))
+                await writer.drain()
+        except (ConnectionError, EmbeddingProtocolError, asyncio.IncompleteReadError) as e:
+            logger.warning(f"Dropping embedding client connection: {str(e)}")
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+
+    async def start(self):
+        await run_cpu_bound(self.backend.load)
+        if os.path.exists(self.socket_path):
+            # Left over from a previous run; binding would fail otherwise
+            os.unlink(self.socket_path)
+        self._server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+        os.chmod(self.socket_path, 0o660)
+        logger.info(f"Embedding server for {self.backend.model_name} ({self.backend.name}) "
+                    f"listening on {self.socket_path}")
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            # Idle API workers keep their connections open; drop them so shutdown doesn't wait
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+        await self.batcher.close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+    async def serve_forever(self):
+        await self.start()
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve journal embeddings over a Unix socket")
+    parser.add_argument("--socket", default=settings.embedding_server_socket.split(",")[0])
+    parser.add_argument("--backend", choices=("torch", "onnx"), default=settings.embedding_server_backend)
+    parser.add_argument("--max-batch-size", type=int, default=settings.embedding_server_max_batch_size)
+    parser.add_argument("--max-wait-ms", type=float, default=settings.embedding_max_wait_ms)
+    args = parser.parse_args()
+
+    backend = create_embedding_backend(
+        args.backend,
+        settings.embedding_model,
+        model_path=settings.embedding_onnx_path or None,
+        quantize=settings.embedding_quantize,
+        intra_op_threads=settings.embedding_intra_op_threads
+    )
+    server = EmbeddingServer(
+        backend,
+        args.socket,
+        max_batch_size=args.max_batch_size,
+        max_wait_ms=args.max_wait_ms,
+        max_concurrent_batches=settings.embedding_max_workers
+    )
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_executors()
+
+if __name__ == "__main__":
+    main()
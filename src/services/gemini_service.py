@@ -1,22 +1,83 @@
-import google.generativeai as genai
 from fastapi import HTTPException
+from typing import AsyncIterator, Optional
+import asyncio
+import threading
 from ..core.config import settings
+from ..core.concurrency import gemini_semaphore
+from ..core.instrumentation import timed
+from ..core.resilience import CircuitBreaker, CircuitOpenError, ResilientCaller
 from ..models.response import APIResponse
 from ..core.prompt_templates import prompt_templates
 
 class GeminiServiceError(Exception):
     """Base exception for GeminiService errors"""
-    pass
+    def __init__(self, message: str, error: str = "GEMINI_ERROR"):
+        self.error = error
+        self.message = message
+        super().__init__(message)
+
+# Throttling, transient server errors and upstream timeouts; everything else
+# (bad request, auth, safety blocks) fails the same way on a retry.
+_RETRYABLE_ERRORS = (
+    "TooManyRequests", "ResourceExhausted", "ServiceUnavailable", "InternalServerError",
+    "BadGateway", "GatewayTimeout", "DeadlineExceeded", "Aborted", "Unknown"
+)
+
+def is_retryable_gemini_error(e: BaseException) -> bool:
+    if isinstance(e, ConnectionError):
+        return True
+    try:
+        from google.api_core import exceptions
+    except ImportError:
+        return False
+    return isinstance(e, tuple(getattr(exceptions, name) for name in _RETRYABLE_ERRORS))
+
+def _error_code(e: BaseException) -> str:
+    if isinstance(e, CircuitOpenError):
+        return "GEMINI_UNAVAILABLE"
+    if isinstance(e, asyncio.TimeoutError):
+        return "GEMINI_TIMEOUT"
+    return "GEMINI_ERROR"
 
 class GeminiService:
     def __init__(self):
-        try:
-            genai.configure(api_key=settings.gemini_api_key)
-            self.model = genai.GenerativeModel('gemini-1.5-pro')
-        except Exception as e:
-            raise GeminiServiceError(f"Failed to initialize Gemini service: {str(e)}")
+        self._model = None
+        self._model_lock = threading.Lock()
+        self.caller = ResilientCaller(
+            "gemini",
+            semaphore=gemini_semaphore,
+            is_retryable=is_retryable_gemini_error,
+            timeout_seconds=settings.gemini_timeout_seconds,
+            deadline_seconds=settings.gemini_deadline_seconds,
+            max_attempts=settings.gemini_max_attempts,
+            base_delay_seconds=settings.gemini_retry_base_delay_seconds,
+            max_delay_seconds=settings.gemini_retry_max_delay_seconds,
+            breaker=CircuitBreaker(
+                "gemini",
+                failure_threshold=settings.gemini_breaker_failure_threshold,
+                reset_timeout_seconds=settings.gemini_breaker_reset_seconds
+            ),
+            hedge_after_seconds=settings.gemini_hedge_after_seconds
+        )
+
+    @property
+    def model(self):
+        """The Gemini model, configured on first use."""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    try:
+                        # Imported here: the SDK pulls in grpc and protobuf,
+                        # which we don't want to pay for at import time.
+                        import google.generativeai as genai
+                        genai.configure(api_key=settings.gemini_api_key)
+                        self._model = genai.GenerativeModel('gemini-1.5-pro')
+                    except Exception as e:
+                        raise GeminiServiceError(f"Failed to initialize Gemini service: {str(e)}")
+        return self._model
 
-    def generate_response(self, query: str, context: str) -> APIResponse:
+    @timed("gemini")
+    async def generate_response(self, query: str, context: str, period: Optional[str] = None) -> APIResponse:
         if not query:
             return APIResponse.error_response(
                 error="INVALID_QUERY",
@@ -29,24 +90,66 @@ class GeminiService:
             )
 
         try:
-            prompt = prompt_templates.get_chat_prompt(context, query)
-            response = self.model.generate_content(prompt)
-            
+            prompt = prompt_templates.get_chat_prompt(context, query, period)
+            model = self.model
+            response = await self.caller.call(lambda: model.generate_content_async(prompt))
+
             if not response or not response.text:
                 return APIResponse.error_response(
                     error="EMPTY_RESPONSE",
                     message="Gemini API returned empty response"
                 )
-            
+
             return APIResponse.success_response(
                 data={"response": response.text},
                 message="Response generated successfully"
             )
-            
+
         except Exception as e:
             return APIResponse.error_response(
-                error="GEMINI_ERROR",
+                error=_error_code(e),
                 message=f"Something went wrong: {str(e)}"
             )
 
-gemini_service = GeminiService()
\ No newline at end of file
+    @timed("gemini")
+    async def stream_response(self, query: str, context: str, period: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield response text chunks as Gemini produces them.
+
+        Opening the stream is retried like any other call; once text has been
+        yielded a failure ends the stream. Raises GeminiServiceError on invalid
+        input or upstream failure.
+        """
+        if not query:
+            raise GeminiServiceError("Query cannot be empty", error="INVALID_QUERY")
+        if not context:
+            raise GeminiServiceError("Context cannot be empty", error="INVALID_CONTEXT")
+
+        prompt = prompt_templates.get_chat_prompt(context, query, period)
+        # The slot is held for the whole stream, not just the opening call
+        async with gemini_semaphore:
+            opened = False
+            try:
+                model = self.model
+                response = await self.caller.call(
+                    lambda: model.generate_content_async(prompt, stream=True), hedge=False, limit=False
+                )
+                opened = True
+                chunks = response.__aiter__()
+                while True:
+                    try:
+                        chunk = await asyncio.wait_for(chunks.__anext__(), settings.gemini_timeout_seconds)
+                    except StopAsyncIteration:
+                        break
+                    text = chunk.text
+                    if text:
+                        yield text
+            except GeminiServiceError:
+                raise
+            except Exception as e:
+                # Failures opening the stream were already counted by the caller
+                if opened and self.caller.breaker is not None and (
+                        isinstance(e, asyncio.TimeoutError) or is_retryable_gemini_error(e)):
+                    self.caller.breaker.record_failure()
+                raise GeminiServiceError(f"Something went wrong: {str(e)}", error=_error_code(e))
+
+gemini_service = GeminiService()
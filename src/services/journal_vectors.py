@@ -0,0 +1,52 @@
+"""How a journal's title and content map onto Qdrant vectors.
+
+In ``single`` mode a journal has one unnamed vector, embedded from its title
+and content together. Collections from before titles were embedded hold
+content-only vectors with the same layout, which schema drift detection can't
+see, so they have to be re-embedded in place with backfill_vectors. In ``named`` mode it has a ``title`` and a ``content``
+vector, and optionally a ``combined`` one; a vector whose text is empty is
+left out, so title-only journals don't all share the embedding of "".
+
+In ``hybrid`` search mode a journal also has a ``lexical`` sparse vector (see
+lexical.py) next to its dense vector(s).
+"""
+from typing import Any, Dict, List, Optional, Union
+from qdrant_client.http.models import SparseVector
+
+VECTOR_MODES = ("single", "named")
+SEARCH_MODES = ("dense", "hybrid")
+TITLE, CONTENT, COMBINED = "title", "content", "combined"
+LEXICAL = "lexical"
+
+def journal_vector_names(mode: str, combined: bool = False) -> Optional[List[str]]:
+    """Named vectors for ``mode``, or None for a single unnamed vector."""
+    if mode == "single":
+        return None
+    if mode == "named":
+        return [TITLE, CONTENT] + ([COMBINED] if combined else [])
+    raise ValueError(f"Unknown journals vector mode '{mode}', expected one of {', '.join(VECTOR_MODES)}")
+
+def uses_lexical(search_mode: str) -> bool:
+    """Whether ``search_mode`` needs the lexical sparse vector stored with each journal."""
+    if search_mode not in SEARCH_MODES:
+        raise ValueError(f"Unknown journals search mode '{search_mode}', expected one of {', '.join(SEARCH_MODES)}")
+    return search_mode == "hybrid"
+
+def combined_text(title: Optional[str], content: Optional[str]) -> str:
+    return "\n\n".join(part for part in ((title or "").strip(), (content or "").strip()) if part)
+
+def journal_texts(title: Optional[str], content: Optional[str],
+                  vector_names: Optional[List[str]]) -> Dict[str, str]:
+    """Text to embed for each vector of a journal; the unnamed vector is keyed by ""."""
+    if vector_names is None:
+        return {"": combined_text(title, content)}
+    texts = {TITLE: (title or "").strip(), CONTENT: (content or "").strip(), COMBINED: combined_text(title, content)}
+    return {name: texts[name] for name in vector_names if texts[name]}
+
+def point_vector(vectors: Dict[str, List[float]], vector_names: Optional[List[str]],
+                 sparse: Optional[SparseVector] = None) -> Union[List[float], Dict[str, Any]]:
+    """Shape embedded vectors the way PointStruct expects them for this collection."""
+    if sparse is not None:
+        # Next to a named sparse vector, the unnamed dense vector is addressed as ""
+        return {**vectors, LEXICAL: sparse}
+    return vectors[""] if vector_names is None else vectors
@@ -1,38 +1,108 @@
-from qdrant_client import QdrantClient
-from qdrant_client.http.models import Distance, VectorParams, PointStruct, Filter, FieldCondition, MatchValue, Range
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import (
+    PointStruct, Filter, FieldCondition, MatchValue, Range, HasIdCondition, NamedVector, NamedSparseVector,
+    SearchRequest, PointVectors
+)
 from qdrant_client.http.exceptions import UnexpectedResponse
-from sentence_transformers import SentenceTransformer
 from ..core.config import settings
+from ..core.concurrency import qdrant_semaphore, run_cpu_bound
+from ..core.instrumentation import timed
+from ..core.logger import logger
+from .embedding_batcher import EmbeddingBatcher
+from .embedding_backends import create_embedding_backend
+from .embedding_cache import EmbeddingCache
+from .collection_schema import SchemaManager, journals_layout_schemas, shard_collection_name
+from .journal_vectors import CONTENT, LEXICAL, TITLE, journal_texts, journal_vector_names, point_vector, uses_lexical
+from . import lexical
 from ..models.response import APIResponse
-import logging
+from ..utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
 from datetime import datetime, timedelta
+import asyncio
+from typing import AsyncIterator, Callable
 
-logging.basicConfig(level=logging.INFO)
-logger = logging.getLogger(__name__)
+class QdrantServiceError(Exception):
+    def __init__(self, error: str, message: str):
+        self.error = error
+        self.message = message
+        super().__init__(message)
 
 class QdrantService:
     def __init__(self):
+        # Construction stays cheap: the client connects on first request and
+        # the embedding backend loads its model on first use (or by warm_up()).
+        self.client = AsyncQdrantClient(settings.qdrant_url)
+        self.backend = create_embedding_backend(
+            settings.embedding_backend,
+            settings.embedding_model,
+            model_path=settings.embedding_onnx_path or None,
+            quantize=settings.embedding_quantize,
+            intra_op_threads=settings.embedding_intra_op_threads,
+            socket_paths=[path for path in settings.embedding_server_socket.split(",") if path],
+            timeout_seconds=settings.embedding_server_timeout_seconds
+        )
+        # Quantized vectors differ slightly, so they get their own cache entries
+        cache_model = settings.embedding_model
+        if settings.embedding_quantize and (settings.embedding_backend == "onnx" or (
+                settings.embedding_backend == "remote" and settings.embedding_server_backend == "onnx")):
+            cache_model += "+int8"
+        self.embedding_cache = EmbeddingCache(
+            cache_model,
+            max_entries=settings.embedding_cache_size,
+            disk_path=settings.embedding_cache_path or None
+        )
+        self.embedder = EmbeddingBatcher(
+            self._encode_batch,
+            max_batch_size=settings.embedding_max_batch_size,
+            max_wait_ms=settings.embedding_max_wait_ms,
+            max_concurrent_batches=settings.embedding_max_workers
+        )
+        self.collection_name = settings.journals_collection
+        self.layout = settings.journals_layout
+        self.vector_names = journal_vector_names(settings.journals_vectors, settings.journals_combined_vector)
+        self.search_weights = {}
+        if self.vector_names is not None:
+            unknown = set(settings.journals_search_weights) - set(self.vector_names)
+            if unknown:
+                raise ValueError(f"Search weights for unknown vectors: {', '.join(sorted(unknown))}")
+            self.search_weights = {
+                name: weight for name, weight in settings.journals_search_weights.items() if weight > 0
+            }
+            if not self.search_weights:
+                raise ValueError("JOURNALS_SEARCH_WEIGHTS needs a positive weight for at least one vector")
+        self.recency_half_life_days = settings.search_recency_half_life_days
+        self.recency_weight = min(1.0, max(0.0, settings.search_recency_weight))
+        self.search_oversample = max(1, settings.search_oversample)
+        self.search_mode = settings.journals_search_mode
+        self.lexical = uses_lexical(self.search_mode)
+        self.schemas = journals_layout_schemas(
+            self.layout, self.collection_name, shard_count=settings.journals_shard_count,
+            vector_names=self.vector_names, lexical=self.lexical
+        )
+        self.collection_names = [schema.name for schema in self.schemas]
+        self.schema_manager = SchemaManager(self.client)
+        self.schema_drift = []
+        self._change_listeners = []
+
+    @property
+    def model_loaded(self) -> bool:
+        return self.backend.loaded
+
+    async def warm_up(self):
+        """Load the embedding model off the event loop."""
         try:
-            self.client = QdrantClient(settings.qdrant_url)
-            self.model = SentenceTransformer('all-MiniLM-L6-v2')
-            self.collection_name = "journals"
-            self._ensure_collection_exists()
+            await run_cpu_bound(self.backend.load)
         except Exception as e:
-            logger.error(f"Failed to initialize QdrantService: {str(e)}")
-            return APIResponse.error_response(
-                error="INITIALIZATION_ERROR",
-                message=f"Failed to initialize Qdrant service: {str(e)}"
-            )
+            logger.error(f"Failed to load embedding model: {str(e)}")
 
-    def _ensure_collection_exists(self):
+    @timed("qdrant")
+    async def ensure_collection_exists(self):
         try:
-            collections = self.client.get_collections().collections
-            if not any(c.name == self.collection_name for c in collections):
-                self.client.create_collection(
-                    collection_name=self.collection_name,
-                    vectors_config=VectorParams(size=384, distance=Distance.COSINE)
-                )
-                logger.info("Created 'journals' collection")
+            drift = []
+            for schema in self.schemas:
+                async with qdrant_semaphore:
+                    drift += await self.schema_manager.apply(schema)
+            self.schema_drift = drift
+            return None
         except Exception as e:
             logger.error(f"Failed to ensure collection exists: {str(e)}")
             return APIResponse.error_response(
@@ -40,9 +110,35 @@ class QdrantService:
                 message=f"Database initialization failed: {str(e)}"
             )
 
-    def generate_embedding(self, text: str) -> list[float]:
+    def _encode_batch(self, texts: list[str]):
+        return self.backend.encode(texts)
+
+    def add_change_listener(self, listener: Callable[[str], None]):
+        """Register a callback invoked with the user id whenever that user's journals change."""
+        self._change_listeners.append(listener)
+
+    def _notify_change(self, user_id: str):
+        for listener in self._change_listeners:
+            try:
+                listener(user_id)
+            except Exception as e:
+                logger.error(f"Journal change listener failed for user {user_id}: {str(e)}")
+
+    def collection_for(self, user_id: str) -> str:
+        """Collection holding a user's journals under the configured layout."""
+        if self.layout == "sharded":
+            return shard_collection_name(self.collection_name, user_id, settings.journals_shard_count)
+        return self.collection_name
+
+    @timed("embedding")
+    async def generate_embedding(self, text: str) -> list[float]:
         try:
-            return self.model.encode(text).tolist()
+            cached, = await self.embedding_cache.get_many([text])
+            if cached is not None:
+                return cached
+            vector = await self.embedder.embed(text)
+            self.embedding_cache.put_many([text], [vector])
+            return vector
         except Exception as e:
             logger.error(f"Failed to generate embedding: {str(e)}")
             return APIResponse.error_response(
@@ -50,7 +146,34 @@ class QdrantService:
                 message="Failed to process text embedding"
             )
 
-    def upsert_journal(self, journal_id: str, user_id: str, title: str, content: str):
+    @timed("embedding")
+    async def generate_embeddings(self, texts: list[str]) -> list[list[float]]:
+        """Embed many texts at once, only running the model for cache misses."""
+        vectors = await self.embedding_cache.get_many(texts)
+        missing = [i for i, vector in enumerate(vectors) if vector is None]
+        if missing:
+            embedded = await self.embedder.embed_many([texts[i] for i in missing])
+            for i, vector in zip(missing, embedded):
+                vectors[i] = vector
+            self.embedding_cache.put_many([texts[i] for i in missing], embedded)
+        return vectors
+
+    async def embed_journals(self, journals: list[tuple[str, str]]) -> list:
+        """Point vectors for (title, content) pairs, embedding all their texts in one batch."""
+        texts = [journal_texts(title, content, self.vector_names) for title, content in journals]
+        flat = [text for journal in texts for text in journal.values()]
+        embedded = iter(await self.generate_embeddings(flat))
+        return [
+            point_vector({name: next(embedded) for name in journal}, self.vector_names,
+                         self._sparse_vector(title, content))
+            for journal, (title, content) in zip(texts, journals)
+        ]
+
+    def _sparse_vector(self, title: str, content: str):
+        return lexical.document_vector(title, content) if self.lexical else None
+
+    @timed("qdrant")
+    async def upsert_journal(self, journal_id: str, user_id: str, title: str, content: str):
         try:
             # Check required fields
             if not journal_id or not user_id:
@@ -67,7 +190,14 @@ class QdrantService:
                 )
  
             
-            vector = self.generate_embedding(content)
+            try:
+                vector, = await self.embed_journals([(title, content)])
+            except Exception as e:
+                logger.error(f"Failed to generate embedding: {str(e)}")
+                return APIResponse.error_response(
+                    error="EMBEDDING_ERROR",
+                    message="Failed to process text embedding"
+                )
             created_at = datetime.now().timestamp()
             point = PointStruct(
                 id=journal_id,
@@ -76,10 +206,13 @@ class QdrantService:
                     "userId": user_id,
                     "title": title,
                     "content": content,
-                    "createdAt": created_at
+                    "createdAt": created_at,
+                    "updatedAt": created_at
                 }
             )
-            self.client.upsert(self.collection_name, points=[point])
+            async with qdrant_semaphore:
+                await self.client.upsert(self.collection_for(user_id), points=[point])
+            self._notify_change(user_id)
             return APIResponse.success_response(
                 data={"id": journal_id},
                 message="Journal created successfully"
@@ -91,7 +224,130 @@ class QdrantService:
                 message=f"Failed to save journal: {str(e)}"
             )
 
-    def get_journals_by_user(self, user_id: str, days: int = None):
+    @timed("qdrant")
+    async def upsert_journals_bulk(self, user_id: str, journals: list[dict]):
+        """Embed and upsert many journals for one user.
+
+        Each journal dict needs ``id``, ``title`` and ``content`` and may carry a
+        ``createdAt`` timestamp. Points are written in parallel chunks and the
+        response lists a result per journal, in input order.
+        """
+        if not user_id:
+            return APIResponse.error_response(
+                error="MISSING_USER_ID",
+                message="User ID is required"
+            )
+        if not journals:
+            return APIResponse.success_response(data={"results": []}, message="No journals to import")
+
+        try:
+            vectors = await self.embed_journals([(journal["title"], journal["content"]) for journal in journals])
+        except Exception as e:
+            logger.error(f"Failed to embed {len(journals)} journals for bulk import: {str(e)}")
+            return APIResponse.error_response(
+                error="EMBEDDING_ERROR",
+                message="Failed to process text embedding"
+            )
+
+        now = datetime.now().timestamp()
+        points = [
+            PointStruct(
+                id=journal["id"],
+                vector=vector,
+                payload={
+                    "userId": user_id,
+                    "title": journal["title"],
+                    "content": journal["content"],
+                    "createdAt": journal.get("createdAt") or now,
+                    "updatedAt": now
+                }
+            )
+            for journal, vector in zip(journals, vectors)
+        ]
+
+        chunk_size = settings.bulk_upsert_chunk_size
+        chunks = [points[i:i + chunk_size] for i in range(0, len(points), chunk_size)]
+
+        collection_name = self.collection_for(user_id)
+
+        async def _upsert_chunk(chunk):
+            async with qdrant_semaphore:
+                await self.client.upsert(collection_name, points=chunk, wait=True)
+
+        outcomes = await asyncio.gather(*(_upsert_chunk(chunk) for chunk in chunks), return_exceptions=True)
+        self._notify_change(user_id)
+
+        results = []
+        for chunk, outcome in zip(chunks, outcomes):
+            if isinstance(outcome, Exception):
+                logger.error(f"Failed to upsert bulk chunk of {len(chunk)} journals: {str(outcome)}")
+            for point in chunk:
+                if isinstance(outcome, Exception):
+                    results.append({"id": point.id, "success": False, "error": "SAVE_ERROR",
+                                    "message": "Failed to save journal"})
+                else:
+                    results.append({"id": point.id, "success": True})
+
+        return APIResponse.success_response(
+            data={"results": results},
+            message="Journals imported"
+        )
+
+    def _user_filter(self, user_id: str, days: int = None, start: float = None, end: float = None) -> Filter:
+        """A user's journals, optionally those created in the last ``days`` or between ``start`` and ``end``."""
+        filters = [FieldCondition(key="userId", match=MatchValue(value=user_id))]
+        if days is not None:
+            start = (datetime.now() - timedelta(days=days)).timestamp()
+            end = datetime.now().timestamp()
+        if start is not None or end is not None:
+            filters.append(
+                FieldCondition(
+                    key="createdAt",
+                    range=Range(gte=start, lte=end)
+                )
+            )
+        return Filter(must=filters)
+
+    async def _scroll_page(self, collection_name: str, filter: Filter, limit: int, offset=None):
+        async with qdrant_semaphore:
+            points, next_offset = await self.client.scroll(
+                collection_name,
+                scroll_filter=filter,
+                limit=limit,
+                offset=offset,
+                with_payload=True,
+                with_vectors=False
+            )
+        return [{"id": p.id, **p.payload} for p in points], next_offset
+
+    @timed("qdrant")
+    async def iter_journals_by_user(self, user_id: str, days: int = None,
+                                    page_size: int = None) -> AsyncIterator[dict]:
+        """Lazily walk every journal of a user, one scroll page at a time.
+
+        Raises QdrantServiceError if a page cannot be fetched.
+        """
+        if not user_id:
+            raise QdrantServiceError("MISSING_USER_ID", "User ID is required")
+
+        collection_name = self.collection_for(user_id)
+        filter = self._user_filter(user_id, days)
+        page_size = page_size or settings.journals_max_page_size
+        offset = None
+        while True:
+            try:
+                journals, offset = await self._scroll_page(collection_name, filter, page_size, offset)
+            except Exception as e:
+                logger.error(f"Failed to scroll journals for user {user_id}: {str(e)}")
+                raise QdrantServiceError("RETRIEVAL_ERROR", f"Failed to retrieve journals: {str(e)}")
+            for journal in journals:
+                yield journal
+            if offset is None:
+                return
+
+    @timed("qdrant")
+    async def get_journals_by_user(self, user_id: str, days: int = None, limit: int = None, cursor: str = None):
+        """Fetch one page of a user's journals, or every journal when no limit is given."""
         try:
             if not user_id:
                 return APIResponse.error_response(
@@ -99,24 +355,31 @@ class QdrantService:
                     message="User ID is required"
                 )
 
-            filters = [FieldCondition(key="userId", match=MatchValue(value=user_id))]
-            if days is not None:
-                start_timestamp = (datetime.now() - timedelta(days=days)).timestamp()
-                end_timestamp = datetime.now().timestamp()
-                filters.append(
-                    FieldCondition(
-                        key="createdAt",
-                        range=Range(gte=start_timestamp, lte=end_timestamp)
-                    )
+            if limit is None:
+                journals = [journal async for journal in self.iter_journals_by_user(user_id, days=days)]
+                return APIResponse.success_response(
+                    data={"journals": journals, "next_cursor": None},
+                    message="Journals retrieved successfully"
                 )
 
-            filter = Filter(must=filters)
-            results = self.client.scroll(self.collection_name, scroll_filter=filter, limit=100, with_payload=True)
-            journals = [{"id": p.id, **p.payload} for p in results[0]]
+            try:
+                offset = decode_cursor(cursor)
+            except InvalidCursorError as e:
+                return APIResponse.error_response(
+                    error="INVALID_CURSOR",
+                    message=str(e)
+                )
+
+            page_size = max(1, min(limit, settings.journals_max_page_size))
+            journals, next_offset = await self._scroll_page(
+                self.collection_for(user_id), self._user_filter(user_id, days), page_size, offset
+            )
             return APIResponse.success_response(
-                data={"journals": journals},
+                data={"journals": journals, "next_cursor": encode_cursor(next_offset)},
                 message="Journals retrieved successfully"
             )
+        except QdrantServiceError as e:
+            return APIResponse.error_response(error=e.error, message=e.message)
         except Exception as e:
             logger.error(f"Failed to get journals for user {user_id}: {str(e)}")
             return APIResponse.error_response(
@@ -124,7 +387,8 @@ class QdrantService:
                 message=f"Failed to retrieve journals: {str(e)}"
             )
 
-    def get_journal(self, journal_id: str):
+    @timed("qdrant")
+    async def get_journal(self, journal_id: str, user_id: str):
         try:
             if not journal_id:
                 return APIResponse.error_response(
@@ -132,7 +396,8 @@ class QdrantService:
                     message="Journal ID is required"
                 )
 
-            result = self.client.retrieve(self.collection_name, ids=[journal_id], with_payload=True)
+            async with qdrant_semaphore:
+                result = await self.client.retrieve(self.collection_for(user_id), ids=[journal_id], with_payload=True)
             if not result:
                 return APIResponse.error_response(
                     error="JOURNAL_NOT_FOUND",
@@ -149,7 +414,124 @@ class QdrantService:
                 message="Failed to retrieve journal"
             )
 
-    def delete_journal(self, journal_id: str):
+    def _owned_by(self, journal_id: str, user_id: str) -> Filter:
+        """Matches the journal only if it belongs to the user, so writes check ownership server-side."""
+        return Filter(must=[
+            HasIdCondition(has_id=[journal_id]),
+            FieldCondition(key="userId", match=MatchValue(value=user_id))
+        ])
+
+    @timed("qdrant")
+    async def update_journal(self, journal_id: str, user_id: str, title: str = None, content: str = None):
+        """Update a journal the user owns, re-embedding only the vectors the update touches.
+
+        The payload is written with an ownership-filtered set_payload, the
+        touched vectors with update_vectors, and named vectors whose text
+        became empty are deleted. The stored text is only read when a touched
+        vector also depends on the field that wasn't supplied (the single
+        vector, the combined vector, the lexical vector). Otherwise the
+        ownership check update_vectors needs, since it addresses points by
+        id alone, runs concurrently with embedding. A missing or foreign
+        journal returns JOURNAL_NOT_FOUND.
+        """
+        try:
+            if not journal_id or not user_id:
+                return APIResponse.error_response(
+                    error="MISSING_FIELDS",
+                    message="Journal ID and User ID are required"
+                )
+
+            collection_name = self.collection_for(user_id)
+            owned = self._owned_by(journal_id, user_id)
+            changes = {"updatedAt": datetime.now().timestamp()}
+            if title is not None:
+                changes["title"] = title
+            if content is not None:
+                changes["content"] = content
+            supplied = {TITLE} if title is not None else set()
+            if content is not None:
+                supplied.add(CONTENT)
+
+            touched = [name for name in (self.vector_names or [""])
+                       if supplied & self._vector_sources(name)]
+            if touched and self.lexical:
+                touched.append(LEXICAL)
+            needs_read = any(self._vector_sources(name) - supplied for name in touched)
+
+            checked = False
+            if needs_read:
+                async with qdrant_semaphore:
+                    points, _ = await self.client.scroll(
+                        collection_name, scroll_filter=owned, limit=1,
+                        with_payload=["title", "content"], with_vectors=False
+                    )
+                if not points:
+                    return self._journal_not_found()
+                checked = True
+                current = points[0].payload
+                title = title if title is not None else current.get("title", "")
+                content = content if content is not None else current.get("content", "")
+
+            texts = journal_texts(title, content, self.vector_names)
+            embed = [name for name in touched if name in texts]
+            emptied = [name for name in touched if name not in texts and name != LEXICAL]
+
+            async def _embed():
+                return await self.generate_embeddings([texts[name] for name in embed]) if embed else []
+
+            if checked:
+                embedded = await _embed()
+            else:
+                owns, embedded = await asyncio.gather(self._owns(collection_name, owned), _embed())
+                if not owns:
+                    return self._journal_not_found()
+
+            vectors = None
+            if embed or LEXICAL in touched:
+                sparse = self._sparse_vector(title, content) if LEXICAL in touched else None
+                vectors = point_vector(dict(zip(embed, embedded)), self.vector_names, sparse)
+
+            async with qdrant_semaphore:
+                await self.client.set_payload(collection_name, payload=changes, points=owned)
+                if vectors:
+                    await self.client.update_vectors(
+                        collection_name, points=[PointVectors(id=journal_id, vector=vectors)]
+                    )
+                if emptied:
+                    # A title or content cleared in named mode mustn't keep matching its old text
+                    await self.client.delete_vectors(collection_name, vectors=emptied, points=owned)
+            self._notify_change(user_id)
+            return APIResponse.success_response(
+                data={"id": journal_id},
+                message="Journal updated successfully"
+            )
+        except Exception as e:
+            logger.error(f"Failed to update journal {journal_id}: {str(e)}")
+            return APIResponse.error_response(
+                error="SAVE_ERROR",
+                message=f"Failed to update journal: {str(e)}"
+            )
+
+    @staticmethod
+    def _vector_sources(name: str) -> set:
+        """Fields a vector is embedded from."""
+        return {name} if name in (TITLE, CONTENT) else {TITLE, CONTENT}
+
+    async def _owns(self, collection_name: str, owned: Filter) -> bool:
+        async with qdrant_semaphore:
+            result = await self.client.count(collection_name, count_filter=owned, exact=True)
+        return result.count > 0
+
+    @staticmethod
+    def _journal_not_found():
+        return APIResponse.error_response(
+            error="JOURNAL_NOT_FOUND",
+            message="Journal not found"
+        )
+
+    @timed("qdrant")
+    async def delete_journal(self, journal_id: str, user_id: str):
+        """Delete a journal if the user owns it; other users' journals are left untouched."""
         try:
             if not journal_id:
                 return APIResponse.error_response(
@@ -157,7 +539,11 @@ class QdrantService:
                     message="Journal ID is required"
                 )
 
-            self.client.delete(self.collection_name, points_selector=[journal_id])
+            async with qdrant_semaphore:
+                await self.client.delete(
+                    self.collection_for(user_id), points_selector=self._owned_by(journal_id, user_id)
+                )
+            self._notify_change(user_id)
             return APIResponse.success_response(
                 message="Journal deleted successfully"
             )
@@ -168,7 +554,80 @@ class QdrantService:
                 message="Failed to delete journal"
             )
 
-    def search_journals(self, query: str, user_id: str, limit: int = 3):
+    async def _search(self, collection_name: str, query_vector: list[float], filter: Filter, limit: int,
+                      query: str = None):
+        """Nearest journals to ``query_vector``, fusing the weighted named vectors if configured.
+
+        In hybrid mode the dense ranking is fused with a lexical ranking of ``query``
+        by reciprocal rank, unless the query has no terms left to match.
+        """
+        sparse_query = lexical.query_vector(query) if self.lexical and query else None
+        if sparse_query is not None and not sparse_query.indices:
+            sparse_query = None
+        if self.vector_names is None and sparse_query is None:
+            async with qdrant_semaphore:
+                return await self.client.search(
+                    collection_name,
+                    query_vector=query_vector,
+                    query_filter=filter,
+                    limit=limit,
+                    with_payload=True
+                )
+
+        # Every ranking returns a few extra candidates, so a journal that ranks
+        # well in one but just misses the cut in another still gets both scores
+        candidates = limit * 4
+        if self.vector_names is None:
+            requests = [SearchRequest(vector=query_vector, filter=filter, limit=candidates, with_payload=True)]
+        else:
+            requests = [
+                SearchRequest(vector=NamedVector(name=name, vector=query_vector), filter=filter,
+                              limit=candidates, with_payload=True)
+                for name in self.search_weights
+            ]
+        if sparse_query is not None:
+            requests.append(SearchRequest(vector=NamedSparseVector(name=LEXICAL, vector=sparse_query),
+                                          filter=filter, limit=candidates, with_payload=True))
+        async with qdrant_semaphore:
+            batches = await self.client.search_batch(collection_name, requests=requests)
+
+        if self.vector_names is None:
+            dense = batches[0]
+        else:
+            fused = {}
+            for weight, batch in zip(self.search_weights.values(), batches):
+                for result in batch:
+                    best = fused.setdefault(result.id, result.model_copy(update={"score": 0.0}))
+                    best.score += weight * result.score
+            dense = sorted(fused.values(), key=lambda result: result.score, reverse=True)
+        if sparse_query is None:
+            return dense[:limit]
+        return lexical.reciprocal_rank_fusion([dense, batches[-1]], k=settings.journals_rrf_k)[:limit]
+
+    def _rank_by_recency(self, results: list, now: float) -> list:
+        """Scale each score by (1 - weight) + weight * 0.5 ** (age / half-life) and re-rank.
+
+        Scores are clamped at 0 first: scaling a negative similarity down would
+        favour older journals. Clamped journals keep their similarity order.
+        """
+        half_life = self.recency_half_life_days * 86400
+        decayed = []
+        for result in results:
+            age = max(0.0, now - (result.payload.get("createdAt") or 0.0))
+            factor = 1 - self.recency_weight + self.recency_weight * 0.5 ** (age / half_life)
+            decayed.append((max(0.0, result.score) * factor, result))
+        decayed.sort(key=lambda item: (item[0], item[1].score), reverse=True)
+        return [result.model_copy(update={"score": score}) for score, result in decayed]
+
+    @timed("qdrant")
+    async def search_journals(self, query: str, user_id: str, limit: int = 3,
+                              start: float = None, end: float = None):
+        """Journals most relevant to ``query``, optionally only those created between ``start`` and ``end``.
+
+        With a recency half-life configured, ``search_oversample`` times as many
+        candidates are retrieved and re-ranked with their scores decayed by age,
+        so recent journals win among similarly relevant ones.
+        """
         try:
             if not query or not user_id:
                 return APIResponse.error_response(
@@ -176,19 +635,17 @@ class QdrantService:
                     message="Query and user ID are required"
                 )
 
-            query_vector = self.generate_embedding(query)
+            query_vector = await self.generate_embedding(query)
             # Check if embedding generation failed (if so, return the http resp)
             if isinstance(query_vector, APIResponse):  
                 return query_vector
 
-            filter = Filter(must=[FieldCondition(key="userId", match=MatchValue(value=user_id))])
-            results = self.client.search(
-                self.collection_name,
-                query_vector=query_vector,
-                query_filter=filter,
-                limit=limit,
-                with_payload=True
-            )
+            filter = self._user_filter(user_id, start=start, end=end)
+            recency = self.recency_half_life_days > 0 and self.recency_weight > 0
+            candidates = limit * self.search_oversample if recency else limit
+            results = await self._search(self.collection_for(user_id), query_vector, filter, candidates, query=query)
+            if recency:
+                results = self._rank_by_recency(results, datetime.now().timestamp())[:limit]
             journals = []
             for result in results:
                 journal_data = {
@@ -196,12 +653,15 @@ class QdrantService:
                     "content": result.payload.get("content", ""),
                     "title": result.payload.get("title", ""),
                     "userId": result.payload.get("userId", ""),
-                    "createdAt": result.payload.get("createdAt", "")
+                    "createdAt": result.payload.get("createdAt", ""),
+                    "updatedAt": result.payload.get("updatedAt"),
+                    "score": result.score
                 }
                 journals.append(journal_data)
 
             return APIResponse.success_response(
-                data={"journals": journals},
+                # The query vector lets callers key caches without re-embedding
+                data={"journals": journals, "query_vector": query_vector},
                 message="Search completed successfully"
             )
         except Exception as e:
@@ -211,7 +671,8 @@ class QdrantService:
                 message="Failed to search journals"
             )
 
-    def delete_journals_by_user(self, user_id: str):
+    @timed("qdrant")
+    async def delete_journals_by_user(self, user_id: str):
         try:
             if not user_id:
                 return APIResponse.error_response(
@@ -220,10 +681,12 @@ class QdrantService:
                 )
 
             filter = Filter(must=[FieldCondition(key="userId", match=MatchValue(value=user_id))])
-            self.client.delete(
-                collection_name=self.collection_name,
-                points_selector=filter
-            )
+            async with qdrant_semaphore:
+                await self.client.delete(
+                    collection_name=self.collection_for(user_id),
+                    points_selector=filter
+                )
+            self._notify_change(user_id)
             return APIResponse.success_response(
                 message="All journals for the user deleted successfully"
             )
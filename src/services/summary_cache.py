@@ -0,0 +1,80 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+from ..core.metrics import registry
+
+summary_cache_hits = registry.counter("summary_cache_hits_total", "Summaries served from cache")
+summary_cache_misses = registry.counter("summary_cache_misses_total", "Summaries that had to be generated")
+
+CacheKey = Tuple[str, int, str]
+
+class SummaryCache:
+    """Bounded TTL cache of generated summaries.
+
+    Entries are keyed by user, window and a fingerprint of the journals that
+    went into the summary, so any write, delete or journal ageing out of the
+    window yields a new key. Invalidation on writes only frees memory early.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl_seconds: float = 24 * 60 * 60):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[CacheKey, Tuple[float, str]]" = OrderedDict()
+        self._keys_by_user: Dict[str, Set[CacheKey]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def fingerprint(journals: Iterable[dict]) -> str:
+        """Hash of the ids and versions of the journals in a summary window."""
+        versions = sorted(
+            f"{journal.get('id')}:{journal.get('updatedAt', journal.get('createdAt'))}"
+            for journal in journals
+        )
+        return hashlib.sha256("\n".join(versions).encode("utf-8")).hexdigest()
+
+    def get(self, user_id: str, days: int, fingerprint: str) -> Optional[str]:
+        key = (user_id, days, fingerprint)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                self._remove(key)
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+        if entry is None:
+            summary_cache_misses.inc()
+            return None
+        summary_cache_hits.inc()
+        return entry[1]
+
+    def put(self, user_id: str, days: int, fingerprint: str, summary: str):
+        key = (user_id, days, fingerprint)
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, summary)
+            self._entries.move_to_end(key)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate_user(self, user_id: str):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def _remove(self, key: CacheKey):
+        self._entries.pop(key, None)
+        user_keys = self._keys_by_user.get(key[0])
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[key[0]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,26 +1,142 @@
-from typing import List, Dict, Optional
+import math
+import re
+from typing import List, Dict, Optional, Set
 from ..models.response import APIResponse
 from ..core.logger import logger
+from ..core.metrics import registry
+from ..core.instrumentation import timed
+
+context_tokens_histogram = registry.histogram(
+    "context_tokens",
+    "Estimated prompt tokens used by journal context",
+    buckets=(250, 500, 1000, 2000, 4000, 8000, 16000, 32000)
+)
+context_dropped_counter = registry.counter(
+    "context_entries_dropped_total",
+    "Journal entries left out of prompt context, by reason"
+)
+
+_WORD_PATTERN = re.compile(r"\w+")
+
+class ContextBuildResult:
+    def __init__(self, context: str, tokens_used: int, entries_used: int,
+                 entries_dropped: int, duplicates_dropped: int, truncated: bool):
+        self.context = context
+        self.tokens_used = tokens_used
+        self.entries_used = entries_used
+        self.entries_dropped = entries_dropped
+        self.duplicates_dropped = duplicates_dropped
+        self.truncated = truncated
+
+    def stats(self) -> Dict:
+        return {
+            "tokens_used": self.tokens_used,
+            "entries_used": self.entries_used,
+            "entries_dropped": self.entries_dropped,
+            "duplicates_dropped": self.duplicates_dropped,
+            "truncated": self.truncated,
+        }
 
 class JournalTextExtractor:
+    # Rough English average for Gemini/SentencePiece style tokenizers
+    CHARS_PER_TOKEN = 4
+    # Word-set Jaccard similarity above which two entries count as duplicates
+    DUPLICATE_SIMILARITY = 0.9
+    # Don't bother squeezing a truncated entry into less than this many tokens
+    MIN_TRUNCATED_TOKENS = 32
+
+    @staticmethod
+    def format_journal(journal: Dict) -> str:
+        title = " ".join((journal.get("title") or "").split())
+        content = " ".join((journal.get("content") or "").split())
+        if title and content:
+            return f"{title}: {content}"
+        return title or content
+
     @staticmethod
     def extract_journal_texts(journals: List[Dict]) -> List[str]:
         """Extract formatted text from journal entries handling missing fields."""
         journal_texts = []
         for journal in journals:
-            title = journal.get("title", "").strip()
-            content = journal.get("content", "").strip()
-            
-            if title and content:
-                journal_texts.append(f"{title}: {content}")
-            elif title:
-                journal_texts.append(title)
-            elif content:
-                journal_texts.append(content)
+            text = JournalTextExtractor.format_journal(journal)
+            if text:
+                journal_texts.append(text)
         return journal_texts
 
     @staticmethod
-    def process_journals_response(response: APIResponse, context_type: str = "journals") -> tuple[Optional[str], Optional[APIResponse]]:
+    def estimate_tokens(text: str) -> int:
+        return math.ceil(len(text) / JournalTextExtractor.CHARS_PER_TOKEN)
+
+    @staticmethod
+    def _is_near_duplicate(words: Set[str], kept: List[Set[str]]) -> bool:
+        for other in kept:
+            union = len(words | other)
+            if union and len(words & other) / union >= JournalTextExtractor.DUPLICATE_SIMILARITY:
+                return True
+        return False
+
+    @staticmethod
+    def build_context(journals: List[Dict], token_budget: Optional[int] = None,
+                      rank_by: str = "recency") -> ContextBuildResult:
+        """Assemble prompt context from journals within a token budget.
+
+        Entries are ranked by search ``score`` or by recency (``createdAt``),
+        near-duplicates are skipped, and entries are added until the budget
+        runs out; the entry that crosses the budget is truncated when enough
+        room is left. Recency-ranked context is emitted oldest first so it
+        reads chronologically.
+        """
+        if rank_by == "score":
+            ranked = sorted(journals, key=lambda j: j.get("score") or 0.0, reverse=True)
+        else:
+            ranked = sorted(journals, key=lambda j: j.get("createdAt") or 0.0, reverse=True)
+
+        selected, kept_words = [], []
+        tokens_used = duplicates = dropped = 0
+        truncated = False
+        for journal in ranked:
+            text = JournalTextExtractor.format_journal(journal)
+            if not text:
+                continue
+
+            words = set(_WORD_PATTERN.findall(text.lower()))
+            if JournalTextExtractor._is_near_duplicate(words, kept_words):
+                duplicates += 1
+                continue
+
+            # Account for the newline separating entries
+            cost = JournalTextExtractor.estimate_tokens(text) + (1 if selected else 0)
+            if token_budget is not None and tokens_used + cost > token_budget:
+                remaining = token_budget - tokens_used - (1 if selected else 0)
+                if truncated or remaining < JournalTextExtractor.MIN_TRUNCATED_TOKENS:
+                    dropped += 1
+                    continue
+                cut = text[:remaining * JournalTextExtractor.CHARS_PER_TOKEN - 1]
+                text = (cut.rsplit(" ", 1)[0] if " " in cut else cut) + "…"
+                cost = JournalTextExtractor.estimate_tokens(text) + (1 if selected else 0)
+                truncated = True
+
+            selected.append((journal, text))
+            kept_words.append(words)
+            tokens_used += cost
+
+        if rank_by != "score":
+            selected.sort(key=lambda item: item[0].get("createdAt") or 0.0)
+
+        return ContextBuildResult(
+            context="\n".join(text for _, text in selected),
+            tokens_used=tokens_used,
+            entries_used=len(selected),
+            entries_dropped=dropped,
+            duplicates_dropped=duplicates,
+            truncated=truncated
+        )
+
+    @staticmethod
+    @timed("context")
+    def process_journals_response(response: APIResponse, context_type: str = "journals",
+                                  token_budget: Optional[int] = None,
+                                  rank_by: str = "recency") -> tuple[Optional[str], Optional[APIResponse]]:
         """Process journal response and return context string or error response."""
         if not response.success:
             return None, response
@@ -32,11 +148,18 @@ class JournalTextExtractor:
                 message=f"No {context_type} found"
             )
         
-        journal_texts = JournalTextExtractor.extract_journal_texts(journals)
-        if not journal_texts:
+        result = JournalTextExtractor.build_context(journals, token_budget=token_budget, rank_by=rank_by)
+        if not result.context:
             return None, APIResponse.success_response(
                 data={"response": f"No valid content found in {context_type}."},
                 message="No valid content found"
             )
-        
-        return "\n".join(journal_texts), None
\ No newline at end of file
+
+        context_tokens_histogram.observe(result.tokens_used, context=context_type)
+        if result.entries_dropped:
+            context_dropped_counter.inc(result.entries_dropped, context=context_type, reason="budget")
+        if result.duplicates_dropped:
+            context_dropped_counter.inc(result.duplicates_dropped, context=context_type, reason="duplicate")
+        logger.info(f"Built {context_type} context: {result.stats()}")
+
+        return result.context, None
@@ -0,0 +1,87 @@
+import codecs
+import json
+import re
+from typing import Any, AsyncIterator, Tuple
+
+_SEPARATORS = re.compile(r"[\s,]*")
+
+class ImportEntryError(Exception):
+    def __init__(self, error: str, message: str):
+        self.error = error
+        self.message = message
+        super().__init__(message)
+
+class JournalImportParser:
+    """Incrementally parses a JSON array or JSONL stream of journal entries."""
+
+    # Largest single entry we are willing to buffer while waiting for it to complete
+    MAX_ENTRY_BYTES = 1024 * 1024
+
+    @staticmethod
+    async def iter_entries(chunks: AsyncIterator[bytes]) -> AsyncIterator[Tuple[int, Any]]:
+        """Yield ``(index, entry)`` pairs where ``entry`` is a parsed object or an ImportEntryError.
+
+        The format is detected from the first non-whitespace character: ``[``
+        starts a JSON array, anything else is treated as one object per line.
+        """
+        decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        buffer = ""
+        mode = None
+        index = 0
+        json_decoder = json.JSONDecoder()
+
+        async def _chunks():
+            async for chunk in chunks:
+                yield decoder.decode(chunk)
+            yield decoder.decode(b"", final=True)
+
+        async for text in _chunks():
+            buffer += text
+            if mode is None:
+                stripped = buffer.lstrip()
+                if not stripped:
+                    continue
+                if stripped[0] == "[":
+                    mode = "array"
+                    buffer = stripped[1:]
+                else:
+                    mode = "lines"
+
+            if mode == "lines":
+                *lines, buffer = buffer.split("\n")
+                for line in lines:
+                    if line.strip():
+                        yield index, JournalImportParser._parse_line(line)
+                        index += 1
+                # The unterminated last line is an entry still arriving; don't let it grow unbounded
+                if len(buffer) > JournalImportParser.MAX_ENTRY_BYTES:
+                    raise ImportEntryError("INVALID_FORMAT", f"Entry {index} is too large")
+            else:
+                position = 0
+                while True:
+                    position = _SEPARATORS.match(buffer, position).end()
+                    if position >= len(buffer) or buffer[position] == "]":
+                        break
+                    try:
+                        entry, position_end = json_decoder.raw_decode(buffer, position)
+                    except json.JSONDecodeError:
+                        # Most likely an entry split across chunks; wait for more data
+                        if len(buffer) - position > JournalImportParser.MAX_ENTRY_BYTES:
+                            raise ImportEntryError("INVALID_FORMAT", f"Entry {index} is malformed or too large")
+                        break
+                    yield index, entry
+                    index += 1
+                    position = position_end
+                buffer = buffer[position:]
+
+        if mode == "lines" and buffer.strip():
+            yield index, JournalImportParser._parse_line(buffer)
+        elif mode == "array" and not buffer.lstrip(" \t\r\n,").startswith("]"):
+            raise ImportEntryError("INVALID_FORMAT", f"Malformed or unterminated JSON array at entry {index}")
+
+    @staticmethod
+    def _parse_line(line: str) -> Any:
+        try:
+            return json.loads(line)
+        except json.JSONDecodeError as e:
+            return ImportEntryError("INVALID_JSON", f"Invalid JSON: {e.msg}")
@@ -0,0 +1,28 @@
+import base64
+import binascii
+import json
+from typing import Optional, Union
+
+PointOffset = Union[str, int]
+
+class InvalidCursorError(ValueError):
+    pass
+
+def encode_cursor(offset: Optional[PointOffset]) -> Optional[str]:
+    """Wrap a Qdrant scroll offset in an opaque, URL-safe cursor."""
+    if offset is None:
+        return None
+    raw = json.dumps({"o": offset}, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: Optional[str]) -> Optional[PointOffset]:
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        offset = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))["o"]
+    except (binascii.Error, ValueError, KeyError, TypeError, UnicodeError):
+        raise InvalidCursorError("Malformed pagination cursor")
+    if not isinstance(offset, (str, int)) or isinstance(offset, bool):
+        raise InvalidCursorError("Malformed pagination cursor")
+    return offset
@@ -0,0 +1,93 @@
+import json
+import unittest
+from unittest.mock import patch, Mock, AsyncMock
+from src.models.response import APIResponse
+from src.services.gemini_service import GeminiServiceError
+from src.api.v1.endpoints.journals import chat_with_journals_stream, ChatRequest
+
+async def _collect_events(response):
+    events = []
+    async for chunk in response.body_iterator:
+        lines = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+class TestChatWithJournalsStream(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.user_id = "test_user_123"
+        self.chat_request = ChatRequest(message="Test question")
+        self.request = Mock()
+        self.request.is_disconnected = AsyncMock(return_value=False)
+
+    @patch('src.api.v1.endpoints.journals.logger')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
+    @patch('src.api.v1.endpoints.journals.gemini_service')
+    async def test_streams_tokens_then_done(self, mock_gemini, mock_extractor, mock_qdrant, mock_logger):
+        async def chunks(query, context, period=None):
+            yield "Hello"
+            yield " there"
+
+        mock_qdrant.search_journals.return_value = APIResponse.success_response(data={"journals": []})
+        mock_extractor.process_journals_response.return_value = ("Test journal context", None)
+        mock_gemini.stream_response = chunks
+
+        response = await chat_with_journals_stream(self.chat_request, self.request, self.user_id)
+        events = await _collect_events(response)
+
+        self.assertEqual(response.media_type, "text/event-stream")
+        self.assertEqual(events, [("token", {"text": "Hello"}), ("token", {"text": " there"}), ("done", {})])
+
+    @patch('src.api.v1.endpoints.journals.logger')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
+    @patch('src.api.v1.endpoints.journals.gemini_service')
+    async def test_gemini_failure_becomes_error_event(self, mock_gemini, mock_extractor, mock_qdrant, mock_logger):
+        async def failing(query, context, period=None):
+            raise GeminiServiceError("Something went wrong: quota")
+            yield
+
+        mock_qdrant.search_journals.return_value = APIResponse.success_response(data={"journals": []})
+        mock_extractor.process_journals_response.return_value = ("Test journal context", None)
+        mock_gemini.stream_response = failing
+
+        events = await _collect_events(await chat_with_journals_stream(self.chat_request, self.request, self.user_id))
+
+        self.assertEqual(events, [("error", {"error": "GEMINI_ERROR", "message": "Something went wrong: quota"})])
+
+    @patch('src.api.v1.endpoints.journals.logger')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
+    @patch('src.api.v1.endpoints.journals.gemini_service')
+    async def test_stops_when_client_disconnects(self, mock_gemini, mock_extractor, mock_qdrant, mock_logger):
+        produced = []
+
+        async def chunks(query, context, period=None):
+            for text in ["one", "two", "three"]:
+                produced.append(text)
+                yield text
+
+        mock_qdrant.search_journals.return_value = APIResponse.success_response(data={"journals": []})
+        mock_extractor.process_journals_response.return_value = ("Test journal context", None)
+        mock_gemini.stream_response = chunks
+        self.request.is_disconnected = AsyncMock(side_effect=[False, True])
+
+        events = await _collect_events(await chat_with_journals_stream(self.chat_request, self.request, self.user_id))
+
+        self.assertEqual(events, [("token", {"text": "one"})])
+        self.assertEqual(produced, ["one", "two"])
+
+    @patch('src.api.v1.endpoints.journals.logger')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
+    async def test_search_error_becomes_error_event(self, mock_extractor, mock_qdrant, mock_logger):
+        error_response = APIResponse.error_response(error="SEARCH_ERROR", message="Failed to search journals")
+        mock_qdrant.search_journals.return_value = error_response
+        mock_extractor.process_journals_response.return_value = (None, error_response)
+
+        events = await _collect_events(await chat_with_journals_stream(self.chat_request, self.request, self.user_id))
+
+        self.assertEqual(events, [("error", {"error": "SEARCH_ERROR", "message": "Failed to search journals"})])
+
+if __name__ == '__main__':
+    unittest.main()
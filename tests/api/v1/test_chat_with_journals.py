@@ -1,7 +1,7 @@
 import unittest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from src.models.response import APIResponse
-from src.api.v1.endpoints.journals import chat_with_journals, ChatRequest
+from src.api.v1.endpoints.journals import chat_with_journals, ChatRequest, chat_cache
 
 class TestChatWithJournals(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
@@ -9,11 +9,12 @@ class TestChatWithJournals(unittest.IsolatedAsyncioTestCase):
         self.chat_request = ChatRequest(message="Test question")
         self.test_context = "Test journal context"
         self.test_response = "Test chat response"
+        chat_cache.clear()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
-    @patch('src.api.v1.endpoints.journals.gemini_service')
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
     async def test_successful_chat_response(self, mock_gemini, mock_extractor, 
                                          mock_qdrant, mock_logger):
         # Setup mocks
@@ -34,13 +35,13 @@ class TestChatWithJournals(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(response.message, "Chat response generated successfully")
         
         # Verify mock calls
-        mock_qdrant.search_journals.assert_called_once_with(self.chat_request.message, self.user_id)
+        mock_qdrant.search_journals.assert_called_once_with(self.chat_request.message, self.user_id, start=None, end=None)
         mock_extractor.process_journals_response.assert_called_once()
-        mock_gemini.generate_response.assert_called_once_with(self.chat_request.message, self.test_context)
+        mock_gemini.generate_response.assert_called_once_with(self.chat_request.message, self.test_context, period=None)
         mock_logger.info.assert_called()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
     async def test_journal_search_error(self, mock_extractor, mock_qdrant, mock_logger):
         # Setup mocks
@@ -66,9 +67,9 @@ class TestChatWithJournals(unittest.IsolatedAsyncioTestCase):
         mock_extractor.process_journals_response.assert_called_once()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
-    @patch('src.api.v1.endpoints.journals.gemini_service')
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
     async def test_gemini_service_error(self, mock_gemini, mock_extractor, 
                                       mock_qdrant, mock_logger):
         # Setup mocks
@@ -95,16 +96,40 @@ class TestChatWithJournals(unittest.IsolatedAsyncioTestCase):
         mock_gemini.generate_response.assert_called_once()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     async def test_empty_message(self, mock_qdrant, mock_logger):
         # Setup
         empty_chat = ChatRequest(message="")
+        mock_qdrant.search_journals.return_value = APIResponse.error_response(
+            error="MISSING_PARAMETERS",
+            message="Query and user ID are required"
+        )
 
         # Execute
         response = await chat_with_journals(empty_chat, self.user_id)
 
         # Verify mock calls
-        mock_qdrant.search_journals.assert_called_once_with("", self.user_id)
+        mock_qdrant.search_journals.assert_called_once_with("", self.user_id, start=None, end=None)
+
+    @patch('src.api.v1.endpoints.journals.logger')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
+    async def test_paraphrase_reuses_cached_answer(self, mock_gemini, mock_qdrant, mock_logger):
+        journals = [{"id": "j1", "title": "Monday", "content": "Long walk", "createdAt": 1.0, "score": 0.9}]
+        mock_qdrant.search_journals.side_effect = [
+            APIResponse.success_response(data={"journals": journals, "query_vector": [1.0, 0.0]}),
+            APIResponse.success_response(data={"journals": journals, "query_vector": [0.99, 0.02]}),
+        ]
+        mock_gemini.generate_response.return_value = APIResponse.success_response(
+            data={"response": self.test_response}
+        )
+
+        first = await chat_with_journals(ChatRequest(message="What did I do Monday?"), self.user_id)
+        second = await chat_with_journals(ChatRequest(message="What did I get up to on Monday?"), self.user_id)
+
+        self.assertEqual(first.data["response"], self.test_response)
+        self.assertEqual(second.data["response"], self.test_response)
+        mock_gemini.generate_response.assert_called_once()
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -1,5 +1,5 @@
 import unittest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from uuid import UUID
 from src.models.journal import JournalCreate
 from src.models.response import APIResponse
@@ -11,7 +11,7 @@ class TestCreateJournal(unittest.IsolatedAsyncioTestCase):
         self.user_id = "test_user_123"
         
     @patch('src.api.v1.endpoints.journals.JournalValidator')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.logger')
     async def test_successful_journal_creation(self, mock_logger, mock_qdrant, mock_validator):
         # Setup mocks
@@ -35,7 +35,7 @@ class TestCreateJournal(unittest.IsolatedAsyncioTestCase):
         mock_qdrant.upsert_journal.assert_called_once()
 
     @patch('src.api.v1.endpoints.journals.JournalValidator')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.logger')
     async def test_validation_error(self, mock_logger, mock_qdrant, mock_validator):
         # Setup validation error
@@ -58,7 +58,7 @@ class TestCreateJournal(unittest.IsolatedAsyncioTestCase):
         mock_qdrant.upsert_journal.assert_not_called()
 
     @patch('src.api.v1.endpoints.journals.JournalValidator')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.logger')
     async def test_qdrant_service_error(self, mock_logger, mock_qdrant, mock_validator):
         # Setup mocks
@@ -81,7 +81,7 @@ class TestCreateJournal(unittest.IsolatedAsyncioTestCase):
         mock_qdrant.upsert_journal.assert_called_once()
 
     @patch('src.api.v1.endpoints.journals.JournalValidator')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.logger')
     async def test_empty_user_id(self, mock_logger, mock_qdrant, mock_validator):
         # Setup validation error for empty user ID
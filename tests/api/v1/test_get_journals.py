@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch, AsyncMock
+from src.models.response import APIResponse
+from src.api.v1.endpoints.journals import get_journals, LEGACY_LIST_LIMIT
+
+class TestGetJournals(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.user_id = "test_user_123"
+        self.journals = [{"id": "1", "title": "One"}, {"id": "2", "title": "Two"}]
+        self.page = APIResponse.success_response(
+            data={"journals": self.journals, "next_cursor": "abc"},
+            message="Journals retrieved successfully"
+        )
+
+    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    async def test_unpaginated_request_keeps_list_shape(self, mock_qdrant):
+        mock_qdrant.get_journals_by_user = AsyncMock(return_value=self.page)
+
+        response = await get_journals(self.user_id, days=7)
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data, self.journals)
+        mock_qdrant.get_journals_by_user.assert_called_once_with(
+            self.user_id, days=7, cursor=None, limit=LEGACY_LIST_LIMIT
+        )
+
+    @patch('src.api.v1.endpoints.journals.settings')
+    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    async def test_limit_or_cursor_opts_into_pages(self, mock_qdrant, mock_settings):
+        mock_settings.journals_page_size = 50
+        mock_qdrant.get_journals_by_user = AsyncMock(return_value=self.page)
+
+        response = await get_journals(self.user_id, cursor="xyz")
+
+        self.assertEqual(response.data, {"journals": self.journals, "next_cursor": "abc"})
+        mock_qdrant.get_journals_by_user.assert_called_once_with(self.user_id, days=None, cursor="xyz", limit=50)
+
+        await get_journals(self.user_id, limit=10)
+        self.assertEqual(mock_qdrant.get_journals_by_user.call_args.kwargs["limit"], 10)
+
+    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    async def test_errors_pass_through(self, mock_qdrant):
+        mock_qdrant.get_journals_by_user = AsyncMock(return_value=APIResponse.error_response(
+            error="INVALID_CURSOR", message="Invalid cursor"
+        ))
+
+        response = await get_journals(self.user_id, cursor="bad")
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.error, "INVALID_CURSOR")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,7 +1,7 @@
 import unittest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from src.models.response import APIResponse
-from src.api.v1.endpoints.journals import get_summary
+from src.api.v1.endpoints.journals import get_summary, summary_cache
 
 class TestGetSummary(unittest.IsolatedAsyncioTestCase):
     def setUp(self):
@@ -9,12 +9,13 @@ class TestGetSummary(unittest.IsolatedAsyncioTestCase):
         self.days = 7
         self.test_context = "Test journal entry content"
         self.test_summary = "Test summary response"
+        summary_cache.clear()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
     @patch('src.api.v1.endpoints.journals.prompt_templates')
-    @patch('src.api.v1.endpoints.journals.gemini_service')
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
     async def test_successful_summary_generation(self, mock_gemini, mock_templates, 
                                               mock_extractor, mock_qdrant, mock_logger):
         # Setup mocks
@@ -39,11 +40,13 @@ class TestGetSummary(unittest.IsolatedAsyncioTestCase):
         mock_qdrant.get_journals_by_user.assert_called_once_with(self.user_id, days=self.days)
         mock_extractor.process_journals_response.assert_called_once()
         mock_templates.get_summary_prompt.assert_called_once_with(self.days, self.test_context)
-        mock_gemini.generate_response.assert_called_once()
+        mock_gemini.generate_response.assert_called_once_with(
+            "Generate summary", self.test_context, period="the last 7 days"
+        )
         mock_logger.info.assert_called()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
     async def test_journal_extraction_error(self, mock_extractor, mock_qdrant, mock_logger):
         # Setup mocks
@@ -69,10 +72,10 @@ class TestGetSummary(unittest.IsolatedAsyncioTestCase):
         mock_extractor.process_journals_response.assert_called_once()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     @patch('src.api.v1.endpoints.journals.JournalTextExtractor')
     @patch('src.api.v1.endpoints.journals.prompt_templates')
-    @patch('src.api.v1.endpoints.journals.gemini_service')
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
     async def test_gemini_service_error(self, mock_gemini, mock_templates, 
                                       mock_extractor, mock_qdrant, mock_logger):
         # Setup mocks
@@ -100,7 +103,7 @@ class TestGetSummary(unittest.IsolatedAsyncioTestCase):
         mock_gemini.generate_response.assert_called_once()
 
     @patch('src.api.v1.endpoints.journals.logger')
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     async def test_custom_days_parameter(self, mock_qdrant, mock_logger):
         # Setup mock
         mock_qdrant.get_journals_by_user.return_value = APIResponse.success_response(
@@ -118,5 +121,26 @@ class TestGetSummary(unittest.IsolatedAsyncioTestCase):
             f"Generating summary for user: {self.user_id} over last {custom_days} days"
         )
 
+    @patch('src.api.v1.endpoints.journals.logger')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
+    async def test_unchanged_journals_reuse_cached_summary(self, mock_gemini, mock_qdrant, mock_logger):
+        # Setup mocks
+        mock_qdrant.get_journals_by_user.return_value = APIResponse.success_response(
+            data={"journals": [{"id": "a", "content": "Test content", "updatedAt": 1.0}]}
+        )
+        mock_gemini.generate_response.return_value = APIResponse.success_response(
+            data={"response": self.test_summary}
+        )
+
+        # Execute twice with the same journals
+        first = await get_summary(self.user_id, self.days)
+        second = await get_summary(self.user_id, self.days)
+
+        # Verify
+        self.assertEqual(first.data["response"], self.test_summary)
+        self.assertEqual(second.data["response"], self.test_summary)
+        mock_gemini.generate_response.assert_called_once()
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
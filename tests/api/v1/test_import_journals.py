@@ -0,0 +1,83 @@
+import json
+import unittest
+from unittest.mock import patch, AsyncMock, Mock
+from src.models.response import APIResponse
+from src.api.v1.endpoints.journals import import_journals
+
+def _request(*chunks):
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+    request = Mock()
+    request.stream = stream
+    return request
+
+def _saved(user_id, journals):
+    return APIResponse.success_response(
+        data={"results": [{"id": journal["id"], "success": True} for journal in journals]},
+        message="Journals imported"
+    )
+
+class TestImportJournals(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.user_id = "test_user_123"
+
+    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    async def test_invalid_entries_are_reported_per_index(self, mock_qdrant):
+        mock_qdrant.upsert_journals_bulk = AsyncMock(side_effect=_saved)
+        body = "\n".join([
+            json.dumps({"title": "One", "content": "First"}),
+            "not json",
+            json.dumps(["not", "an", "object"]),
+            json.dumps({"title": "", "content": ""}),
+            json.dumps({"title": "Five", "createdAt": "2026-01-02T03:04:05"}),
+        ])
+
+        response = await import_journals(_request(body.encode("utf-8")), self.user_id)
+
+        self.assertTrue(response.success)
+        self.assertEqual((response.data["imported"], response.data["failed"]), (2, 3))
+        results = response.data["results"]
+        self.assertEqual([item["index"] for item in results], [0, 1, 2, 3, 4])
+        self.assertEqual([item.get("error") for item in results],
+                         [None, "INVALID_JSON", "INVALID_ENTRY", "EMPTY_FIELDS", None])
+        journals = mock_qdrant.upsert_journals_bulk.call_args.args[1]
+        self.assertEqual([journal["title"] for journal in journals], ["One", "Five"])
+
+    @patch('src.api.v1.endpoints.journals.settings')
+    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    async def test_failed_batch_marks_only_its_entries(self, mock_qdrant, mock_settings):
+        mock_settings.bulk_import_batch_size = 2
+        calls = []
+
+        async def upsert(user_id, journals):
+            calls.append(journals)
+            if len(calls) == 1:
+                return APIResponse.error_response(error="EMBEDDING_ERROR", message="Failed to process text embedding")
+            return _saved(user_id, journals)
+
+        mock_qdrant.upsert_journals_bulk = AsyncMock(side_effect=upsert)
+        body = json.dumps([{"title": f"Journal {i}"} for i in range(3)])
+
+        response = await import_journals(_request(body.encode("utf-8")), self.user_id)
+
+        self.assertTrue(response.success)
+        self.assertEqual([len(journals) for journals in calls], [2, 1])
+        self.assertEqual([(item["index"], item["success"]) for item in response.data["results"]],
+                         [(0, False), (1, False), (2, True)])
+        self.assertEqual(response.data["results"][0]["error"], "EMBEDDING_ERROR")
+
+    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    async def test_malformed_array_keeps_entries_before_it(self, mock_qdrant):
+        mock_qdrant.upsert_journals_bulk = AsyncMock(side_effect=_saved)
+
+        response = await import_journals(_request(b'[{"title": "One"}, {"title": '), self.user_id)
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.error, "INVALID_FORMAT")
+        self.assertEqual(response.data["imported"], 1)
+        self.assertEqual(response.data["results"], [{"index": 0, "id": response.data["results"][0]["id"],
+                                                     "success": True}])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+from uuid import uuid4
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from src.jobs.backfill_vectors import backfill_vectors
+from src.services.journal_vectors import journal_texts
+
+NAMED = ["title", "content", "combined"]
+
+class TestBackfillVectors(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        await self.client.create_collection("journals", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        self.journals = {
+            str(uuid4()): {"userId": f"user_{i % 2}", "title": f"Title {i}", "content": f"Content {i}" if i else "",
+                           "createdAt": float(i)}
+            for i in range(5)
+        }
+        await self.client.upsert("journals", points=[
+            PointStruct(id=journal_id, vector=[1.0, 0.0], payload=payload)
+            for journal_id, payload in self.journals.items()
+        ])
+        self.batches = []
+
+    async def _embed(self, vector_names, journals):
+        self.batches.append(len(journals))
+        vectors = []
+        for title, content in journals:
+            texts = journal_texts(title, content, vector_names)
+            vectors.append({name: [0.0, 1.0] for name in texts} if vector_names else [0.0, 1.0])
+        return vectors
+
+    async def test_backfills_named_vectors_into_new_collection(self):
+        written = await backfill_vectors(
+            self.client, lambda journals: self._embed(NAMED, journals), "journals", "journals_v2",
+            "shared", 8, NAMED, batch_size=2, vector_size=2
+        )
+
+        self.assertEqual(written, 5)
+        self.assertEqual(self.batches, [2, 2, 1])
+        points, _ = await self.client.scroll("journals_v2", limit=10, with_vectors=True)
+        self.assertEqual({point.id: point.payload for point in points}, self.journals)
+        for point in points:
+            expected = {"title", "content", "combined"} if point.payload["content"] else {"title", "combined"}
+            self.assertEqual(set(point.vector), expected)
+        self.assertEqual(await self.client.count("journals"), await self.client.count("journals_v2"))
+
+    async def test_reembeds_in_place_when_layout_matches(self):
+        written = await backfill_vectors(
+            self.client, lambda journals: self._embed(None, journals), "journals", "journals", "shared", 8, None, vector_size=2
+        )
+
+        self.assertEqual(written, 5)
+        points, _ = await self.client.scroll("journals", limit=10, with_vectors=True)
+        self.assertTrue(all(point.vector == [0.0, 1.0] for point in points))
+
+    async def test_refuses_in_place_layout_change(self):
+        with self.assertRaises(RuntimeError):
+            await backfill_vectors(
+                self.client, lambda journals: self._embed(NAMED, journals), "journals", "journals",
+                "shared", 8, NAMED, vector_size=2
+            )
+
+    async def test_refuses_to_add_lexical_vector_in_place(self):
+        with self.assertRaises(RuntimeError):
+            await backfill_vectors(
+                self.client, lambda journals: self._embed(None, journals), "journals", "journals",
+                "shared", 8, None, vector_size=2, lexical=True
+            )
@@ -0,0 +1,74 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams
+from src.services.qdrant_service import qdrant_service
+
+class TestUpsertJournalsBulk(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        await self.client.create_collection(
+            qdrant_service.collection_name, vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+        )
+        self.embed = AsyncMock(side_effect=lambda texts: [[1.0, 0.0] for _ in texts])
+        self.patchers = [
+            patch.object(qdrant_service, "client", self.client),
+            patch.object(qdrant_service, "vector_names", None),
+            patch.object(qdrant_service, "lexical", False),
+            patch.object(qdrant_service, "generate_embeddings", self.embed),
+            patch("src.services.qdrant_service.settings.bulk_upsert_chunk_size", 2),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        self.journals = [{"id": i, "title": f"Journal {i}", "content": "", "createdAt": 100.0 + i}
+                         for i in range(1, 6)]
+
+    async def asyncTearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def test_results_follow_input_order(self):
+        response = await qdrant_service.upsert_journals_bulk("user_1", self.journals)
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["results"], [{"id": i, "success": True} for i in range(1, 6)])
+        points = await self.client.retrieve(qdrant_service.collection_name, [1, 5], with_payload=True)
+        self.assertEqual(sorted(point.payload["createdAt"] for point in points), [101.0, 105.0])
+        self.assertEqual({point.payload["userId"] for point in points}, {"user_1"})
+
+    async def test_failed_chunk_only_fails_its_journals(self):
+        upsert = self.client.upsert
+
+        async def flaky_upsert(collection_name, points, **kwargs):
+            if any(point.id == 3 for point in points):
+                raise RuntimeError("qdrant unavailable")
+            return await upsert(collection_name, points=points, **kwargs)
+
+        with patch.object(self.client, "upsert", side_effect=flaky_upsert):
+            response = await qdrant_service.upsert_journals_bulk("user_1", self.journals)
+
+        self.assertTrue(response.success)
+        results = response.data["results"]
+        self.assertEqual([(item["id"], item["success"]) for item in results],
+                         [(1, True), (2, True), (3, False), (4, False), (5, True)])
+        self.assertEqual(results[2]["error"], "SAVE_ERROR")
+        stored = await self.client.retrieve(qdrant_service.collection_name, [1, 2, 3, 4, 5])
+        self.assertEqual(sorted(point.id for point in stored), [1, 2, 5])
+
+    async def test_embedding_failure_fails_the_whole_call(self):
+        self.embed.side_effect = RuntimeError("model crashed")
+
+        response = await qdrant_service.upsert_journals_bulk("user_1", self.journals)
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.error, "EMBEDDING_ERROR")
+        self.assertEqual((await self.client.count(qdrant_service.collection_name)).count, 0)
+
+    async def test_missing_user_and_empty_input(self):
+        self.assertEqual((await qdrant_service.upsert_journals_bulk("", self.journals)).error, "MISSING_USER_ID")
+        response = await qdrant_service.upsert_journals_bulk("user_1", [])
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["results"], [])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import time
+from src.services.chat_cache import SemanticChatCache
+
+JOURNALS = [{"id": "j1", "updatedAt": 1.0}, {"id": "j2", "updatedAt": 2.0}]
+
+def test_similar_query_with_same_journals_hits():
+    cache = SemanticChatCache(similarity_threshold=0.95)
+    fingerprint = cache.fingerprint(JOURNALS)
+    cache.put("u1", [1.0, 0.0, 0.0], fingerprint, "You slept badly on Tuesday.")
+
+    assert cache.get("u1", [0.99, 0.05, 0.0], fingerprint) == "You slept badly on Tuesday."
+    assert cache.get("u1", [0.0, 1.0, 0.0], fingerprint) is None
+    assert cache.get("u2", [1.0, 0.0, 0.0], fingerprint) is None
+
+def test_different_retrieved_journals_miss():
+    cache = SemanticChatCache()
+    cache.put("u1", [1.0, 0.0], cache.fingerprint(JOURNALS), "answer")
+    edited = [{"id": "j1", "updatedAt": 1.0}, {"id": "j2", "updatedAt": 3.0}]
+    assert cache.get("u1", [1.0, 0.0], cache.fingerprint(edited)) is None
+
+def test_most_similar_entry_wins():
+    cache = SemanticChatCache(similarity_threshold=0.5)
+    fingerprint = cache.fingerprint(JOURNALS)
+    cache.put("u1", [1.0, 0.0], fingerprint, "far")
+    cache.put("u1", [0.7, 0.7], fingerprint, "near")
+    assert cache.get("u1", [0.6, 0.8], fingerprint) == "near"
+
+def test_entries_expire_and_are_bounded():
+    cache = SemanticChatCache(ttl_seconds=0.01, entries_per_user=2, max_users=1)
+    fingerprint = cache.fingerprint(JOURNALS)
+    for i in range(3):
+        cache.put("u1", [1.0, float(i)], fingerprint, f"answer {i}")
+    assert len(cache) == 2
+    cache.put("u2", [1.0, 0.0], fingerprint, "other user")
+    assert cache.get("u1", [1.0, 2.0], fingerprint) is None
+    time.sleep(0.02)
+    assert cache.get("u2", [1.0, 0.0], fingerprint) is None
+
+def test_invalidate_user():
+    cache = SemanticChatCache()
+    fingerprint = cache.fingerprint(JOURNALS)
+    cache.put("u1", [1.0, 0.0], fingerprint, "answer")
+    cache.invalidate_user("u1")
+    assert cache.get("u1", [1.0, 0.0], fingerprint) is None
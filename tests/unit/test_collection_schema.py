@@ -0,0 +1,85 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+from qdrant_client.http.models import (
+    Distance, VectorParams, HnswConfig, OptimizersConfig, PayloadSchemaType, PayloadIndexInfo
+)
+from src.services.collection_schema import (
+    SchemaManager, journals_schema, journals_layout_schemas, shard_collection_name
+)
+
+def _collection_info(payload_schema=None, m=16, vector_size=384):
+    return SimpleNamespace(
+        payload_schema=payload_schema or {},
+        config=SimpleNamespace(
+            params=SimpleNamespace(vectors=VectorParams(size=vector_size, distance=Distance.COSINE)),
+            hnsw_config=HnswConfig(m=m, ef_construct=100, full_scan_threshold=10000),
+            optimizer_config=OptimizersConfig(
+                deleted_threshold=0.2, vacuum_min_vector_number=1000, default_segment_number=0,
+                indexing_threshold=20000, memmap_threshold=50000, flush_interval_sec=5
+            ),
+        ),
+    )
+
+INDEXED = {
+    "userId": PayloadIndexInfo(data_type=PayloadSchemaType.KEYWORD, points=0),
+    "createdAt": PayloadIndexInfo(data_type=PayloadSchemaType.FLOAT, points=0),
+}
+
+class TestSchemaManager(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.client = AsyncMock()
+        self.manager = SchemaManager(self.client)
+        self.schema = journals_schema()
+
+    async def test_creates_missing_collection_and_indexes(self):
+        self.client.collection_exists.side_effect = [False, True]
+        self.client.get_collection.side_effect = [_collection_info(), _collection_info(INDEXED)]
+
+        drift = await self.manager.apply(self.schema)
+
+        self.assertEqual(drift, [])
+        self.client.create_collection.assert_called_once()
+        indexed_fields = {call.args[1] for call in self.client.create_payload_index.call_args_list}
+        self.assertEqual(indexed_fields, {"userId", "createdAt"})
+        self.client.update_collection.assert_not_called()
+
+    async def test_apply_is_idempotent(self):
+        self.client.collection_exists.return_value = True
+        self.client.get_collection.return_value = _collection_info(INDEXED)
+
+        drift = await self.manager.apply(self.schema)
+
+        self.assertEqual(drift, [])
+        self.client.create_collection.assert_not_called()
+        self.client.create_payload_index.assert_not_called()
+        self.client.update_collection.assert_not_called()
+
+    async def test_reports_drift(self):
+        self.client.collection_exists.return_value = True
+        self.client.get_collection.return_value = _collection_info({}, m=32, vector_size=768)
+
+        drift = await self.manager.diff(self.schema)
+
+        self.assertIn("payload index on 'userId' is missing", drift)
+        self.assertIn("hnsw_config.m is 32, declared 16", drift)
+        self.assertTrue(any(item.startswith("vector 'default' is 768") for item in drift))
+
+    async def test_tenant_layout_partitions_hnsw_by_user(self):
+        self.client.collection_exists.return_value = True
+        self.client.get_collection.return_value = _collection_info(INDEXED)
+
+        drift = await self.manager.diff(journals_schema(tenant=True))
+
+        self.assertIn("hnsw_config.m is 16, declared 0", drift)
+        self.assertIn("hnsw_config.payload_m is None, declared 16", drift)
+
+def test_sharded_layout_maps_users_to_stable_shards():
+    names = [schema.name for schema in journals_layout_schemas("sharded", shard_count=4)]
+
+    assert names == [f"journals_shard_{i}" for i in range(4)]
+    assert shard_collection_name("journals", "user_1", 4) in names
+    assert shard_collection_name("journals", "user_1", 4) == shard_collection_name("journals", "user_1", 4)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import numpy as np
+import pytest
+from src.services.embedding_backends import (
+    OnnxEmbeddingBackend, TorchEmbeddingBackend, create_embedding_backend, hub_repo_id, l2_normalize, mean_pool
+)
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+# Cosine similarity each backend's vectors must keep against the torch reference
+PARITY_TOLERANCE = {"onnx": 0.999, "onnx-int8": 0.98}
+
+PARITY_TEXTS = [
+    "Went for a long run by the river this morning and felt great.",
+    "Work was stressful today, the release slipped again.",
+    "Dinner with my sister; we talked about moving abroad.",
+    "Couldn't sleep. Kept thinking about the interview.",
+    "short",
+]
+
+def test_mean_pool_ignores_padding():
+    tokens = np.array([[[1.0, 1.0], [3.0, 3.0], [100.0, 100.0]]])
+    mask = np.array([[1, 1, 0]])
+    np.testing.assert_allclose(mean_pool(tokens, mask), [[2.0, 2.0]])
+
+def test_l2_normalize_returns_unit_vectors():
+    vectors = l2_normalize(np.array([[3.0, 4.0], [0.0, 2.0]]))
+    np.testing.assert_allclose(np.linalg.norm(vectors, axis=1), [1.0, 1.0])
+
+def test_hub_repo_id_expands_bare_model_names():
+    assert hub_repo_id("all-MiniLM-L6-v2") == "sentence-transformers/all-MiniLM-L6-v2"
+    assert hub_repo_id("intfloat/e5-small-v2") == "intfloat/e5-small-v2"
+
+def test_create_embedding_backend():
+    assert isinstance(create_embedding_backend("torch", MODEL_NAME), TorchEmbeddingBackend)
+    backend = create_embedding_backend("onnx", MODEL_NAME, quantize=True)
+    assert isinstance(backend, OnnxEmbeddingBackend)
+    assert backend.quantize and not backend.loaded
+    with pytest.raises(ValueError):
+        create_embedding_backend("tensorflow", MODEL_NAME)
+
+def _load_or_skip(backend):
+    try:
+        backend.load()
+    except Exception as e:
+        pytest.skip(f"{backend.name} backend unavailable: {e}")
+    return backend
+
+@pytest.mark.parametrize("variant", ["onnx", "onnx-int8"])
+def test_onnx_backend_matches_torch(variant):
+    pytest.importorskip("onnxruntime")
+    torch_backend = _load_or_skip(TorchEmbeddingBackend(MODEL_NAME))
+    onnx_backend = _load_or_skip(OnnxEmbeddingBackend(MODEL_NAME, quantize=variant == "onnx-int8"))
+
+    expected = l2_normalize(np.asarray(torch_backend.encode(PARITY_TEXTS), dtype=np.float32))
+    actual = onnx_backend.encode(PARITY_TEXTS)
+
+    assert actual.shape == expected.shape
+    similarities = (expected * actual).sum(axis=1)
+    assert similarities.min() >= PARITY_TOLERANCE[variant]
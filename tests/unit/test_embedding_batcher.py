@@ -0,0 +1,72 @@
+import asyncio
+import unittest
+import numpy as np
+from src.services.embedding_batcher import EmbeddingBatcher
+
+class TestEmbeddingBatcher(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.calls = []
+
+    def encode(self, texts):
+        self.calls.append(list(texts))
+        return np.array([[float(len(text)), 1.0] for text in texts])
+
+    async def asyncTearDown(self):
+        await self.batcher.close()
+
+    async def test_concurrent_requests_share_one_batch(self):
+        self.batcher = EmbeddingBatcher(self.encode, max_batch_size=8, max_wait_ms=20)
+
+        vectors = await asyncio.gather(*(self.batcher.embed("x" * n) for n in range(1, 6)))
+
+        self.assertEqual(len(self.calls), 1)
+        self.assertEqual([v[0] for v in vectors], [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    async def test_batches_respect_max_batch_size(self):
+        self.batcher = EmbeddingBatcher(self.encode, max_batch_size=2, max_wait_ms=20)
+
+        vectors = await self.batcher.embed_many(["a", "bb", "ccc", "dddd", "eeeee"])
+
+        self.assertTrue(all(len(call) <= 2 for call in self.calls))
+        self.assertEqual([v[0] for v in vectors], [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    async def test_encode_errors_reach_every_caller(self):
+        def failing_encode(texts):
+            raise RuntimeError("model unavailable")
+
+        self.batcher = EmbeddingBatcher(failing_encode, max_batch_size=8, max_wait_ms=5)
+
+        results = await asyncio.gather(
+            self.batcher.embed("a"), self.batcher.embed("b"), return_exceptions=True
+        )
+
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+
+    async def test_close_drains_in_flight_batches_and_cancels_queued_requests(self):
+        started, release = asyncio.Event(), asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def slow_encode(texts):
+            loop.call_soon_threadsafe(started.set)
+            asyncio.run_coroutine_threadsafe(release.wait(), loop).result()
+            return self.encode(texts)
+
+        self.batcher = EmbeddingBatcher(slow_encode, max_batch_size=1, max_wait_ms=0)
+        in_flight = asyncio.ensure_future(self.batcher.embed("abc"))
+        await started.wait()
+        queued = asyncio.ensure_future(self.batcher.embed("queued"))
+        await asyncio.sleep(0)
+
+        closing = asyncio.ensure_future(self.batcher.close())
+        await asyncio.sleep(0.01)
+        self.assertEqual(len(self.batcher._batches), 1)
+        release.set()
+        await closing
+
+        self.assertEqual((await in_flight)[0], 3.0)
+        self.assertEqual(self.batcher._batches, set())
+        with self.assertRaises(asyncio.CancelledError):
+            await queued
+
+if __name__ == '__main__':
+    unittest.main()
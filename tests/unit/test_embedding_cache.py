@@ -0,0 +1,62 @@
+import asyncio
+import os
+import tempfile
+import threading
+from src.services.embedding_cache import EmbeddingCache
+
+def test_normalized_text_shares_an_entry():
+    cache = EmbeddingCache("test-model")
+    cache.put("how was  my week ", [0.5, 0.25])
+
+    assert cache.get("how was my week") == [0.5, 0.25]
+    assert cache.get("how was my month") is None
+
+def test_key_includes_model_name():
+    assert EmbeddingCache("model-a").key("hello") != EmbeddingCache("model-b").key("hello")
+
+def test_lru_evicts_least_recently_used():
+    cache = EmbeddingCache("test-model", max_entries=2)
+    cache.put("a", [1.0])
+    cache.put("b", [2.0])
+    cache.get("a")
+    cache.put("c", [3.0])
+
+    assert cache.get("b") is None
+    assert cache.get("a") == [1.0]
+    assert cache.get("c") == [3.0]
+
+def test_disk_tier_survives_restart():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "embeddings.db")
+        cache = EmbeddingCache("test-model", disk_path=path)
+        cache.put("persist me", [0.5, -1.0])
+        cache.close()
+
+        reopened = EmbeddingCache("test-model", disk_path=path)
+        assert reopened.get("persist me") == [0.5, -1.0]
+        reopened.close()
+
+def test_async_lookups_read_disk_tier_in_one_batch():
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "embeddings.db")
+        cache = EmbeddingCache("test-model", disk_path=path)
+        cache.put_many(["a", "b"], [[1.0], [2.0]])
+        cache.close()
+
+        reopened = EmbeddingCache("test-model", disk_path=path)
+        loop_thread = threading.get_ident()
+        disk_threads = []
+        read = reopened._disk_get_many
+
+        def recording_read(keys):
+            disk_threads.append((threading.get_ident(), len(keys)))
+            return read(keys)
+
+        reopened._disk_get_many = recording_read
+        assert asyncio.run(reopened.get_many(["a", "b", "c"])) == [[1.0], [2.0], None]
+        assert len(disk_threads) == 1
+        assert disk_threads[0][0] != loop_thread and disk_threads[0][1] == 3
+        # Disk hits are promoted to memory, so the next lookup stays off the cache thread
+        assert asyncio.run(reopened.get_many(["a", "b"])) == [[1.0], [2.0]]
+        assert len(disk_threads) == 1
+        reopened.close()
@@ -0,0 +1,88 @@
+import asyncio
+import os
+import tempfile
+import threading
+import unittest
+import numpy as np
+from src.services.embedding_backends import EmbeddingBackend, RemoteEmbeddingBackend
+from src.services.embedding_protocol import EmbeddingProtocolError
+from src.services.embedding_server import EmbeddingServer
+
+MODEL_NAME = "all-MiniLM-L6-v2"
+
+class FakeBackend(EmbeddingBackend):
+    name = "fake"
+
+    def __init__(self, model_name=MODEL_NAME):
+        super().__init__(model_name)
+        self.batches = []
+        self.lock = threading.Lock()
+
+    def _load(self):
+        pass
+
+    def _encode(self, texts):
+        with self.lock:
+            self.batches.append(list(texts))
+        if any(text == "boom" for text in texts):
+            raise RuntimeError("model exploded")
+        return np.array([[len(text), i, 1.0] for i, text in enumerate(texts)], dtype=np.float32)
+
+class TestEmbeddingServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.tmpdir.name, "embeddings.sock")
+        self.backend = FakeBackend()
+        self.server = EmbeddingServer(self.backend, self.socket_path, max_batch_size=64, max_wait_ms=50)
+        await self.server.start()
+
+    async def asyncTearDown(self):
+        await self.server.close()
+        self.tmpdir.cleanup()
+
+    def client(self, model_name=MODEL_NAME):
+        return RemoteEmbeddingBackend(model_name, [self.socket_path], timeout_seconds=5)
+
+    async def test_remote_encode_returns_server_vectors(self):
+        client = self.client()
+        vectors = await asyncio.to_thread(client.encode, ["hello", "hi"])
+        self.assertTrue(client.loaded)
+        self.assertEqual(vectors.shape, (2, 3))
+        self.assertEqual(vectors[0][0], 5.0)
+        self.assertEqual(vectors[1][0], 2.0)
+
+    async def test_requests_from_separate_clients_share_a_batch(self):
+        clients = [self.client() for _ in range(4)]
+        results = await asyncio.gather(*[
+            asyncio.to_thread(client.encode, [f"text from worker {i}"]) for i, client in enumerate(clients)
+        ])
+        self.assertEqual([len(result) for result in results], [1, 1, 1, 1])
+        # Every worker's text went through the model, in fewer calls than workers
+        self.assertEqual(sum(len(batch) for batch in self.backend.batches), 4)
+        self.assertLess(len(self.backend.batches), 4)
+
+    async def test_model_mismatch_fails_load(self):
+        client = self.client(model_name="some-other-model")
+        with self.assertRaises(RuntimeError):
+            await asyncio.to_thread(client.load)
+
+    async def test_encode_errors_are_reported_to_the_client(self):
+        client = self.client()
+        with self.assertRaises(EmbeddingProtocolError) as ctx:
+            await asyncio.to_thread(client.encode, ["boom"])
+        self.assertIn("model exploded", str(ctx.exception))
+        # The connection stays usable after an error reply
+        vectors = await asyncio.to_thread(client.encode, ["ok"])
+        self.assertEqual(vectors.shape, (1, 3))
+
+    async def test_client_reconnects_after_server_restart(self):
+        client = self.client()
+        await asyncio.to_thread(client.encode, ["first"])
+        await self.server.close()
+        self.server = EmbeddingServer(self.backend, self.socket_path, max_wait_ms=1)
+        await self.server.start()
+        vectors = await asyncio.to_thread(client.encode, ["second"])
+        self.assertEqual(vectors.shape, (1, 3))
+
+if __name__ == '__main__':
+    unittest.main()
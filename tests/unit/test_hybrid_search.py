@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+import numpy as np
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import ScoredPoint
+from src.services import lexical
+from src.services.collection_schema import SchemaManager, journals_schema
+from src.services.journal_vectors import LEXICAL
+from src.services.qdrant_service import qdrant_service
+
+def _fake_embedding(text):
+    return [1.0, 0.0] if "coffee" in text.lower() else [0.0, 1.0]
+
+class TestLexicalVectors(unittest.TestCase):
+    def test_terms_drop_stopwords_and_case(self):
+        self.assertEqual(lexical.terms("I met Priya at the Café, then I ran"), ["met", "priya", "café", "ran"])
+
+    def test_title_terms_weigh_more_than_content_terms(self):
+        vector = lexical.document_vector("Lisbon", "lisbon trip")
+        weights = dict(zip(vector.indices, vector.values))
+        lisbon, = lexical.query_vector("Lisbon").indices
+        trip, = lexical.query_vector("trip").indices
+        self.assertGreater(weights[lisbon], weights[trip])
+        self.assertEqual(vector.indices, sorted(vector.indices))
+
+    def test_query_of_only_stopwords_is_empty(self):
+        self.assertEqual(lexical.query_vector("what did I do?").indices, [])
+
+    def test_reciprocal_rank_fusion_rewards_agreement(self):
+        def ranking(*ids):
+            return [ScoredPoint(id=i, version=0, score=1.0) for i in ids]
+        fused = lexical.reciprocal_rank_fusion([ranking(1, 2, 3), ranking(3, 4)], k=60)
+        self.assertEqual([point.id for point in fused], [3, 1, 2, 4])
+        self.assertAlmostEqual(fused[0].score, 1 / 63 + 1 / 61)
+
+class TestHybridSearch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        schema = journals_schema(qdrant_service.collection_name, vector_size=2, lexical=True)
+        await SchemaManager(self.client).apply(schema)
+        self.patchers = [
+            # qdrant-client 1.9's local mode scores sparse vectors with np.NINF, which NumPy 2 removed
+            patch.object(np, "NINF", -np.inf, create=True),
+            patch.object(qdrant_service, "client", self.client),
+            patch.object(qdrant_service, "vector_names", None),
+            patch.object(qdrant_service, "lexical", True),
+            patch.object(qdrant_service, "generate_embeddings",
+                         AsyncMock(side_effect=lambda texts: [_fake_embedding(text) for text in texts])),
+            patch.object(qdrant_service, "generate_embedding", AsyncMock(return_value=[1.0, 0.0])),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        response = await qdrant_service.upsert_journals_bulk("user_1", [
+            {"id": 1, "title": "Coffee", "content": "Coffee with the team before standup"},
+            {"id": 2, "title": "Coffee again", "content": "Too much coffee today"},
+            {"id": 3, "title": "Dinner", "content": "Dinner with Priya at the harbour"},
+        ])
+        self.assertTrue(response.success)
+        await qdrant_service.upsert_journals_bulk("user_2", [
+            {"id": 4, "title": "Priya", "content": "Dinner with Priya"},
+        ])
+
+    async def asyncTearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def _search(self, query):
+        response = await qdrant_service.search_journals(query, "user_1", limit=2)
+        self.assertTrue(response.success)
+        return [journal["id"] for journal in response.data["journals"]]
+
+    async def test_journals_are_stored_with_lexical_vector(self):
+        point, = await self.client.retrieve(qdrant_service.collection_name, [3], with_vectors=True)
+        self.assertEqual(point.vector[""], [0.0, 1.0])
+        self.assertEqual(set(point.vector[LEXICAL].indices), set(lexical.query_vector("dinner priya harbour").indices))
+
+    async def test_hybrid_search_finds_rare_words_dense_search_misses(self):
+        with patch.object(qdrant_service, "lexical", False):
+            self.assertEqual(await self._search("Dinner with Priya"), [1, 2])
+        self.assertEqual(await self._search("Dinner with Priya"), [3, 1])
+
+    async def test_stopword_query_falls_back_to_dense_search(self):
+        self.assertEqual(await self._search("what did I do"), [1, 2])
+
+    async def test_update_rewrites_lexical_vector(self):
+        response = await qdrant_service.update_journal(2, "user_1", content="Lunch with Priya")
+        self.assertTrue(response.success)
+        point, = await self.client.retrieve(qdrant_service.collection_name, [2], with_vectors=True)
+        self.assertEqual(set(point.vector[LEXICAL].indices),
+                         set(lexical.query_vector("coffee again lunch priya").indices))
+
+    async def test_sparse_vector_drift_is_reported(self):
+        await self.client.create_collection("dense_only", vectors_config=journals_schema().vectors_config)
+        drift = await SchemaManager(self.client).diff(journals_schema("dense_only", lexical=True))
+        self.assertIn("sparse vector 'lexical' is missing", drift)
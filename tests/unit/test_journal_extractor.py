@@ -0,0 +1,57 @@
+from src.models.response import APIResponse
+from src.utils.journal_extractor import JournalTextExtractor
+
+def _journal(i, content, score=0.0):
+    return {"id": str(i), "title": f"Day {i}", "content": content, "createdAt": float(i), "score": score}
+
+def test_unbounded_context_keeps_every_entry_chronologically():
+    journals = [_journal(2, "Went hiking"), _journal(1, "Read a book")]
+
+    result = JournalTextExtractor.build_context(journals)
+
+    assert result.context == "Day 1: Read a book\nDay 2: Went hiking"
+    assert result.entries_used == 2
+    assert result.entries_dropped == 0
+
+def test_near_duplicates_are_dropped():
+    journals = [
+        {**_journal(1, "Felt great after the morning run by the river"), "title": "Run"},
+        {**_journal(2, "Felt great after the morning run by the river!"), "title": "Run"},
+    ]
+
+    result = JournalTextExtractor.build_context(journals)
+
+    assert result.entries_used == 1
+    assert result.duplicates_dropped == 1
+
+def test_budget_prefers_highest_scores_and_reports_drops():
+    journals = [_journal(i, "word " * 60, score=i / 10) for i in range(1, 6)]
+    per_entry = JournalTextExtractor.estimate_tokens(JournalTextExtractor.format_journal(journals[0]))
+
+    result = JournalTextExtractor.build_context(journals, token_budget=per_entry * 2 + 10, rank_by="score")
+
+    assert result.tokens_used <= per_entry * 2 + 10
+    assert result.context.startswith("Day 5:")
+    assert result.entries_used == 2
+    assert result.entries_dropped == 3
+
+def test_entry_crossing_the_budget_is_truncated():
+    journals = [_journal(1, "short entry"), _journal(2, "long " * 400)]
+
+    result = JournalTextExtractor.build_context(journals, token_budget=100)
+
+    # The most recent entry wins the budget and is cut to fit
+    assert result.truncated is True
+    assert result.tokens_used <= 100
+    assert result.context.startswith("Day 2:")
+    assert result.context.endswith("…")
+    assert result.entries_used == 1
+    assert result.entries_dropped == 1
+
+def test_process_journals_response_applies_budget():
+    response = APIResponse.success_response(data={"journals": [_journal(i, "entry " * 50) for i in range(10)]})
+
+    context, error = JournalTextExtractor.process_journals_response(response, token_budget=200)
+
+    assert error is None
+    assert JournalTextExtractor.estimate_tokens(context) <= 200
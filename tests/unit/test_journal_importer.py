@@ -0,0 +1,44 @@
+import unittest
+from src.utils.journal_importer import JournalImportParser, ImportEntryError
+
+async def _stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+async def _collect(*chunks):
+    return [entry async for entry in JournalImportParser.iter_entries(_stream(*chunks))]
+
+class TestJournalImportParser(unittest.IsolatedAsyncioTestCase):
+    async def test_json_array_split_across_chunks(self):
+        entries = await _collect(b' [{"title": "One"}, {"tit', b'le": "Tw', b'o", "content": "x"}', b']')
+
+        self.assertEqual(entries, [(0, {"title": "One"}), (1, {"title": "Two", "content": "x"})])
+
+    async def test_jsonl_reports_bad_lines_and_continues(self):
+        entries = await _collect(b'{"title": "One"}\nnot json\n', b'{"title": "Three"}')
+
+        self.assertEqual(entries[0], (0, {"title": "One"}))
+        self.assertIsInstance(entries[1][1], ImportEntryError)
+        self.assertEqual(entries[1][1].error, "INVALID_JSON")
+        self.assertEqual(entries[2], (2, {"title": "Three"}))
+
+    async def test_multibyte_characters_split_across_chunks(self):
+        encoded = '{"title": "café"}\n'.encode("utf-8")
+
+        entries = await _collect(encoded[:14], encoded[14:])
+
+        self.assertEqual(entries, [(0, {"title": "café"})])
+
+    async def test_unterminated_array_raises(self):
+        with self.assertRaises(ImportEntryError):
+            await _collect(b'[{"title": "One"}, {"title": ')
+
+    async def test_oversized_jsonl_line_raises_before_it_ends(self):
+        chunk = b'{"title": "' + b"x" * (JournalImportParser.MAX_ENTRY_BYTES // 4)
+
+        with self.assertRaises(ImportEntryError) as raised:
+            await _collect(b'{"title": "One"}\n', *[chunk] * 5)
+        self.assertIn("Entry 1", raised.exception.message)
+
+if __name__ == '__main__':
+    unittest.main()
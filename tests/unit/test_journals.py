@@ -1,5 +1,5 @@
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 from fastapi import Depends
 from src.models.journal import JournalCreate, JournalUpdate
 from src.utils.journal_validator import JournalValidator
@@ -18,7 +18,7 @@ class TestJournalOperations:
         app.dependency_overrides = {}
 
     @pytest.mark.asyncio
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     async def test_create_journal(self, mock_qdrant, client, mock_user_id, sample_journal):
         # Setup mock
         mock_qdrant.upsert_journal.return_value = APIResponse.success_response(
@@ -33,8 +33,8 @@ class TestJournalOperations:
         assert "id" in response.json()["data"]
 
     @pytest.mark.asyncio
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
-    @patch('src.api.v1.endpoints.journals.gemini_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
     async def test_get_summary(self, mock_gemini, mock_qdrant, client, mock_user_id):
         # Setup mocks
         mock_qdrant.get_journals_by_user.return_value = APIResponse.success_response(
@@ -52,8 +52,8 @@ class TestJournalOperations:
         assert "response" in response.json()["data"]
 
     @pytest.mark.asyncio
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
-    @patch('src.api.v1.endpoints.journals.gemini_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
+    @patch('src.api.v1.endpoints.journals.gemini_service', new_callable=AsyncMock)
     async def test_chat_with_journals(self, mock_gemini, mock_qdrant, client, mock_user_id):
         # Setup mocks
         mock_qdrant.search_journals.return_value = APIResponse.success_response(
@@ -83,7 +83,7 @@ class TestJournalOperations:
         assert response.status_code in [401, 403]  # Accept either unauthorized or forbidden
 
     @pytest.mark.asyncio
-    @patch('src.api.v1.endpoints.journals.qdrant_service')
+    @patch('src.api.v1.endpoints.journals.qdrant_service', new_callable=AsyncMock)
     async def test_journal_extraction(self, mock_qdrant, client, mock_user_id):
         # Setup mock
         journals_data = [
@@ -0,0 +1,85 @@
+import json
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler
+from fastapi.testclient import TestClient
+from src.main import app
+from src.core.logger import (
+    DroppingQueueHandler, JsonFormatter, RequestContextFilter, dropped_records, log_sampled_var, logger,
+    request_id_var, sample_rate_for, start_logging, stop_logging
+)
+
+def make_record(level=logging.INFO, msg="hello %s", args=("world",), **extra):
+    record = logging.LogRecord("journal_app", level, __file__, 10, msg, args, None)
+    record.__dict__.update(extra)
+    return record
+
+def test_json_formatter_includes_request_id_and_extras():
+    record = make_record(request_id="abc123", user_id="u1")
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry["message"] == "hello world"
+    assert entry["level"] == "INFO"
+    assert entry["request_id"] == "abc123"
+    assert entry["user_id"] == "u1"
+
+def test_filter_tags_request_id_and_drops_unsampled_info():
+    log_filter = RequestContextFilter()
+    id_token = request_id_var.set("req-1")
+    sampled_token = log_sampled_var.set(False)
+    try:
+        info = make_record()
+        warning = make_record(level=logging.WARNING)
+        assert log_filter.filter(info) is False
+        assert log_filter.filter(warning) is True
+        assert warning.request_id == "req-1"
+    finally:
+        request_id_var.reset(id_token)
+        log_sampled_var.reset(sampled_token)
+
+def test_sample_rate_uses_longest_matching_prefix():
+    rates = {"/api/v1/journals": 0.5, "/api/v1/journals/chat": 0.1}
+    assert sample_rate_for("/api/v1/journals/chat/stream", rates) == 0.1
+    assert sample_rate_for("/api/v1/journals/summary", rates) == 0.5
+    assert sample_rate_for("/ready", rates) == 1.0
+
+def test_queued_exception_keeps_its_json_field():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = make_record(level=logging.ERROR, exc_info=sys.exc_info())
+    handler = DroppingQueueHandler(queue.Queue())
+    handler.handle(record)
+
+    entry = json.loads(JsonFormatter().format(handler.queue.get_nowait()))
+    assert entry["message"] == "hello world"
+    assert "Traceback" not in entry["message"]
+    assert entry["exc_info"].startswith("Traceback")
+    assert "ValueError: boom" in entry["exc_info"]
+
+def test_full_queue_drops_and_counts_records():
+    handler = DroppingQueueHandler(queue.Queue(maxsize=1))
+    before = dropped_records.value(level="WARNING")
+    handler.handle(make_record(level=logging.WARNING))
+    handler.handle(make_record(level=logging.WARNING))
+    assert handler.queue.qsize() == 1
+    assert dropped_records.value(level="WARNING") == before + 1
+
+def test_logging_goes_through_a_single_queue_handler_once_started():
+    assert not any(isinstance(handler, QueueHandler) for handler in logging.getLogger().handlers)
+    start_logging()
+    try:
+        root_handlers = logging.getLogger().handlers
+        assert len(root_handlers) == 1 and isinstance(root_handlers[0], QueueHandler)
+        assert logger.handlers == []
+        assert logger.propagate
+    finally:
+        stop_logging()
+    assert not any(isinstance(handler, QueueHandler) for handler in logging.getLogger().handlers)
+
+def test_middleware_assigns_and_echoes_request_ids():
+    client = TestClient(app)
+    generated = client.get("/").headers["x-request-id"]
+    assert len(generated) == 32
+    assert client.get("/", headers={"X-Request-ID": "trace-42"}).headers["x-request-id"] == "trace-42"
+    assert client.get("/", headers={"X-Request-ID": "bad id\n"}).headers["x-request-id"] != "bad id\n"
@@ -0,0 +1,103 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src.core.firebase import get_current_user
+from src.core.instrumentation import stage_errors, stage_in_flight, stage_seconds, timed
+from src.core.metrics import MetricsRegistry
+from src.core.middleware import http_errors, http_requests
+from src.models.response import APIResponse
+from src.services.qdrant_service import qdrant_service
+
+def _count(histogram, **labels):
+    series = histogram.snapshot().get(tuple(sorted(labels.items())))
+    return series["count"] if series else 0
+
+def test_prometheus_exposition():
+    registry = MetricsRegistry()
+    registry.counter("requests_total", "Requests").inc(2, route='/a"b')
+    registry.gauge("in_flight", "In flight").set(3)
+    histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1))
+    histogram.observe(0.05, stage="x")
+    histogram.observe(5, stage="x")
+
+    lines = registry.render_prometheus().splitlines()
+
+    assert "# TYPE requests_total counter" in lines
+    assert 'requests_total{route="/a\\"b"} 2.0' in lines
+    assert "# TYPE in_flight gauge" in lines
+    assert "in_flight 3.0" in lines
+    assert 'latency_seconds_bucket{stage="x",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{stage="x",le="1.0"} 1' in lines
+    assert 'latency_seconds_bucket{stage="x",le="+Inf"} 2' in lines
+    assert 'latency_seconds_count{stage="x"} 2' in lines
+
+def test_timed_records_calls_and_failed_responses():
+    @timed("test", "lookup")
+    async def lookup(ok):
+        return APIResponse.success_response() if ok else APIResponse.error_response(error="NOPE")
+
+    labels = {"stage": "test", "operation": "lookup"}
+    calls, errors = _count(stage_seconds, **labels), stage_errors.value(**labels)
+    asyncio.run(lookup(True))
+    asyncio.run(lookup(False))
+    assert _count(stage_seconds, **labels) == calls + 2
+    assert stage_errors.value(**labels) == errors + 1
+    assert stage_in_flight.value(**labels) == 0
+
+def test_timed_counts_exceptions_of_sync_functions():
+    @timed("test")
+    def explode():
+        raise ValueError("boom")
+
+    errors = stage_errors.value(stage="test", operation="explode")
+    with pytest.raises(ValueError):
+        explode()
+    assert stage_errors.value(stage="test", operation="explode") == errors + 1
+
+def test_timed_async_generator_spans_the_whole_stream():
+    @timed("test")
+    async def chunks():
+        for i in range(3):
+            await asyncio.sleep(0.01)
+            yield i
+
+    async def consume():
+        return [chunk async for chunk in chunks()]
+
+    labels = {"stage": "test", "operation": "chunks"}
+    errors = stage_errors.value(**labels)
+    assert asyncio.run(consume()) == [0, 1, 2]
+    series = stage_seconds.snapshot()[tuple(sorted(labels.items()))]
+    assert series["sum"] >= 0.03
+    assert stage_errors.value(**labels) == errors
+
+class TestMetricsEndpoint:
+    def setup_method(self):
+        app.dependency_overrides[get_current_user] = lambda: "user_1"
+        self.client = TestClient(app)
+
+    def teardown_method(self):
+        app.dependency_overrides.clear()
+
+    def test_requests_are_labelled_by_route_and_api_errors_counted(self):
+        route = {"method": "PUT", "route": "/api/v1/journals/{journal_id}"}
+        requests, errors = http_requests.value(status=200, **route), http_errors.value(**route)
+
+        with patch.object(qdrant_service.client, "scroll", AsyncMock(side_effect=RuntimeError("down"))):
+            response = self.client.put("/api/v1/journals/abc", json={"title": "New"})
+
+        assert response.status_code == 200
+        assert response.json()["success"] is False
+        assert http_requests.value(status=200, **route) == requests + 1
+        assert http_errors.value(**route) == errors + 1
+
+    def test_metrics_endpoint_exposes_registry(self):
+        self.client.get("/")
+        response = self.client.get("/metrics")
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+        assert '# TYPE http_request_seconds histogram' in response.text
+        assert 'http_requests_total{method="GET",route="/",status="200"}' in response.text
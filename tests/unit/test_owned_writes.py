@@ -0,0 +1,151 @@
+import unittest
+from unittest.mock import AsyncMock, patch
+from uuid import uuid4
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from src.services.qdrant_service import qdrant_service
+
+def _fake_embedding(text):
+    return [0.0, 1.0] if "New" in text else [1.0, 0.0]
+
+class OwnedWritesTestCase(unittest.IsolatedAsyncioTestCase):
+    vector_names = None
+
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        params = VectorParams(size=2, distance=Distance.COSINE)
+        await self.client.create_collection(
+            qdrant_service.collection_name,
+            vectors_config=params if self.vector_names is None else {name: params for name in self.vector_names}
+        )
+        self.journal_id = str(uuid4())
+        self.embed = AsyncMock(side_effect=lambda texts: [_fake_embedding(text) for text in texts])
+        self.patchers = [
+            patch.object(qdrant_service, "client", self.client),
+            patch.object(qdrant_service, "generate_embeddings", self.embed),
+            patch.object(qdrant_service, "vector_names", self.vector_names),
+            patch.object(qdrant_service, "search_weights", {"title": 0.5, "content": 0.5})
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        vector, = await qdrant_service.embed_journals([("Old title", "Old content")])
+        await self.client.upsert(qdrant_service.collection_name, points=[
+            PointStruct(id=self.journal_id, vector=vector,
+                        payload={"userId": "user_1", "title": "Old title", "content": "Old content",
+                                 "createdAt": 100.0, "updatedAt": 100.0})
+        ])
+        self.embed.reset_mock()
+
+    async def asyncTearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def _point(self):
+        points = await self.client.retrieve(qdrant_service.collection_name, [self.journal_id], with_vectors=True)
+        return points[0] if points else None
+
+    def _embedded_texts(self):
+        return [text for call in self.embed.await_args_list for text in call.args[0]]
+
+class TestOwnershipCheckedWrites(OwnedWritesTestCase):
+    async def test_title_only_update_reembeds_combined_text(self):
+        response = await qdrant_service.update_journal(self.journal_id, "user_1", title="New title")
+        self.assertTrue(response.success)
+        self.assertEqual(self._embedded_texts(), ["New title\n\nOld content"])
+        point = await self._point()
+        self.assertEqual(point.payload["title"], "New title")
+        self.assertEqual(point.payload["content"], "Old content")
+        self.assertEqual(point.payload["createdAt"], 100.0)
+        self.assertGreater(point.payload["updatedAt"], 100.0)
+
+    async def test_full_update_skips_the_read(self):
+        with patch.object(self.client, "scroll", wraps=self.client.scroll) as scroll:
+            response = await qdrant_service.update_journal(
+                self.journal_id, "user_1", title="New title", content="New content"
+            )
+        self.assertTrue(response.success)
+        scroll.assert_not_called()
+        self.assertEqual(self._embedded_texts(), ["New title\n\nNew content"])
+        point = await self._point()
+        self.assertEqual(point.payload["createdAt"], 100.0)
+        self.assertGreater(point.payload["updatedAt"], 100.0)
+        self.assertAlmostEqual(point.vector[1], 1.0)
+
+    async def test_changed_content_is_reembedded(self):
+        response = await qdrant_service.update_journal(self.journal_id, "user_1", content="New content")
+        self.assertTrue(response.success)
+        self.assertEqual(self._embedded_texts(), ["Old title\n\nNew content"])
+        point = await self._point()
+        self.assertEqual(point.payload["content"], "New content")
+        self.assertEqual(point.payload["title"], "Old title")
+        self.assertEqual(point.payload["createdAt"], 100.0)
+        self.assertAlmostEqual(point.vector[1], 1.0)
+
+    async def test_update_of_missing_journal(self):
+        response = await qdrant_service.update_journal(str(uuid4()), "user_1", title="New title")
+        self.assertFalse(response.success)
+        self.assertEqual(response.error, "JOURNAL_NOT_FOUND")
+
+    async def test_other_users_cannot_update(self):
+        for update in ({"title": "Hijacked"}, {"content": "Hijacked"}):
+            response = await qdrant_service.update_journal(self.journal_id, "user_2", **update)
+            self.assertEqual(response.error, "JOURNAL_NOT_FOUND")
+        point = await self._point()
+        self.assertEqual(point.payload["title"], "Old title")
+        self.assertEqual(point.payload["content"], "Old content")
+
+    async def test_delete_is_scoped_to_owner(self):
+        await qdrant_service.delete_journal(self.journal_id, "user_2")
+        self.assertIsNotNone(await self._point())
+        response = await qdrant_service.delete_journal(self.journal_id, "user_1")
+        self.assertTrue(response.success)
+        self.assertIsNone(await self._point())
+
+class TestNamedVectorWrites(OwnedWritesTestCase):
+    vector_names = ["title", "content"]
+
+    async def test_title_only_update_keeps_content_vector(self):
+        response = await qdrant_service.update_journal(self.journal_id, "user_1", title="New title")
+        self.assertTrue(response.success)
+        self.assertEqual(self._embedded_texts(), ["New title"])
+        point = await self._point()
+        self.assertAlmostEqual(point.vector["title"][1], 1.0)
+        self.assertAlmostEqual(point.vector["content"][0], 1.0)
+
+    async def test_title_only_update_is_read_free(self):
+        with patch.object(self.client, "scroll", wraps=self.client.scroll) as scroll:
+            response = await qdrant_service.update_journal(self.journal_id, "user_2", title="Hijacked")
+            self.assertEqual(response.error, "JOURNAL_NOT_FOUND")
+            response = await qdrant_service.update_journal(self.journal_id, "user_1", title="New title")
+        self.assertTrue(response.success)
+        scroll.assert_not_called()
+        point = await self._point()
+        self.assertEqual(point.payload["title"], "New title")
+        self.assertAlmostEqual(point.vector["title"][1], 1.0)
+
+    async def test_emptied_title_drops_its_vector(self):
+        response = await qdrant_service.update_journal(self.journal_id, "user_1", title="")
+        self.assertTrue(response.success)
+        self.embed.assert_not_called()
+        point = await self._point()
+        self.assertEqual(point.payload["title"], "")
+        self.assertEqual(set(point.vector), {"content"})
+
+    async def test_title_only_journal_has_no_content_vector(self):
+        vector, = await qdrant_service.embed_journals([("Only a title", "")])
+        self.assertEqual(set(vector), {"title"})
+        self.assertEqual(self._embedded_texts(), ["Only a title"])
+
+    async def test_search_fuses_named_vectors(self):
+        title_only = str(uuid4())
+        await self.client.upsert(qdrant_service.collection_name, points=[
+            PointStruct(id=title_only, vector={"title": [0.0, 1.0]},
+                        payload={"userId": "user_1", "title": "New", "content": "", "createdAt": 0.0})
+        ])
+        with patch.object(qdrant_service, "generate_embedding", AsyncMock(return_value=[0.0, 1.0])), \
+                patch.object(qdrant_service, "recency_half_life_days", 0.0):
+            response = await qdrant_service.search_journals("New question", "user_1", limit=2)
+        self.assertTrue(response.success)
+        journals = response.data["journals"]
+        self.assertEqual([journal["id"] for journal in journals], [title_only, self.journal_id])
+        self.assertAlmostEqual(journals[0]["score"], 0.5)
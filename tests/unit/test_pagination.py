@@ -0,0 +1,70 @@
+import unittest
+from unittest.mock import patch
+from uuid import uuid4
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from src.services.qdrant_service import qdrant_service
+from src.utils.pagination import encode_cursor, decode_cursor, InvalidCursorError
+
+def test_cursor_round_trip():
+    offset = str(uuid4())
+    assert decode_cursor(encode_cursor(offset)) == offset
+    assert decode_cursor(encode_cursor(42)) == 42
+    assert encode_cursor(None) is None
+    assert decode_cursor(None) is None
+
+def test_malformed_cursor_is_rejected():
+    with pytest.raises(InvalidCursorError):
+        decode_cursor("not-a-cursor")
+
+class TestJournalPagination(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        await self.client.create_collection(
+            qdrant_service.collection_name,
+            vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+        )
+        points = [
+            PointStruct(id=str(uuid4()), vector=[1.0, 0.0],
+                        payload={"userId": "user_1", "title": f"Entry {i}", "content": "", "createdAt": 0.0})
+            for i in range(7)
+        ]
+        points.append(PointStruct(id=str(uuid4()), vector=[1.0, 0.0],
+                                  payload={"userId": "user_2", "title": "Other", "content": "", "createdAt": 0.0}))
+        await self.client.upsert(qdrant_service.collection_name, points=points)
+        self.patcher = patch.object(qdrant_service, "client", self.client)
+        self.patcher.start()
+
+    async def asyncTearDown(self):
+        self.patcher.stop()
+        await self.client.close()
+
+    async def test_cursor_walks_every_page(self):
+        titles, cursor, pages = [], None, 0
+        while True:
+            response = await qdrant_service.get_journals_by_user("user_1", limit=3, cursor=cursor)
+            self.assertTrue(response.success)
+            titles += [journal["title"] for journal in response.data["journals"]]
+            pages += 1
+            cursor = response.data["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(pages, 3)
+        self.assertEqual(sorted(titles), [f"Entry {i}" for i in range(7)])
+
+    async def test_iterator_streams_all_journals(self):
+        journals = [j async for j in qdrant_service.iter_journals_by_user("user_1", page_size=2)]
+
+        self.assertEqual(len(journals), 7)
+        self.assertTrue(all(j["userId"] == "user_1" for j in journals))
+
+    async def test_invalid_cursor_returns_error(self):
+        response = await qdrant_service.get_journals_by_user("user_1", limit=3, cursor="garbage")
+
+        self.assertFalse(response.success)
+        self.assertEqual(response.error, "INVALID_CURSOR")
+
+if __name__ == '__main__':
+    unittest.main()
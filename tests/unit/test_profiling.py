@@ -0,0 +1,106 @@
+from unittest.mock import AsyncMock, patch
+import pytest
+from fastapi.testclient import TestClient
+from src.main import app
+from src.core.config import settings
+from src.core.firebase import get_current_user
+from src.core.profiling import RateLimiter, RequestProfiler, request_profiler
+from src.services.qdrant_service import qdrant_service
+
+ADMIN = {"X-Admin-Token": "secret"}
+
+def test_rate_limiter_caps_profiles_per_minute():
+    limiter = RateLimiter(per_minute=2)
+    assert [limiter.allow() for _ in range(3)] == [True, True, False]
+    assert RateLimiter(per_minute=0).allow() is False
+
+def test_trigger_requires_matching_token_or_sampling():
+    profiler = RequestProfiler(token="secret", max_per_minute=100)
+    assert profiler.trigger_for(b"secret") == "header"
+    assert profiler.trigger_for(b"wrong") is None
+    assert profiler.trigger_for(None) is None
+
+    profiler.configure(enabled=True, sample_rate=1.0)
+    assert profiler.trigger_for(None) == "sampled"
+    assert RequestProfiler(token="").trigger_for(b"") is None
+
+def test_buffer_keeps_newest_profiles():
+    profiler = RequestProfiler(buffer_size=2, max_per_minute=100)
+    profiler.call_trees = False
+    ids = []
+    for _ in range(3):
+        capture = profiler.begin("GET", "/api/v1/journals/", "header")
+        profiler.finish(capture, 200)
+        ids.append(capture.profile.id)
+    assert [profile.id for profile in profiler.profiles()] == [ids[2], ids[1]]
+    assert profiler.get(ids[0]) is None
+
+class TestProfilingEndpoints:
+    def setup_method(self):
+        app.dependency_overrides[get_current_user] = lambda: "user_1"
+        self.client = TestClient(app)
+        self.patchers = [
+            patch.object(settings, "admin_token", "secret"),
+            patch.object(request_profiler, "token", b"secret"),
+            patch.object(request_profiler, "limiter", RateLimiter(per_minute=100)),
+            patch.object(qdrant_service.client, "scroll", AsyncMock(return_value=([], None))),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+        request_profiler.clear()
+
+    def teardown_method(self):
+        for patcher in self.patchers:
+            patcher.stop()
+        app.dependency_overrides.clear()
+        request_profiler.clear()
+
+    def test_header_profiles_request_and_admin_can_fetch_it(self):
+        response = self.client.get("/api/v1/journals/", headers={"X-Profile-Token": "secret"})
+        profile_id = response.headers["X-Profile-Id"]
+
+        listed = self.client.get("/api/v1/admin/profiles", headers=ADMIN).json()
+        assert [profile["id"] for profile in listed["data"]["profiles"]] == [profile_id]
+        summary = listed["data"]["profiles"][0]
+        assert summary["path"] == "/api/v1/journals/"
+        assert summary["status"] == 200
+        assert summary["trigger"] == "header"
+        assert summary["wall_seconds"] > 0
+
+        fetched = self.client.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN)
+        assert fetched.status_code == 200
+
+    def test_requests_are_not_profiled_by_default(self):
+        for headers in ({}, {"X-Profile-Token": "wrong"}):
+            response = self.client.get("/api/v1/journals/", headers=headers)
+            assert "X-Profile-Id" not in response.headers
+        assert request_profiler.profiles() == []
+
+    def test_admin_can_toggle_sampling(self):
+        try:
+            response = self.client.put("/api/v1/admin/profiling", json={"enabled": True, "sample_rate": 1.0},
+                                       headers=ADMIN)
+            assert response.json()["data"]["enabled"] is True
+            assert "X-Profile-Id" in self.client.get("/api/v1/journals/").headers
+
+            response = self.client.put("/api/v1/admin/profiling", json={"sample_rate": 2}, headers=ADMIN)
+            assert response.json()["error"] == "INVALID_SAMPLE_RATE"
+        finally:
+            request_profiler.configure(enabled=False)
+
+    def test_admin_api_requires_token(self):
+        assert self.client.get("/api/v1/admin/profiles").status_code == 401
+        assert self.client.get("/api/v1/admin/profiles", headers={"X-Admin-Token": "nope"}).status_code == 401
+        with patch.object(settings, "admin_token", ""):
+            response = self.client.get("/api/v1/admin/profiles", headers=ADMIN)
+            assert response.json()["error"] == "ADMIN_DISABLED"
+
+    def test_call_tree_is_rendered_with_pyinstrument(self):
+        pytest.importorskip("pyinstrument")
+        with patch.object(request_profiler, "call_trees", True):
+            response = self.client.get("/api/v1/journals/", headers={"X-Profile-Token": "secret"})
+        profile_id = response.headers["X-Profile-Id"]
+        text = self.client.get(f"/api/v1/admin/profiles/{profile_id}", headers=ADMIN)
+        assert text.headers["content-type"].startswith("text/plain")
+        speedscope = self.client.get(f"/api/v1/admin/profiles/{profile_id}?format=speedscope", headers=ADMIN)
+        assert speedscope.json()
@@ -0,0 +1,184 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+from src.core.resilience import (
+    CircuitBreaker, CircuitOpenError, LimiterTimeoutError, ResilientCaller, UpstreamTimeoutError
+)
+from google.api_core import exceptions as google_exceptions
+from src.services.gemini_service import GeminiService, is_retryable_gemini_error
+
+class Transient(Exception):
+    pass
+
+def caller(**kwargs):
+    options = dict(is_retryable=lambda e: isinstance(e, Transient), timeout_seconds=1.0,
+                   deadline_seconds=5.0, max_attempts=3, base_delay_seconds=0.001, max_delay_seconds=0.01)
+    options.update(kwargs)
+    return ResilientCaller("test", **options)
+
+class FlakyCall:
+    def __init__(self, failures, error=Transient, delay=0.0):
+        self.failures = failures
+        self.error = error
+        self.delay = delay
+        self.calls = 0
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.calls <= self.failures:
+            raise self.error("upstream hiccup")
+        return "ok"
+
+class TestResilientCaller(unittest.IsolatedAsyncioTestCase):
+    async def test_retries_retryable_errors(self):
+        func = FlakyCall(failures=2)
+        self.assertEqual(await caller().call(func), "ok")
+        self.assertEqual(func.calls, 3)
+
+    async def test_gives_up_after_max_attempts(self):
+        func = FlakyCall(failures=5)
+        with self.assertRaises(Transient):
+            await caller().call(func)
+        self.assertEqual(func.calls, 3)
+
+    async def test_does_not_retry_other_errors(self):
+        func = FlakyCall(failures=1, error=ValueError)
+        with self.assertRaises(ValueError):
+            await caller().call(func)
+        self.assertEqual(func.calls, 1)
+
+    async def test_slow_attempts_time_out(self):
+        func = FlakyCall(failures=0, delay=1.0)
+        with self.assertRaises(UpstreamTimeoutError):
+            await caller(timeout_seconds=0.02, max_attempts=2).call(func)
+        self.assertEqual(func.calls, 2)
+
+    async def test_deadline_bounds_all_attempts(self):
+        func = FlakyCall(failures=0, delay=1.0)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with self.assertRaises(asyncio.TimeoutError):
+            await caller(timeout_seconds=0.5, deadline_seconds=0.1, max_attempts=10).call(func)
+        self.assertLess(loop.time() - started, 0.4)
+
+    async def test_circuit_opens_and_recovers(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=0.05)
+        resilient = caller(breaker=breaker, max_attempts=1)
+        for _ in range(2):
+            with self.assertRaises(Transient):
+                await resilient.call(FlakyCall(failures=1))
+
+        healthy = FlakyCall(failures=0)
+        with self.assertRaises(CircuitOpenError):
+            await resilient.call(healthy)
+        self.assertEqual(healthy.calls, 0)
+
+        await asyncio.sleep(0.06)
+        self.assertEqual(await resilient.call(healthy), "ok")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    async def _half_open(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=0.01)
+        resilient = caller(breaker=breaker, max_attempts=1)
+        with self.assertRaises(Transient):
+            await resilient.call(FlakyCall(failures=1))
+        await asyncio.sleep(0.02)
+        return breaker, resilient
+
+    async def test_cancelled_trial_releases_half_open_circuit(self):
+        breaker, resilient = await self._half_open()
+        trial = asyncio.ensure_future(resilient.call(FlakyCall(failures=0, delay=1.0)))
+        await asyncio.sleep(0.01)
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+        trial.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await trial
+
+        self.assertEqual(await resilient.call(FlakyCall(failures=0)), "ok")
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_caller_error_does_not_close_half_open_circuit(self):
+        breaker, resilient = await self._half_open()
+        with self.assertRaises(ValueError):
+            await resilient.call(FlakyCall(failures=1, error=ValueError))
+        self.assertEqual(breaker.state, CircuitBreaker.HALF_OPEN)
+
+        with self.assertRaises(Transient):
+            await resilient.call(FlakyCall(failures=1))
+        self.assertEqual(breaker.state, CircuitBreaker.OPEN)
+
+    async def test_hedge_wins_over_slow_primary(self):
+        delays = [1.0, 0.0]
+
+        async def func():
+            await asyncio.sleep(delays.pop(0))
+            return "fast"
+
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        self.assertEqual(await caller(hedge_after_seconds=0.02).call(func), "fast")
+        self.assertLess(loop.time() - started, 0.5)
+
+    async def test_semaphore_limits_concurrency(self):
+        active, peak = 0, 0
+
+        async def func():
+            nonlocal active, peak
+            active += 1
+            peak = max(peak, active)
+            await asyncio.sleep(0.01)
+            active -= 1
+
+        resilient = caller(semaphore=asyncio.Semaphore(2))
+        await asyncio.gather(*(resilient.call(func) for _ in range(6)))
+        self.assertEqual(peak, 2)
+
+    async def test_queueing_for_the_semaphore_does_not_open_the_circuit(self):
+        breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout_seconds=30.0)
+        resilient = caller(semaphore=asyncio.Semaphore(1), timeout_seconds=0.2, breaker=breaker)
+        func = FlakyCall(failures=0, delay=0.15)
+
+        results = await asyncio.gather(*(resilient.call(func) for _ in range(6)), return_exceptions=True)
+
+        self.assertEqual(results, ["ok"] * 6)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(breaker.failures, 0)
+
+    async def test_deadline_spent_queueing_is_not_an_upstream_failure(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, reset_timeout_seconds=30.0)
+        semaphore = asyncio.Semaphore(1)
+        resilient = caller(semaphore=semaphore, deadline_seconds=0.05, breaker=breaker)
+        func = FlakyCall(failures=0)
+
+        async with semaphore:
+            with self.assertRaises(LimiterTimeoutError):
+                await resilient.call(func)
+
+        self.assertEqual(func.calls, 0)
+        self.assertEqual(breaker.state, CircuitBreaker.CLOSED)
+        self.assertEqual(await resilient.call(func), "ok")
+
+def test_gemini_retryable_errors():
+    assert is_retryable_gemini_error(google_exceptions.TooManyRequests("slow down"))
+    assert is_retryable_gemini_error(google_exceptions.ServiceUnavailable("down"))
+    assert not is_retryable_gemini_error(google_exceptions.InvalidArgument("bad prompt"))
+    assert not is_retryable_gemini_error(ValueError("bug"))
+
+class TestGeminiResilience(unittest.IsolatedAsyncioTestCase):
+    async def test_timeouts_surface_as_gemini_timeout(self):
+        service = GeminiService()
+        service.caller.timeout_seconds = 0.01
+        service.caller.max_attempts = 1
+
+        async def slow(prompt):
+            await asyncio.sleep(1)
+
+        service._model = MagicMock(generate_content_async=slow)
+        response = await service.generate_response("how was my week?", "Journal: fine")
+        self.assertFalse(response.success)
+        self.assertEqual(response.error, "GEMINI_TIMEOUT")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from uuid import uuid4
+import pytest
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams, PointStruct
+from src.jobs.retention import LeaderLock, RetentionJob, RetentionPolicy, build_retention_job, load_retention_policy
+
+DAY = 86400
+NOW = 1_700_000_000.0
+
+def test_load_retention_policy_reads_overrides():
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"users": {"keeper": None, "long": 30}}, f)
+    try:
+        policy = load_retention_policy(8, f.name)
+    finally:
+        os.unlink(f.name)
+    assert policy.days_for("keeper") is None
+    assert policy.days_for("long") == 30
+    assert policy.days_for("anyone") == 8
+
+def test_load_retention_policy_rejects_bad_days():
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+        json.dump({"users": {"u": 0}}, f)
+    try:
+        with pytest.raises(ValueError):
+            load_retention_policy(8, f.name)
+    finally:
+        os.unlink(f.name)
+
+def test_leader_lock_is_exclusive():
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, "retention.lock")
+        leader, follower = LeaderLock(path), LeaderLock(path)
+        assert leader.acquire()
+        assert leader.acquire()
+        assert not follower.acquire()
+        leader.release()
+        assert follower.acquire()
+        follower.release()
+
+class TestRetentionJob(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        await self.client.create_collection("journals", vectors_config=VectorParams(size=2, distance=Distance.COSINE))
+        self.ages = {}
+        points = []
+        for user_id in ("regular", "keeper", "long"):
+            for age_days in (1, 10, 40):
+                point_id = str(uuid4())
+                self.ages[point_id] = (user_id, age_days)
+                points.append(PointStruct(id=point_id, vector=[1.0, 0.0],
+                                          payload={"userId": user_id, "createdAt": NOW - age_days * DAY}))
+        await self.client.upsert("journals", points=points)
+        self.policy = RetentionPolicy(8, {"keeper": None, "long": 30})
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def remaining(self):
+        points, _ = await self.client.scroll("journals", limit=100, with_payload=False)
+        return sorted(self.ages[str(point.id)] for point in points)
+
+    async def test_deletes_by_user_retention_in_chunks(self):
+        job = RetentionJob(self.client, ["journals", "missing_collection"], self.policy,
+                           chunk_size=1, max_deletes_per_second=0)
+        report = await job.run_once(now=NOW)
+
+        self.assertEqual(report.deleted, 3)
+        self.assertEqual(report.by_collection, {"journals": 3})
+        self.assertEqual(await self.remaining(), [
+            ("keeper", 1), ("keeper", 10), ("keeper", 40), ("long", 1), ("long", 10), ("regular", 1)
+        ])
+
+    async def test_dry_run_counts_without_deleting(self):
+        job = RetentionJob(self.client, ["journals"], self.policy, dry_run=True)
+        report = await job.run_once(now=NOW)
+
+        self.assertEqual(report.expired, 3)
+        self.assertEqual(report.deleted, 0)
+        self.assertEqual(len(await self.remaining()), 9)
+
+    async def test_configured_job_only_reports_by_default(self):
+        report = await build_retention_job(self.client, ["journals"]).run_once(now=NOW)
+
+        self.assertEqual(report.deleted, 0)
+        self.assertEqual(len(await self.remaining()), 9)
+
+    async def test_deletes_are_paced(self):
+        job = RetentionJob(self.client, ["journals"], RetentionPolicy(8), chunk_size=2, max_deletes_per_second=20)
+        started = time.monotonic()
+        report = await job.run_once(now=NOW)
+        # 6 expired journals at 20/s take at least ~0.3s
+        self.assertEqual(report.deleted, 6)
+        self.assertGreaterEqual(time.monotonic() - started, 0.25)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+import json
+import subprocess
+import sys
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from src.main import app
+from src.core.lifespan import services
+from src.services.qdrant_service import qdrant_service
+
+# Generous enough for a cold CI box; loading torch alone blows well past it.
+IMPORT_BUDGET_SECONDS = 5.0
+HEAVY_MODULES = ["sentence_transformers", "torch", "google.generativeai"]
+
+def test_import_main_stays_within_budget():
+    script = (
+        "import json, sys, time\n"
+        "started = time.perf_counter()\n"
+        "import src.main\n"
+        "elapsed = time.perf_counter() - started\n"
+        f"print(json.dumps({{'elapsed': elapsed, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+    )
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    assert report["loaded"] == []
+    assert report["elapsed"] < IMPORT_BUDGET_SECONDS
+
+def test_ready_reports_not_ready_until_model_loaded():
+    client = TestClient(app)
+    with patch.object(services, "firebase_ready", True), \
+         patch.object(services, "collections_ready", True), \
+         patch.object(qdrant_service.backend, "_loaded", False):
+        response = client.get("/ready")
+    assert response.status_code == 503
+    assert response.json()["error"] == "NOT_READY"
+    assert response.json()["data"]["checks"]["embedding_model"] is False
+
+def test_ready_once_services_started():
+    client = TestClient(app)
+    with patch.object(services, "firebase_ready", True), \
+         patch.object(services, "collections_ready", True), \
+         patch.object(qdrant_service.backend, "_loaded", True):
+        response = client.get("/ready")
+    assert response.status_code == 200
+    assert response.json()["data"]["ready"] is True
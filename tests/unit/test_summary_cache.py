@@ -0,0 +1,40 @@
+from src.services.summary_cache import SummaryCache
+
+JOURNALS = [
+    {"id": "a", "createdAt": 1.0, "updatedAt": 1.0},
+    {"id": "b", "createdAt": 2.0, "updatedAt": 2.0},
+]
+
+def test_fingerprint_ignores_order_and_tracks_versions():
+    fingerprint = SummaryCache.fingerprint(JOURNALS)
+
+    assert SummaryCache.fingerprint(list(reversed(JOURNALS))) == fingerprint
+    edited = [JOURNALS[0], {**JOURNALS[1], "updatedAt": 3.0}]
+    assert SummaryCache.fingerprint(edited) != fingerprint
+    assert SummaryCache.fingerprint(JOURNALS[:1]) != fingerprint
+
+def test_hit_requires_same_user_window_and_fingerprint():
+    cache = SummaryCache()
+    fingerprint = SummaryCache.fingerprint(JOURNALS)
+    cache.put("user_1", 7, fingerprint, "You had a good week")
+
+    assert cache.get("user_1", 7, fingerprint) == "You had a good week"
+    assert cache.get("user_1", 30, fingerprint) is None
+    assert cache.get("user_2", 7, fingerprint) is None
+
+def test_invalidate_user_drops_only_that_user():
+    cache = SummaryCache()
+    cache.put("user_1", 7, "f1", "one")
+    cache.put("user_2", 7, "f2", "two")
+
+    cache.invalidate_user("user_1")
+
+    assert cache.get("user_1", 7, "f1") is None
+    assert cache.get("user_2", 7, "f2") == "two"
+
+def test_expired_entries_are_not_served():
+    cache = SummaryCache(ttl_seconds=-1)
+    cache.put("user_1", 7, "f1", "stale")
+
+    assert cache.get("user_1", 7, "f1") is None
+    assert len(cache) == 0
@@ -0,0 +1,103 @@
+import unittest
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, patch
+from qdrant_client import AsyncQdrantClient
+from qdrant_client.http.models import Distance, VectorParams, PointStruct, ScoredPoint
+from src.api.v1.endpoints.journals import ChatRequest, _chat_cache_key, _chat_time_range
+from src.core.prompt_templates import prompt_templates
+from src.models.response import APIResponse
+from src.services.qdrant_service import qdrant_service
+
+DAY = 86400
+
+class TestTimeAwareSearch(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.client = AsyncQdrantClient(location=":memory:")
+        await self.client.create_collection(
+            qdrant_service.collection_name, vectors_config=VectorParams(size=2, distance=Distance.COSINE)
+        )
+        self.now = datetime.now().timestamp()
+        # The older journal is the closer match to the query vector [1, 0]
+        journals = {1: ([1.0, 0.0], 400), 2: ([1.0, 0.3], 1), 3: ([0.0, 1.0], 2), 4: ([1.0, 0.1], 60)}
+        await self.client.upsert(qdrant_service.collection_name, points=[
+            PointStruct(id=journal_id, vector=vector,
+                        payload={"userId": "user_1", "title": f"Journal {journal_id}", "content": "",
+                                 "createdAt": self.now - age * DAY})
+            for journal_id, (vector, age) in journals.items()
+        ])
+        self.patchers = [
+            patch.object(qdrant_service, "client", self.client),
+            patch.object(qdrant_service, "vector_names", None),
+            patch.object(qdrant_service, "lexical", False),
+            patch.object(qdrant_service, "generate_embedding", AsyncMock(return_value=[1.0, 0.0])),
+            patch.object(qdrant_service, "recency_half_life_days", 30.0),
+            patch.object(qdrant_service, "recency_weight", 0.5),
+            patch.object(qdrant_service, "search_oversample", 4),
+        ]
+        for patcher in self.patchers:
+            patcher.start()
+
+    async def asyncTearDown(self):
+        for patcher in self.patchers:
+            patcher.stop()
+
+    async def _search(self, limit=2, **kwargs):
+        response = await qdrant_service.search_journals("How was I?", "user_1", limit=limit, **kwargs)
+        self.assertTrue(response.success)
+        return [journal["id"] for journal in response.data["journals"]]
+
+    async def test_recent_journals_win_among_similar_ones(self):
+        with patch.object(qdrant_service, "recency_half_life_days", 0.0):
+            self.assertEqual(await self._search(), [1, 4])
+        self.assertEqual(await self._search(), [2, 4])
+
+    async def test_recency_reranks_oversampled_candidates(self):
+        self.assertEqual(await self._search(limit=1), [2])
+        with patch.object(qdrant_service, "search_oversample", 1):
+            self.assertEqual(await self._search(limit=1), [1])
+
+    def test_negative_scores_do_not_favour_old_journals(self):
+        def candidate(journal_id, score, age):
+            return ScoredPoint(id=journal_id, version=0, score=score, payload={"createdAt": self.now - age * DAY})
+        ranked = qdrant_service._rank_by_recency(
+            [candidate(5, -0.6, 400), candidate(6, -0.5, 1), candidate(7, 0.1, 400)], self.now
+        )
+        # Unclamped, the old journal's -0.6 would shrink to about -0.3 and overtake the recent -0.5
+        self.assertEqual([result.id for result in ranked], [7, 6, 5])
+        self.assertEqual([result.score for result in ranked][1:], [0.0, 0.0])
+
+    async def test_date_range_filters_on_created_at(self):
+        self.assertEqual(await self._search(limit=4, start=self.now - 7 * DAY), [2, 3])
+        self.assertEqual(await self._search(limit=4, end=self.now - 30 * DAY), [4, 1])
+        self.assertEqual(await self._search(limit=4, start=self.now - 100 * DAY, end=self.now - 30 * DAY), [4])
+
+class TestChatTimeRange(unittest.TestCase):
+    def test_days_bound_the_start(self):
+        start, end, period, error = _chat_time_range(ChatRequest(message="hi", days=7))
+        self.assertIsNone(error)
+        self.assertAlmostEqual(start, (datetime.now() - timedelta(days=7)).timestamp(), delta=5)
+        self.assertIsNone(end)
+        self.assertEqual(period, "the last 7 days")
+
+    def test_start_and_end_accept_timestamps_and_datetimes(self):
+        start, end, period, error = _chat_time_range(
+            ChatRequest(message="hi", start="2026-03-01T00:00:00", end=datetime(2026, 3, 7, 23).timestamp())
+        )
+        self.assertIsNone(error)
+        self.assertEqual(start, datetime(2026, 3, 1).timestamp())
+        self.assertEqual(period, "between March 1, 2026 and March 7, 2026")
+        self.assertEqual(_chat_time_range(ChatRequest(message="hi"))[2], None)
+
+    def test_invalid_ranges_are_rejected(self):
+        for chat in (ChatRequest(message="hi", days=0), ChatRequest(message="hi", days=3, start=0),
+                     ChatRequest(message="hi", start=200, end=100)):
+            *_, error = _chat_time_range(chat)
+            self.assertEqual(error.error, "INVALID_DATE_RANGE")
+
+    def test_period_shapes_prompt_and_cache_key(self):
+        self.assertIn("from the last 7 days", prompt_templates.get_chat_prompt("ctx", "hi", "the last 7 days"))
+        self.assertNotIn("last few days", prompt_templates.get_chat_prompt("ctx", "hi"))
+
+        search = APIResponse.success_response(data={"journals": [{"id": "1", "updatedAt": 1.0}],
+                                                    "query_vector": [1.0, 0.0]})
+        self.assertNotEqual(_chat_cache_key(search)[1], _chat_cache_key(search, "the last 7 days")[1])
@@ -0,0 +1,82 @@
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+import firebase_admin
+import google.auth.exceptions
+from fastapi.security import HTTPAuthorizationCredentials
+from firebase_admin import auth, credentials
+from src.core.firebase import get_current_user, token_cache, AuthError, _warm_public_certs
+from src.core.token_cache import VerifiedTokenCache
+
+def _credentials(token):
+    return HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+class TestVerifiedTokenCache(unittest.TestCase):
+    def test_entry_expires_with_token(self):
+        cache = VerifiedTokenCache(expiry_margin_seconds=0)
+        cache.put("almost-expired", {"uid": "u1", "exp": time.time() - 1})
+        cache.put("valid", {"uid": "u2", "exp": time.time() + 3600})
+
+        self.assertIsNone(cache.get("almost-expired"))
+        self.assertEqual(cache.get("valid")["uid"], "u2")
+
+    def test_ttl_is_capped(self):
+        cache = VerifiedTokenCache(max_ttl_seconds=-1)
+        cache.put("token", {"uid": "u1", "exp": time.time() + 3600})
+
+        self.assertIsNone(cache.get("token"))
+
+class TestGetCurrentUser(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        token_cache.clear()
+
+    @patch('src.core.firebase.auth.verify_id_token')
+    async def test_repeated_token_is_verified_once(self, mock_verify):
+        mock_verify.return_value = {"uid": "test_user_123", "exp": time.time() + 3600}
+
+        first = await get_current_user(_credentials("token-a"))
+        second = await get_current_user(_credentials("token-a"))
+
+        self.assertEqual(first, "test_user_123")
+        self.assertEqual(second, "test_user_123")
+        mock_verify.assert_called_once_with("token-a")
+
+    @patch('src.core.firebase.auth.verify_id_token')
+    async def test_failed_verification_is_not_cached(self, mock_verify):
+        mock_verify.side_effect = auth.InvalidIdTokenError("bad token")
+
+        for _ in range(2):
+            with self.assertRaises(AuthError) as ctx:
+                await get_current_user(_credentials("token-b"))
+            self.assertEqual(ctx.exception.error, "TOKEN_INVALID")
+
+        self.assertEqual(mock_verify.call_count, 2)
+
+class TestPublicCertWarmup(unittest.TestCase):
+    def setUp(self):
+        self.app = firebase_admin.initialize_app(
+            MagicMock(spec=credentials.Base), options={"projectId": "test-project"}, name="cert-warmup"
+        )
+
+    def tearDown(self):
+        firebase_admin.delete_app(self.app)
+
+    @patch('google.oauth2.id_token.verify_token')
+    def test_probe_reaches_the_cert_fetch(self, mock_verify):
+        mock_verify.side_effect = ValueError("Certificate for key id cert-warmup not found.")
+
+        _warm_public_certs(self.app)
+
+        mock_verify.assert_called_once()
+        self.assertEqual(mock_verify.call_args.kwargs["audience"], "test-project")
+        self.assertIn("securetoken", mock_verify.call_args.kwargs["certs_url"])
+
+    @patch('google.oauth2.id_token.verify_token')
+    def test_fetch_failures_surface(self, mock_verify):
+        mock_verify.side_effect = google.auth.exceptions.TransportError("unreachable")
+
+        with self.assertRaises(auth.CertificateFetchError):
+            _warm_public_certs(self.app)
+
+if __name__ == '__main__':
+    unittest.main()